@@ -0,0 +1,60 @@
+"""
+Stateless JWT authentication.
+
+Business routes authenticate access tokens from their claims (see
+`accounts.tokens`) instead of loading the user on every request. Tokens
+are only issued to, and refreshed for, active users, so a deactivated user
+keeps access until the access token expires.
+"""
+from django.conf import settings
+from django.utils.functional import cached_property
+from django.utils.translation import gettext_lazy as _
+
+from dj_rest_auth.jwt_auth import JWTCookieAuthentication
+from rest_framework.settings import api_settings
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+
+
+class ClaimsUser(TokenUser):
+    """
+    A user backed by the claims of an access token. It has no profile or
+    settings, and can't be saved.
+    """
+
+    @cached_property
+    def is_active(self):
+        return self.token.get('is_active', False)
+
+    @cached_property
+    def business_ids(self):
+        return frozenset(self.token['business_ids'])
+
+
+class StatelessJWTAuthentication(JWTCookieAuthentication):
+    """
+    Authenticate access tokens (from the header or the cookie) from their
+    claims. Tokens issued before the user claims existed are authenticated
+    with the user row.
+    """
+
+    def get_user(self, validated_token):
+        if 'business_ids' not in validated_token:
+            return super().get_user(validated_token)
+        if jwt_settings.USER_ID_CLAIM not in validated_token:
+            raise InvalidToken(_('Token contained no recognizable user identification'))
+        user = ClaimsUser(validated_token)
+        if not user.is_active:
+            raise AuthenticationFailed(_('User is inactive'), code='user_inactive')
+        return user
+
+
+def get_business_authentication_classes():
+    """
+    Returns the authentication classes of the business routes, which only
+    accept JWTs with `API_TOKEN_AUTH_ONLY`.
+    """
+    if settings.API_TOKEN_AUTH_ONLY:
+        return [StatelessJWTAuthentication]
+    return api_settings.DEFAULT_AUTHENTICATION_CLASSES
@@ -7,19 +7,21 @@ from django.utils.translation import gettext_lazy as _
 from allauth.account.adapter import get_adapter
 from django_countries.serializers import CountryFieldMixin
 from rest_framework import serializers
-from rest_framework_simplejwt.tokens import RefreshToken, UntypedToken
-from twilio.base.exceptions import TwilioRestException
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+from rest_framework_simplejwt.tokens import UntypedToken
 
 from business.models import BusinessAccount
 from shared.fields import PhotoUploadField
-from shared.models import PhotoUpload, TwilioService
-from shared.sms.twilio_tokens import TwilioTokenService
+from shared.models import PhotoUpload
+from shared.sms.otp import OTPProviderError, get_otp_provider
 
 from .fields import CustomPhoneNumberField
 from .exceptions import NonUniqueEmailException, NonUniquePhoneNumberException,\
     AccountNotRegisteredException, WrongOTPException, \
     InvalidCredentialsException, AccountDisabledException
 from .models import Profile, Setting
+from .tokens import RefreshToken, set_user_claims
 from .validators import is_digit
 
 
@@ -79,13 +81,11 @@ class ValidPhoneNumberConfirmSerialzier(serializers.Serializer):
         otp = validated_data['otp']
 
         try:
-            twilio_service = TwilioService.objects.get(phone_number=phone_number)
-            client = TwilioTokenService(to=phone_number, service_id=twilio_service.service_id)
-            if client.check_verification(code=otp):
+            if get_otp_provider().check(phone_number, otp):
                 return validated_data
-            raise WrongOTPException()
-        except (TwilioRestException, TwilioService.DoesNotExist) as e:
-            raise WrongOTPException()
+        except OTPProviderError:
+            pass
+        raise WrongOTPException()
 
 
 class ProfileSerializer(CountryFieldMixin, serializers.ModelSerializer):
@@ -312,6 +312,25 @@ class TokenVerifySerializer(serializers.Serializer):
         return {'detail': _('Token is valid')}
 
 
+class TokenRefreshSerializer(serializers.Serializer):
+    """
+    Returns a new access token, with the current user claims (see
+    `accounts.tokens`). Refresh tokens of deleted or inactive users are
+    rejected.
+    """
+    refresh = serializers.CharField()
+
+    def validate(self, attrs):
+        refresh = RefreshToken(attrs['refresh'])
+        user_id = refresh.get(jwt_settings.USER_ID_CLAIM)
+        user = User.objects.filter(pk=user_id, is_active=True).first()
+        if user is None:
+            raise AuthenticationFailed(_('User not found or inactive'), code='user_inactive')
+        access = refresh.access_token
+        set_user_claims(access, user)
+        return {'access': str(access)}
+
+
 class PasswordResetSerializer(serializers.Serializer):
     phone_number = CustomPhoneNumberField()
 
@@ -347,13 +366,11 @@ class PasswordResetConfirmSerializer(serializers.Serializer):
         otp = validated_data['otp']
 
         try:
-            twilio_service = TwilioService.objects.get(phone_number=phone_number)
-            client = TwilioTokenService(to=phone_number, service_id=twilio_service.service_id)
-            if client.check_verification(code=otp):
+            if get_otp_provider().check(phone_number, otp):
                 return validated_data
-            raise WrongOTPException()
-        except (TwilioRestException, TwilioService.DoesNotExist) as e:
-            raise WrongOTPException()
+        except OTPProviderError:
+            pass
+        raise WrongOTPException()
 
 
 class PinResetConfirmSerializer(serializers.Serializer):
@@ -373,14 +390,11 @@ class PinResetConfirmSerializer(serializers.Serializer):
         otp = validated_data['otp']
 
         try:
-            twilio_service = TwilioService.objects.get(phone_number=phone_number)
-            client = TwilioTokenService(to=phone_number,
-                                        service_id=twilio_service.service_id)
-            if client.check_verification(code=otp):
+            if get_otp_provider().check(phone_number, otp):
                 return validated_data
-            raise WrongOTPException()
-        except (TwilioRestException, TwilioService.DoesNotExist) as e:
-            raise WrongOTPException()
+        except OTPProviderError:
+            pass
+        raise WrongOTPException()
 
 
 class UserBusinessAccountSerializer(serializers.ModelSerializer):
@@ -0,0 +1,29 @@
+"""
+JSON Web Tokens with user claims.
+
+Tokens carry the active and staff flags and the business account IDs of
+the user, so the business routes authenticate them without loading the
+user (see `accounts.authentication`). The claims are set when the tokens
+are issued, and again whenever an access token is refreshed.
+"""
+from rest_framework_simplejwt import tokens
+
+from business.tenancy import get_business_ids
+
+
+def set_user_claims(token, user):
+    token['is_active'] = user.is_active
+    token['is_staff'] = user.is_staff
+    token['business_ids'] = sorted(get_business_ids(user))
+
+
+class RefreshToken(tokens.RefreshToken):
+    @classmethod
+    def for_user(cls, user):
+        """
+        Returns a refresh token of the user, with the user claims (which
+        are copied to its access tokens).
+        """
+        token = super().for_user(user)
+        set_user_claims(token, user)
+        return token
@@ -9,24 +9,23 @@ from rest_framework import status, permissions
 from rest_framework.generics import GenericAPIView, CreateAPIView, RetrieveUpdateAPIView
 from rest_framework.response import Response
 from rest_framework.viewsets import ModelViewSet
-from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework_simplejwt.views import TokenVerifyView, TokenRefreshView
 
 from accounts import schema as account_schema
 from business.models import BusinessAccount
 from shared import schema as shared_schema
-from shared.sms.twilio_tokens import TwilioTokenService
-from shared.models import TwilioService
+from shared.tasks import send_otp
 from .serializers import UserRegistrationSerializer, LoginSerializer, \
     ValidEmailSerialzier, ValidPhoneNumberSerialzier, ValidPhoneNumberConfirmSerialzier,\
     PasswordChangeSerializer,TokenVerifySerializer, UserResponseSerializer, \
     UserDetailSerializer, PasswordResetSerializer, PasswordResetConfirmSerializer, \
     ProfileSerializer, SettingSerializer, UserBusinessAccountSerializer, \
     PartnerRegistrationSerializer, PinResetSerializer, PinResetConfirmSerializer, \
-    PinChangeSerializer
+    PinChangeSerializer, TokenRefreshSerializer
 from .permissions import IsAccountOwner, IsAccountActive, IsProfileOwner, IsSettingOwner, \
     IsBusinessOwner
 from .models import Profile, Setting
+from .tokens import RefreshToken
 
 
 User = get_user_model()
@@ -167,12 +166,7 @@ class PhoneNumberValidatorAPIView(GenericAPIView):
         if serializer.is_valid():
             # Send OTP SMS
             phone_number = str(serializer.validated_data['phone_number'])
-            client = TwilioTokenService(to=str(phone_number))
-            client.send_verification()
-            TwilioService.objects.update_or_create(
-                phone_number=phone_number,
-                defaults={'service_id': client.service_id}
-            )
+            send_otp.delay(phone_number)
             return Response(serializer.data)
 
         error = {'phoneNumber': [_('Enter a valid phone number.')]}
@@ -316,6 +310,7 @@ class CustomTokenRefreshView(TokenRefreshView):
 
     Returns new access token to replace an expired token.
     """
+    serializer_class = TokenRefreshSerializer
 
     @swagger_auto_schema(
         operation_id='token-refresh',
@@ -545,12 +540,7 @@ class PasswordResetAPIView(GenericAPIView):
         if serializer.is_valid():
             # Send OTP SMS
             phone_number = str(serializer.validated_data['phone_number'])
-            client = TwilioTokenService(to=str(phone_number))
-            client.send_verification()
-            TwilioService.objects.update_or_create(
-                phone_number=phone_number,
-                defaults={'service_id': client.service_id}
-            )
+            send_otp.delay(phone_number)
             return Response(serializer.data)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
@@ -583,12 +573,7 @@ class PinResetAPIView(GenericAPIView):
         if serializer.is_valid():
             # Send OTP SMS
             phone_number = str(serializer.validated_data['phone_number'])
-            client = TwilioTokenService(to=str(phone_number))
-            client.send_verification()
-            TwilioService.objects.update_or_create(
-                phone_number=phone_number,
-                defaults={'service_id': client.service_id}
-            )
+            send_otp.delay(phone_number)
             return Response(serializer.data)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
@@ -4,7 +4,7 @@ from customers.models import Customer
 from expenses.models import Expense
 from inventory.models import Stock
 
-from .models import BusinessType, BusinessAccount, BusinessAccountTax
+from .models import BusinessType, BusinessAccount, BusinessAccountTax, PeriodSnapshot
 
 
 @admin.register(BusinessType)
@@ -39,3 +39,11 @@ class BusinessAccountAdmin(admin.ModelAdmin):
     list_filter = ('business_type', )
     search_fields = ('business_name', )
     inlines = [BusinessAccountTaxInline, CustomerInline, ExpenseInline, StockInline]
+
+
+@admin.register(PeriodSnapshot)
+class PeriodSnapshotAdmin(admin.ModelAdmin):
+    list_display = ('business_account', 'period', 'sales', 'taxes', 'expenses', 'cash_in',
+                    'closing_receivables', 'inventory_value', 'updated_at')
+    list_filter = ('period', )
+    readonly_fields = ('created_at', 'updated_at')
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class BusinessConfig(AppConfig):
     name = 'business'
     verbose_name = 'business account'
+
+    def ready(self):
+        import business.signals
@@ -0,0 +1,40 @@
+# Generated by Django 3.2.7 on 2026-10-19 05:54
+
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('business', '0007_businessaccount_photo'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PeriodSnapshot',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('period', models.DateField(help_text='First day of the month.')),
+                ('sales', models.DecimalField(decimal_places=2, help_text='Total amount of sales (i.e. before TAX).', max_digits=24)),
+                ('taxes', models.DecimalField(decimal_places=2, help_text='TAX collected on the sales.', max_digits=24)),
+                ('expenses', models.DecimalField(decimal_places=2, max_digits=24)),
+                ('cash_in', models.DecimalField(decimal_places=2, help_text='Total amount of completed payments (i.e. after TAX).', max_digits=24)),
+                ('closing_receivables', models.DecimalField(blank=True, decimal_places=2, help_text='Amount owed through open pay later payments at the end of the month. Only known for months closed right after their end.', max_digits=24, null=True)),
+                ('inventory_value', models.DecimalField(blank=True, decimal_places=2, help_text='Stock value at the end of the month. Only known for months closed right after their end.', max_digits=24, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('business_account', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='period_snapshots', to='business.businessaccount')),
+            ],
+            options={
+                'verbose_name': 'Period Snapshot',
+                'verbose_name_plural': 'Period Snapshots',
+                'ordering': ('business_account', 'period'),
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='periodsnapshot',
+            constraint=models.UniqueConstraint(fields=('business_account', 'period'), name='unique_period_snapshot'),
+        ),
+    ]
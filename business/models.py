@@ -123,3 +123,51 @@ class BusinessAccountTax(models.Model):
         Given an amount to be taxed, returns the tax amount.
         """
         return round((amount * self.percentage) / 100, 2)
+
+
+class PeriodSnapshot(models.Model):
+    """
+    Totals of a closed month of a business account (see `business.periods`).
+
+    Amounts are stored as they were when the month was closed, so reports
+    over closed months don't need to aggregate payments and expenses again.
+    """
+    id = models.UUIDField(primary_key=True, editable=False, default=uuid4)
+    business_account = models.ForeignKey(
+        BusinessAccount,
+        related_name='period_snapshots',
+        on_delete=models.CASCADE
+    )
+    period = models.DateField(help_text=_('First day of the month.'))
+    sales = models.DecimalField(max_digits=24, decimal_places=2,
+                                help_text=_('Total amount of sales (i.e. before TAX).'))
+    taxes = models.DecimalField(max_digits=24, decimal_places=2,
+                                help_text=_('TAX collected on the sales.'))
+    expenses = models.DecimalField(max_digits=24, decimal_places=2)
+    cash_in = models.DecimalField(max_digits=24, decimal_places=2,
+                                  help_text=_('Total amount of completed payments '
+                                              '(i.e. after TAX).'))
+    closing_receivables = models.DecimalField(
+        max_digits=24, decimal_places=2, null=True, blank=True,
+        help_text=_('Amount owed through open pay later payments at the end of the month. '
+                    'Only known for months closed right after their end.')
+    )
+    inventory_value = models.DecimalField(
+        max_digits=24, decimal_places=2, null=True, blank=True,
+        help_text=_('Stock value at the end of the month. Only known for months closed '
+                    'right after their end.')
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = _('Period Snapshot')
+        verbose_name_plural = _('Period Snapshots')
+        ordering = ('business_account', 'period')
+        constraints = [
+            models.UniqueConstraint(fields=['business_account', 'period'],
+                                    name='unique_period_snapshot'),
+        ]
+
+    def __str__(self):
+        return f'{self.business_account} ({self.period:%Y-%m})'
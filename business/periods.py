@@ -0,0 +1,235 @@
+"""
+Monthly period close.
+
+Once a month is over, its totals are stored in a `PeriodSnapshot`, so the
+financial statements (see `business.reports`) only aggregate payments and
+expenses of the open period. Months are closed in order by the
+`close_periods` beat job, so the closed months of a business account are
+always contiguous and end right before its open period.
+
+Closed months still change with back-dated expenses, and with writes of
+the payments (and their sold items) made or completed in them, e.g. a
+pending payment completed, or a pay later payment marked failed, after its
+month is closed. These refresh the expenses, or the sales, taxes and cash
+in, of their snapshot (see `business.signals`).
+"""
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import DecimalField, ExpressionWrapper, F, Max, Min, Q, Sum
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
+
+from expenses.models import Expense
+from inventory.models import Stock
+from payments.models import Payment
+from payments.reports import get_aging_queryset
+
+from .models import BusinessAccount, PeriodSnapshot
+
+
+DECIMAL = DecimalField(max_digits=24, decimal_places=2)
+
+
+def month_start(day):
+    return day.replace(day=1)
+
+
+def add_months(day, months):
+    """
+    Returns the first day of the month `months` after the month of `day`.
+    """
+    month = day.month - 1 + months
+    return date(day.year + month // 12, month % 12 + 1, 1)
+
+
+def local_datetime(day):
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def get_sales(business_account):
+    """
+    Returns the payments of the sales of the business account. Sales are
+    made by completed payments and open `CREDIT` payments.
+    """
+    return Payment.objects.filter(order__business_account=business_account).filter(
+        Q(status=Payment.COMPLETED) |
+        Q(mode_of_payment=Payment.CREDIT) & ~Q(status=Payment.FAILED)
+    )
+
+
+def get_completed_payments(business_account):
+    """
+    Returns the completed payments of the business account. Completed
+    payments can't be updated, so `updated_at` is the completion date.
+    """
+    return Payment.objects.filter(order__business_account=business_account,
+                                  status=Payment.COMPLETED)
+
+
+def get_tax_rate(business_account):
+    percentage = sum((tax.percentage for tax in business_account.taxes.active()), Decimal(0))
+    return percentage / 100
+
+
+def get_open_period(business_account):
+    """
+    Returns the first day of the open period of the business account, i.e.
+    the month after the last closed month, or `None` if no month is closed.
+    """
+    last_period = business_account.period_snapshots.aggregate(last=Max('period'))['last']
+    if last_period is None:
+        return None
+    return add_months(last_period, 1)
+
+
+def split_range(open_period, date_from, date_to):
+    """
+    Split a date range (inclusive) into closed months, which are read from
+    the snapshots, and live ranges, which are aggregated.
+
+    Returns:
+      A `(closed_from, closed_to, live_ranges)` tuple, where the closed
+      months are between `closed_from` (inclusive) and `closed_to`
+      (exclusive) and `live_ranges` is a list of `(date_from, date_to)`
+      ranges (inclusive).
+    """
+    if open_period is None:
+        return None, None, [(date_from, date_to)]
+
+    # Only whole months can be read from the snapshots
+    closed_from = date_from if date_from.day == 1 else add_months(date_from, 1)
+    closed_to = min(open_period, month_start(date_to + timedelta(days=1)))
+    if closed_from >= closed_to:
+        return None, None, [(date_from, date_to)]
+
+    live_ranges = []
+    if date_from < closed_from:
+        live_ranges.append((date_from, closed_from - timedelta(days=1)))
+    if closed_to <= date_to:
+        live_ranges.append((closed_to, date_to))
+    return closed_from, closed_to, live_ranges
+
+
+def _monthly_amounts(payments, date_field, start, end):
+    """
+    Returns the sold item amounts (before TAX) of the payments between the
+    months per month.
+    """
+    amount = ExpressionWrapper(F('sold_items__quantity') * F('sold_items__price'),
+                               output_field=DECIMAL)
+    rows = payments.filter(**{
+        f'{date_field}__gte': local_datetime(start),
+        f'{date_field}__lt': local_datetime(end)
+    }).order_by().values(month=TruncMonth(date_field)).annotate(amount=Sum(amount))
+    return {timezone.localtime(row['month']).date(): row['amount'] or Decimal(0) for row in rows}
+
+
+def _monthly_expenses(business_account, start, end):
+    rows = Expense.objects.filter(business_account=business_account,
+                                  date__gte=start,
+                                  date__lt=end) \
+        .order_by().values(month=TruncMonth('date')).annotate(amount=Sum('amount'))
+    return {row['month']: row['amount'] for row in rows}
+
+
+def _get_first_period(business_account):
+    """
+    Returns the first month of the business account with any activity.
+    """
+    first_expense = business_account.expenses.aggregate(first=Min('date'))['first']
+    first_day = timezone.localtime(business_account.created_at).date()
+    if first_expense is not None:
+        first_day = min(first_day, first_expense)
+    return month_start(first_day)
+
+
+@transaction.atomic
+def close_periods(business_account, today=None):
+    """
+    Close all months of the business account before the current month
+    which are not closed yet.
+
+    Receivables and inventory value can't be computed for the past, so
+    they are only recorded for the previous month.
+
+    Returns:
+      The list of created snapshots.
+    """
+    today = today or timezone.localdate()
+    current_period = month_start(today)
+    start = get_open_period(business_account) or _get_first_period(business_account)
+    if start >= current_period:
+        return []
+
+    tax_rate = get_tax_rate(business_account)
+    sales = _monthly_amounts(get_sales(business_account), 'created_at', start, current_period)
+    cash_in = _monthly_amounts(get_completed_payments(business_account), 'updated_at',
+                               start, current_period)
+    expenses = _monthly_expenses(business_account, start, current_period)
+
+    snapshots = []
+    period = start
+    while period < current_period:
+        period_sales = sales.get(period, Decimal(0))
+        snapshots.append(PeriodSnapshot(
+            business_account=business_account,
+            period=period,
+            sales=period_sales,
+            taxes=round(period_sales * tax_rate, 2),
+            expenses=expenses.get(period, Decimal(0)),
+            cash_in=round(cash_in.get(period, Decimal(0)) * (1 + tax_rate), 2)
+        ))
+        period = add_months(period, 1)
+
+    previous = snapshots[-1]
+    receivables = sum(row['total'] for row in get_aging_queryset(business_account, today))
+    previous.closing_receivables = round(receivables * (1 + tax_rate), 2)
+    value = ExpressionWrapper(F('quantity') * F('price'), output_field=DECIMAL)
+    previous.inventory_value = Stock.objects.filter(business_account=business_account) \
+        .aggregate(total=Sum(value))['total'] or Decimal(0)
+
+    return PeriodSnapshot.objects.bulk_create(snapshots, ignore_conflicts=True)
+
+
+def refresh_expenses(business_id, periods):
+    """
+    Recompute the expenses of the snapshots of the business account for
+    the months, e.g. after back-dated expense writes.
+    """
+    for period in set(periods):
+        total = Expense.objects.filter(
+            business_account_id=business_id,
+            date__gte=period,
+            date__lt=add_months(period, 1)
+        ).aggregate(total=Sum('amount'))['total'] or Decimal(0)
+        PeriodSnapshot.objects.filter(business_account_id=business_id, period=period) \
+            .update(expenses=total, updated_at=timezone.now())
+
+
+def refresh_sales(business_id, periods):
+    """
+    Recompute the sales, taxes and cash in of the snapshots of the business
+    account for the months, e.g. after writes of payments made or completed
+    in them. Taxes are recomputed with the current tax rate, like the open
+    period in the reports.
+    """
+    periods = sorted(set(periods))
+    business_account = BusinessAccount.objects.filter(pk=business_id).first()
+    if not periods or business_account is None:
+        return
+
+    start, end = periods[0], add_months(periods[-1], 1)
+    tax_rate = get_tax_rate(business_account)
+    sales = _monthly_amounts(get_sales(business_account), 'created_at', start, end)
+    cash_in = _monthly_amounts(get_completed_payments(business_account), 'updated_at',
+                               start, end)
+    for period in periods:
+        period_sales = sales.get(period, Decimal(0))
+        PeriodSnapshot.objects.filter(business_account_id=business_id, period=period).update(
+            sales=period_sales,
+            taxes=round(period_sales * tax_rate, 2),
+            cash_in=round(cash_in.get(period, Decimal(0)) * (1 + tax_rate), 2),
+            updated_at=timezone.now()
+        )
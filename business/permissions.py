@@ -9,32 +9,26 @@ from payments.models import Payment
 class IsAdminOrBusinessOwner(permissions.IsAuthenticated):
     def has_object_permission(self, request, view, obj):
         user = request.user
-        return user.is_staff or obj.user == user
+        return user.is_staff or str(obj.user_id) == str(user.pk)
 
 
 class IsBusinessOwnedResource(permissions.IsAuthenticated):
     def has_object_permission(self, request, view, obj):
-        user = request.user
-        business_accounts = user.business_accounts.all()
-        return obj.business_account in business_accounts
+        return request.tenant.owns(obj.business_account_id)
 
 
 class IsBusinessOwnedSoldItem(permissions.IsAuthenticated):
     def has_object_permission(self, request, view, obj):
-        business_accounts = request.user.business_accounts.all()
-        return obj.stock.business_account in business_accounts
+        return request.tenant.owns(obj.stock.business_account_id)
 
     def has_permission(self, request, view):
-        business_accounts = request.user.business_accounts.all()
-        business_accounts_ids = [str(business_account.pk) for business_account in business_accounts]
         business_id = view.kwargs.get('business_id')
-        return business_id in business_accounts_ids
+        return request.tenant.owns(business_id)
 
 
 class IsBusinessOwnedPayment(permissions.IsAuthenticated):
     def has_object_permission(self, request, view, obj):
-        business_accounts = request.user.business_accounts.all()
-        return obj.order.business_account in business_accounts
+        return request.tenant.owns(obj.order.business_account_id)
 
 
 class IsOrderOpen(permissions.BasePermission):
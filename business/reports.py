@@ -0,0 +1,314 @@
+"""
+Profit & loss and cash flow statements.
+
+Sales (see `Payment`) and expenses are combined by the database: both are
+summed per day, the daily rows are unioned and bucketed by period, and the
+running balances are computed with window functions. Periods without any
+sales or expenses are included with zero amounts.
+
+Closed months are read from their snapshots (see `business.periods`), so
+only the open period is aggregated from payments and expenses. Snapshots
+can't be broken into days or weeks, so they are only used for monthly,
+quarterly and yearly buckets (and for the cash flow opening balance).
+
+Statements are cached per business account, date range and bucket, and
+invalidated by writes to payments, expenses, taxes and snapshots (see
+`business.signals`).
+"""
+from datetime import timedelta
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import DecimalField, ExpressionWrapper, F, Q, Sum
+from django.db.models.functions import TruncDate
+
+from expenses.models import Expense
+from shared.utils.cache import get_cache_key
+
+from .models import PeriodSnapshot
+from .periods import get_completed_payments, get_open_period, get_sales, get_tax_rate, \
+    local_datetime, month_start, split_range
+
+
+CACHE_NAMESPACE = 'financial-report'
+CACHE_TIMEOUT = 60 * 60  # 1 hour
+
+DECIMAL = DecimalField(max_digits=24, decimal_places=2)
+
+# Period buckets (i.e. `DATE_TRUNC` fields) mapped to their intervals
+BUCKETS = {
+    'day': '1 day',
+    'week': '1 week',
+    'month': '1 month',
+    'quarter': '3 months',
+    'year': '1 year',
+}
+
+# Buckets made of whole months, which can be read from the monthly snapshots
+MONTHLY_BUCKETS = ('month', 'quarter', 'year')
+
+
+def _date_ranges_filter(field, ranges, datetime_field=False):
+    """
+    Returns the filter of the dates ranges (inclusive). Datetime fields are
+    filtered by aware datetimes, so that the filter can use their indexes.
+    """
+    q = Q()
+    for date_from, date_to in ranges:
+        if datetime_field:
+            q |= Q(**{
+                f'{field}__gte': local_datetime(date_from),
+                f'{field}__lt': local_datetime(date_to + timedelta(days=1))
+            })
+        else:
+            q |= Q(**{f'{field}__gte': date_from, f'{field}__lte': date_to})
+    return q
+
+
+def _daily_payments_sql(payments, date_field, ranges, tax_rate):
+    """
+    Returns the SQL query (and params) of the daily `(day, income, tax,
+    expense)` rows of the payments, by the local date of `date_field`.
+    """
+    amount = ExpressionWrapper(F('sold_items__quantity') * F('sold_items__price'),
+                               output_field=DECIMAL)
+    qs = payments.filter(_date_ranges_filter(date_field, ranges, datetime_field=True)) \
+        .order_by() \
+        .values(day=TruncDate(date_field)) \
+        .annotate(amount=Sum(amount)) \
+        .values_list('day', 'amount')
+    sql, params = qs.query.sql_with_params()
+    return f'SELECT day, amount, amount * %s, 0 FROM ({sql}) AS p (day, amount)', \
+        (tax_rate, *params)
+
+
+def _daily_expenses_sql(business_account, ranges):
+    qs = Expense.objects.filter(business_account=business_account) \
+        .filter(_date_ranges_filter('date', ranges)) \
+        .order_by() \
+        .values('date') \
+        .annotate(amount=Sum('amount')) \
+        .values_list('date', 'amount')
+    sql, params = qs.query.sql_with_params()
+    return f'SELECT day, 0, 0, amount FROM ({sql}) AS e (day, amount)', params
+
+
+def _snapshots_sql(business_account, closed_from, closed_to, income, tax):
+    """
+    Returns the SQL query (and params) of the monthly `(day, income, tax,
+    expense)` rows of the snapshots. `income` and `tax` are SQL expressions
+    over the `sales`, `taxes` and `cash_in` columns.
+    """
+    qs = PeriodSnapshot.objects.filter(business_account=business_account,
+                                       period__gte=closed_from,
+                                       period__lt=closed_to) \
+        .order_by() \
+        .values_list('period', 'sales', 'taxes', 'cash_in', 'expenses')
+    sql, params = qs.query.sql_with_params()
+    return (
+        f'SELECT period, {income}, {tax}, expenses '
+        f'FROM ({sql}) AS s (period, sales, taxes, cash_in, expenses)'
+    ), params
+
+
+def _run_statement(sql, params):
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        columns = [column.name for column in cursor.description]
+        return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+
+# Bucketed union of daily `(day, income, tax, expense)` rows. The `periods`
+# series keeps periods without rows.
+STATEMENT_SQL = '''
+    WITH daily (day, income, tax, expense) AS (
+        {daily_sql}
+    ),
+    periods (period) AS (
+        SELECT generate_series(
+            DATE_TRUNC(%s, %s::date), %s::date, %s::interval
+        )::date
+    ),
+    buckets (period, income, tax, expense) AS (
+        SELECT DATE_TRUNC(%s, day)::date, SUM(income), SUM(tax), SUM(expense)
+        FROM daily
+        GROUP BY 1
+    )
+    SELECT {columns}
+    FROM periods
+    LEFT JOIN buckets USING (period)
+    ORDER BY period
+'''
+
+
+def _statement_sql(columns, column_params, daily_sqls, bucket, date_from, date_to):
+    daily_params = []
+    for _, params in daily_sqls:
+        daily_params += params
+    sql = STATEMENT_SQL.format(
+        daily_sql=' UNION ALL '.join(f'({sql})' for sql, _ in daily_sqls),
+        columns=columns
+    )
+    params = (
+        *daily_params,
+        bucket, date_from, date_to, BUCKETS[bucket],
+        bucket,
+        *column_params,
+    )
+    return sql, params
+
+
+def _memoize(business_account, kind, date_from, date_to, bucket, build):
+    key = get_cache_key(CACHE_NAMESPACE, business_account.pk, kind, date_from, date_to, bucket)
+    report = cache.get(key)
+    if report is None:
+        report = build(business_account, date_from, date_to, bucket)
+        cache.set(key, report, CACHE_TIMEOUT)
+    return report
+
+
+def build_pnl_report(business_account, date_from, date_to, bucket='month'):
+    """
+    Returns the profit & loss statement of the business account between
+    the dates (inclusive), using the cached statement if one exists.
+
+    Sales are recognized when they are made: completed payments and open
+    `CREDIT` payments, by their created date. Taxes are collected on top of
+    sales, so they are not part of the profit.
+    """
+    return _memoize(business_account, 'pnl', date_from, date_to, bucket, _build_pnl_report)
+
+
+def _split_range(open_period, date_from, date_to, bucket):
+    if bucket not in MONTHLY_BUCKETS:
+        open_period = None
+    return split_range(open_period, date_from, date_to)
+
+
+def _build_pnl_report(business_account, date_from, date_to, bucket):
+    open_period = get_open_period(business_account)
+    closed_from, closed_to, live_ranges = _split_range(open_period, date_from, date_to,
+                                                       bucket)
+
+    daily_sqls = []
+    if closed_from is not None:
+        daily_sqls.append(
+            _snapshots_sql(business_account, closed_from, closed_to, 'sales', 'taxes')
+        )
+    if live_ranges:
+        tax_rate = get_tax_rate(business_account)
+        daily_sqls += [
+            _daily_payments_sql(get_sales(business_account), 'created_at', live_ranges,
+                                tax_rate),
+            _daily_expenses_sql(business_account, live_ranges),
+        ]
+
+    columns = '''
+        period,
+        COALESCE(income, 0) AS sales,
+        ROUND(COALESCE(tax, 0), 2) AS taxes,
+        COALESCE(expense, 0) AS expenses,
+        COALESCE(income, 0) - COALESCE(expense, 0) AS net_profit,
+        SUM(COALESCE(income, 0) - COALESCE(expense, 0)) OVER (ORDER BY period)
+            AS running_net_profit
+    '''
+    sql, params = _statement_sql(columns, (), daily_sqls, bucket, date_from, date_to)
+    periods = _run_statement(sql, params)
+
+    totals = {
+        name: sum((period[name] for period in periods), Decimal(0))
+        for name in ('sales', 'taxes', 'expenses', 'net_profit')
+    }
+    return {
+        'date_from': date_from,
+        'date_to': date_to,
+        'bucket': bucket,
+        **totals,
+        'periods': periods,
+    }
+
+
+def build_cashflow_report(business_account, date_from, date_to, bucket='month'):
+    """
+    Returns the cash flow statement of the business account between the
+    dates (inclusive), using the cached statement if one exists.
+
+    Cash comes in when payments are completed (including TAX) and goes out
+    with expenses. The balance starts with the net cash flow of everything
+    before `date_from`.
+    """
+    return _memoize(business_account, 'cashflow', date_from, date_to, bucket,
+                    _build_cashflow_report)
+
+
+def _build_cashflow_report(business_account, date_from, date_to, bucket):
+    open_period = get_open_period(business_account)
+    closed_from, closed_to, live_ranges = _split_range(open_period, date_from, date_to,
+                                                       bucket)
+    tax_rate = get_tax_rate(business_account)
+    opening_balance = _get_opening_balance(business_account, open_period, date_from, tax_rate)
+
+    # Snapshot cash in includes TAX already
+    daily_sqls = []
+    if closed_from is not None:
+        daily_sqls.append(
+            _snapshots_sql(business_account, closed_from, closed_to, 'cash_in', '0')
+        )
+    if live_ranges:
+        daily_sqls += [
+            _daily_payments_sql(get_completed_payments(business_account), 'updated_at',
+                                live_ranges, tax_rate),
+            _daily_expenses_sql(business_account, live_ranges),
+        ]
+
+    columns = '''
+        period,
+        ROUND(COALESCE(income + tax, 0), 2) AS cash_in,
+        COALESCE(expense, 0) AS cash_out,
+        ROUND(COALESCE(income + tax, 0), 2) - COALESCE(expense, 0) AS net_cash_flow,
+        %s + SUM(ROUND(COALESCE(income + tax, 0), 2) - COALESCE(expense, 0))
+            OVER (ORDER BY period) AS balance
+    '''
+    sql, params = _statement_sql(columns, (opening_balance, ), daily_sqls, bucket,
+                                 date_from, date_to)
+    periods = _run_statement(sql, params)
+
+    totals = {
+        name: sum((period[name] for period in periods), Decimal(0))
+        for name in ('cash_in', 'cash_out', 'net_cash_flow')
+    }
+    return {
+        'date_from': date_from,
+        'date_to': date_to,
+        'bucket': bucket,
+        'opening_balance': opening_balance,
+        **totals,
+        'closing_balance': periods[-1]['balance'] if periods else opening_balance,
+        'periods': periods,
+    }
+
+
+def _get_opening_balance(business_account, open_period, date_from, tax_rate):
+    """
+    Returns the net cash flow of the business account before the date,
+    from the snapshots of the closed months before it and the payments
+    and expenses after them.
+    """
+    balance = Decimal(0)
+    payments = get_completed_payments(business_account)
+    expenses = Expense.objects.filter(business_account=business_account, date__lt=date_from)
+    if open_period is not None:
+        cutoff = min(open_period, month_start(date_from))
+        totals = business_account.period_snapshots.filter(period__lt=cutoff) \
+            .aggregate(cash_in=Sum('cash_in'), expenses=Sum('expenses'))
+        balance += (totals['cash_in'] or 0) - (totals['expenses'] or 0)
+        payments = payments.filter(updated_at__gte=local_datetime(cutoff))
+        expenses = expenses.filter(date__gte=cutoff)
+
+    amount = ExpressionWrapper(F('sold_items__quantity') * F('sold_items__price'),
+                               output_field=DECIMAL)
+    cash_in = payments.filter(updated_at__lt=local_datetime(date_from)) \
+        .aggregate(total=Sum(amount))['total'] or Decimal(0)
+    cash_out = expenses.aggregate(total=Sum('amount'))['total'] or Decimal(0)
+    return balance + round(cash_in * (1 + tax_rate), 2) - cash_out
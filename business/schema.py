@@ -115,6 +115,12 @@ stock_request_body=openapi.Schema(
             format=openapi.FORMAT_DECIMAL,
             description=_('The amount of quantity left in the stock.')
         ),
+        'reorderLevel': openapi.Schema(
+            type=openapi.TYPE_NUMBER,
+            format=openapi.FORMAT_DECIMAL,
+            description=_('Send a low stock notification when the quantity left drops to '
+                          'this level. Set to `null` to disable notifications.')
+        ),
         'price': openapi.Schema(
             type=openapi.TYPE_NUMBER,
             format=openapi.FORMAT_DECIMAL,
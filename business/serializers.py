@@ -1,17 +1,28 @@
+from contextlib import contextmanager
 from decimal import Decimal
-from functools import reduce
+from functools import partial, reduce
+from uuid import UUID
 
 from django.conf import settings
+from django.db import IntegrityError, transaction
 from django.utils.translation import gettext_lazy as _
 from django.utils import timezone
 
 from rest_framework import serializers
+from rest_framework.exceptions import NotFound
+from rest_framework.settings import api_settings
+from rest_framework.validators import UniqueValidator
 from django_countries.serializers import CountryFieldMixin
+from phonenumber_field.phonenumber import to_python
 from drf_yasg.utils import swagger_serializer_method
 
+from campaigns.models import SMSCampaign
 from customers.models import Customer
-from expenses.models import Expense
+from expenses.models import Expense, RecurringExpense
+from expenses.services import create_expenses
 from inventory.models import Stock, Sold
+from inventory.services import create_stocks, restock_stocks
+from inventory.units import MeasurementUnit
 from orders.models import Order, OrderItem
 from payments.models import Payment, SoldItem
 from notifications.models import Notification
@@ -41,40 +52,12 @@ class BusinessCustomerSerializer(serializers.ModelSerializer):
         model = Customer
         fields = ('id', 'name', 'phone_number', 'email', 'photo', 'created_at', 'updated_at')
 
-    def validate(self, data):
-        business_account = self.context['business_account']
-        phone_number = data.get('phone_number')
-        email = data.get('email')
-        customer = getattr(self, 'instance', None)
-
-        # Check if customer phone number is duplicate
-        # Note: We cannot use  `UniqueTogetherValidator` since phone number is optional.
-        if phone_number is not None:
-            kwargs = {
-                'business_account__id': business_account.id,
-                'phone_number': phone_number
-            }
-            qs = Customer.objects.filter(**kwargs)
-            if customer is not None:
-                qs = qs.exclude(phone_number=customer.phone_number)
-            if qs.exists():
-                error = _('A customer with this phone number is registered.')
-                raise serializers.ValidationError(error)
-
-        # Check if customer email is duplicate
-        # Note: We cannot use  `UniqueTogetherValidator` since email is optional.
-        if email is not None:
-            kwargs = {
-                'business_account__id': business_account.id,
-                'email': email
-            }
-            qs = Customer.objects.filter(**kwargs)
-            if customer is not None:
-                qs = qs.exclude(email=customer.email)
-            if qs.exists():
-                error = _('A customer with this email address is registered.')
-                raise serializers.ValidationError(error)
-        return super().validate(data)
+    # Phone numbers & emails are unique per business account, enforced by the
+    # partial unique constraints of `Customer` (both fields are optional).
+    UNIQUE_ERRORS = {
+        'unique_customer_phone_number': _('A customer with this phone number is registered.'),
+        'unique_customer_email': _('A customer with this email address is registered.'),
+    }
 
     def update(self, instance, valiated_data):
         photo_data = valiated_data.pop('photo', None)
@@ -82,13 +65,32 @@ class BusinessCustomerSerializer(serializers.ModelSerializer):
             instance.photo = None
         else:
             instance.photo = self._get_photo(photo_data)
-        return super().update(instance, valiated_data)
+        with self._unique_errors():
+            return super().update(instance, valiated_data)
 
     def create(self, validated_data):
         photo_data = validated_data.pop('photo', None)
         if photo_data is not None:
             validated_data['photo'] = self._get_photo(photo_data)
-        return super().create(validated_data)
+        with self._unique_errors():
+            return super().create(validated_data)
+
+    @contextmanager
+    def _unique_errors(self):
+        """
+        Turn violations of the customer unique constraints into validation
+        errors. The savepoint keeps any outer transaction usable.
+        """
+        try:
+            with transaction.atomic():
+                yield
+        except IntegrityError as e:
+            for constraint, error in self.UNIQUE_ERRORS.items():
+                if constraint in str(e):
+                    raise serializers.ValidationError({
+                        api_settings.NON_FIELD_ERRORS_KEY: [error]
+                    })
+            raise
 
     def _get_photo(self, photo_data):
         """
@@ -102,11 +104,145 @@ class BusinessCustomerSerializer(serializers.ModelSerializer):
         return PhotoUpload.objects.get(pk=photo_id)
 
 
+class CustomerImportSerializer(serializers.Serializer):
+    """
+    Validate a single row of a customer import. Phone numbers are normalized
+    to the `E164` format, without hitting the database.
+    """
+    name = serializers.CharField(max_length=100)
+    phone_number = serializers.CharField(required=False, allow_null=True, allow_blank=True)
+    email = serializers.EmailField(required=False, allow_null=True, allow_blank=True)
+
+    def validate_phone_number(self, value):
+        if not value:
+            return None
+        phone_number = to_python(value)
+        if not phone_number.is_valid():
+            raise serializers.ValidationError(_('Enter a valid phone number.'))
+        return phone_number.as_e164
+
+    def validate_email(self, value):
+        return value or None
+
+    def to_internal_value(self, data):
+        fields = super().to_internal_value(data)
+        fields.setdefault('phone_number', None)
+        fields.setdefault('email', None)
+        return fields
+
+
+class CustomerImportResultSerializer(serializers.Serializer):
+    index = serializers.IntegerField(help_text=_('Position of the row in the request.'))
+    status = serializers.ChoiceField(choices=('created', 'duplicate', 'invalid'))
+    id = serializers.UUIDField(required=False,
+                               help_text=_('ID of the created customer, or of the registered '
+                                           'customer for duplicates.'))
+    errors = serializers.DictField(required=False, help_text=_('Validation errors.'))
+
+
+class CustomerImportResponseSerializer(serializers.Serializer):
+    created = serializers.IntegerField()
+    duplicate = serializers.IntegerField()
+    invalid = serializers.IntegerField()
+    results = CustomerImportResultSerializer(many=True)
+
+
+class CustomerStatsSerializer(serializers.ModelSerializer):
+    photo = PhotoUploadSerializer(read_only=True)
+    order_count = serializers.IntegerField(help_text=_('Number of completed payments.'))
+    lifetime_spend = serializers.DecimalField(max_digits=24, decimal_places=2,
+                                              help_text=_('Total amount of the completed '
+                                                          'payments (i.e. after TAX).'))
+    last_purchase_at = serializers.DateTimeField(help_text=_('Date and time of the last '
+                                                             'purchase.'))
+    outstanding_balance = serializers.DecimalField(max_digits=24, decimal_places=2,
+                                                   help_text=_('Total amount of the `CREDIT` '
+                                                               'payments which are not completed '
+                                                               'yet (i.e. after TAX).'))
+
+    class Meta:
+        model = Customer
+        fields = ('id', 'name', 'phone_number', 'email', 'photo', 'order_count',
+                  'lifetime_spend', 'last_purchase_at', 'outstanding_balance')
+
+
+class CustomerStatsPageSerializer(serializers.Serializer):
+    next = serializers.CharField(allow_null=True,
+                                 help_text=_('Cursor of the next page. `null` on the last page.'))
+    results = CustomerStatsSerializer(many=True)
+
+
+class BusinessExpenseListSerializer(serializers.ListSerializer):
+    """
+    Create many expenses with bulk inserts in a single transaction.
+    """
+    MAX_ITEMS = 1000
+
+    def to_internal_value(self, data):
+        # Checked before the expenses are validated
+        if isinstance(data, list) and len(data) > self.MAX_ITEMS:
+            raise serializers.ValidationError({
+                api_settings.NON_FIELD_ERRORS_KEY: [
+                    _('Ensure this field has no more than 1000 elements.')
+                ]
+            })
+        return super().to_internal_value(data)
+
+    def create(self, validated_data):
+        business_account = validated_data[0]['business_account'] if validated_data else None
+        rows = [
+            {key: value for key, value in item.items() if key != 'business_account'}
+            for item in validated_data
+        ]
+        return create_expenses(business_account, rows)
+
+
 class BusinessExpenseSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Expense
-        fields = ('id', 'title', 'amount', 'date', 'created_at')
+        fields = ('id', 'title', 'amount', 'date', 'recurring_expense', 'created_at')
+        list_serializer_class = BusinessExpenseListSerializer
+
+
+class BusinessRecurringExpenseSerializer(serializers.ModelSerializer):
+
+    class Meta:
+        model = RecurringExpense
+        fields = ('id', 'title', 'amount', 'day_of_month', 'month_of_year', 'day_of_week',
+                  'start_date', 'end_date', 'is_active', 'last_generated_date', 'created_at',
+                  'updated_at')
+
+    def validate(self, data):
+        start_date = data.get('start_date', getattr(self.instance, 'start_date', None))
+        end_date = data.get('end_date', getattr(self.instance, 'end_date', None))
+        if end_date is not None and end_date < start_date:
+            error = _('End date must be on or after the start date.')
+            raise serializers.ValidationError({'end_date': [error]})
+        return data
+
+
+class ExpenseImportSerializer(serializers.Serializer):
+    """
+    Validate an expense import file by its extension.
+    """
+    FILE_TYPES = ('csv', 'xlsx')
+
+    file = serializers.FileField(help_text=_('A CSV (UTF-8) or Excel (`.xlsx`) file with '
+                                             '`title`, `amount` and `date` columns.'))
+
+    def validate_file(self, value):
+        if self.get_file_type(value) not in self.FILE_TYPES:
+            raise serializers.ValidationError(_('Only CSV and Excel (.xlsx) files are supported.'))
+        return value
+
+    @staticmethod
+    def get_file_type(file):
+        return file.name.rsplit('.', 1)[-1].lower() if '.' in file.name else ''
+
+
+class ExpenseImportResponseSerializer(serializers.Serializer):
+    created = serializers.IntegerField(help_text=_('Number of created expenses.'))
 
 
 class RestockingSerializer(serializers.ModelSerializer):
@@ -135,22 +271,205 @@ class RestockingSerializer(serializers.ModelSerializer):
     def save(self, *args, **kwargs):
         restocked_quantity = self.validated_data.pop('restocked_quantity', None)
         if self.instance:
-            self.instance.quantity += restocked_quantity
-            self.instance.last_restocked_date = timezone.now()
-            self.instance.save()
+            quantities = {self.instance.pk: restocked_quantity}
+            restock_stocks(self.instance.business_account, quantities)
+            self.instance.refresh_from_db()
             return self.instance
 
 
+class StockFilterSerializer(serializers.Serializer):
+    ids = serializers.ListField(child=serializers.UUIDField(), required=False,
+                                help_text=_('Only include stocks with these IDs.'))
+    search = serializers.CharField(required=False,
+                                   help_text=_('Only include stocks whose product name contains '
+                                               'this value.'))
+    unit = serializers.ChoiceField(choices=MeasurementUnit.UNIT_CHOICES, required=False)
+    low = serializers.BooleanField(required=False,
+                                   help_text=_('Only include stocks at or below their reorder '
+                                               'level.'))
+
+    @staticmethod
+    def filter_queryset(queryset, filters):
+        """
+        Apply validated filters to a stock queryset.
+        """
+        ids = filters.get('ids')
+        if ids is not None:
+            queryset = queryset.filter(pk__in=ids)
+        search = filters.get('search')
+        if search is not None:
+            queryset = queryset.filter(product__icontains=search)
+        unit = filters.get('unit')
+        if unit is not None:
+            queryset = queryset.filter(unit=unit)
+        if filters.get('low'):
+            queryset = queryset.low()
+        return queryset
+
+
+class BaseBulkStockSerializer(serializers.Serializer):
+    """
+    Base serializer for bulk stock updates. Either a list of `items` or a
+    `filter` expression selects the stocks to update.
+    """
+    MAX_ITEMS = 1000
+
+    filter = StockFilterSerializer(required=False)
+
+    def validate_items(self, value):
+        if len(value) > self.MAX_ITEMS:
+            raise serializers.ValidationError(
+                _('Ensure this field has no more than 1000 elements.')
+            )
+        ids = [item['id'] for item in value]
+        if len(ids) != len(set(ids)):
+            raise serializers.ValidationError(_('Duplicate stock IDs are not allowed.'))
+        return value
+
+    def validate(self, data):
+        if ('items' in data) == ('filter' in data):
+            error = _('Provide either `items` or `filter`.')
+            raise serializers.ValidationError(error)
+        return data
+
+    def filter_queryset(self, queryset):
+        return StockFilterSerializer.filter_queryset(queryset, self.validated_data['filter'])
+
+
+class BulkRestockItemSerializer(serializers.Serializer):
+    id = serializers.UUIDField()
+    restocked_quantity = serializers.DecimalField(max_digits=12, decimal_places=2,
+                                                  min_value=Decimal('0.01'))
+
+
+class BulkRestockingSerializer(BaseBulkStockSerializer):
+    items = BulkRestockItemSerializer(many=True, required=False)
+    restocked_quantity = serializers.DecimalField(max_digits=12, decimal_places=2,
+                                                  min_value=Decimal('0.01'), required=False,
+                                                  help_text=_('The quantity added to each stock '
+                                                              'matched by `filter`.'))
+
+    def validate(self, data):
+        data = super().validate(data)
+        if 'filter' in data and 'restocked_quantity' not in data:
+            error = {'restocked_quantity': [_('This field is required with `filter`.')]}
+            raise serializers.ValidationError(error)
+        return data
+
+
+class BulkPriceItemSerializer(serializers.Serializer):
+    id = serializers.UUIDField()
+    price = serializers.DecimalField(max_digits=12, decimal_places=2, min_value=0)
+
+
+class BulkPriceSerializer(BaseBulkStockSerializer):
+    items = BulkPriceItemSerializer(many=True, required=False)
+    percentage = serializers.DecimalField(max_digits=5, decimal_places=2,
+                                          min_value=-100, required=False,
+                                          help_text=_('Change the price of each stock matched by '
+                                                      '`filter` by this percentage.'))
+    amount = serializers.DecimalField(max_digits=12, decimal_places=2, required=False,
+                                      help_text=_('Change the price of each stock matched by '
+                                                  '`filter` by this amount.'))
+
+    def validate(self, data):
+        data = super().validate(data)
+        if 'filter' in data and ('percentage' in data) == ('amount' in data):
+            error = _('Provide either `percentage` or `amount` with `filter`.')
+            raise serializers.ValidationError(error)
+        return data
+
+
+class BulkPhotoUploadField(PhotoUploadField):
+    """
+    `PhotoUploadField` of the stocks of a `BusinessStockListSerializer`,
+    which reads the photos loaded at once by the list serializer and
+    returns the `PhotoUpload` instance.
+    """
+
+    def to_internal_value(self, pk):
+        photo = self.parent.parent.photos.get(str(pk))
+        if photo is None:
+            raise NotFound(detail=_('Uploaded Photo Not Found'))
+        return photo
+
+
+class BusinessStockListSerializer(serializers.ListSerializer):
+    """
+    Create many stocks with a single bulk insert per table.
+
+    The size of the list is checked before the stocks are validated, and
+    the existing barcode numbers and the photos of all the stocks are read
+    with one query each, instead of one per stock.
+    """
+    MAX_ITEMS = 1000
+
+    def to_internal_value(self, data):
+        if isinstance(data, list):
+            if len(data) > self.MAX_ITEMS:
+                raise serializers.ValidationError({
+                    api_settings.NON_FIELD_ERRORS_KEY: [
+                        _('Ensure this field has no more than 1000 elements.')
+                    ]
+                })
+            self._load([item for item in data if isinstance(item, dict)])
+        return super().to_internal_value(data)
+
+    def _load(self, items):
+        photo_ids = set()
+        for item in items:
+            try:
+                photo_ids.add(UUID(str(item['photo'])))
+            except (KeyError, ValueError):
+                pass  # Missing, `null` or invalid, i.e. not found
+        photos = PhotoUpload.objects.in_bulk(photo_ids)
+        self.photos = {str(pk): photo for pk, photo in photos.items()}
+
+        barcode_numbers = {item.get('barcode_number') for item in items} - {None, ''}
+        self.existing_barcode_numbers = set(
+            Stock.objects.filter(barcode_number__in=[str(number) for number in barcode_numbers])
+            .values_list('barcode_number', flat=True)
+        )
+
+    def validate_new_barcode_number(self, value, message):
+        if value in self.existing_barcode_numbers:
+            raise serializers.ValidationError(message, code='unique')
+
+    def validate(self, data):
+        barcode_numbers = [item['barcode_number'] for item in data if item.get('barcode_number')]
+        if len(barcode_numbers) != len(set(barcode_numbers)):
+            raise serializers.ValidationError(_('Duplicate barcode numbers are not allowed.'))
+        return data
+
+    def create(self, validated_data):
+        stocks = [Stock(**item) for item in validated_data]
+        return create_stocks(stocks, created_by_id=self.child._get_user_id())
+
+
 class BusinessStockSerializer(serializers.ModelSerializer):
     photo = PhotoUploadField(required=False, allow_null=True)
 
     class Meta:
         model = Stock
-        fields = ('id', 'product', 'unit', 'quantity', 'price', 'barcode_number', 'photo',
-                  'last_restocked_date', 'created_at', 'updated_at')
+        fields = ('id', 'product', 'unit', 'quantity', 'reorder_level', 'price', 'barcode_number',
+                  'photo', 'last_restocked_date', 'created_at', 'updated_at')
         extra_kwargs = {
             'last_restocked_date': {'read_only': True}
         }
+        list_serializer_class = BusinessStockListSerializer
+
+    def get_fields(self):
+        fields = super().get_fields()
+        if isinstance(self.parent, BusinessStockListSerializer):
+            # Read at once for all the stocks by the list serializer
+            barcode_number = fields['barcode_number']
+            barcode_number.validators = [
+                partial(self.parent.validate_new_barcode_number, message=validator.message)
+                if isinstance(validator, UniqueValidator) else validator
+                for validator in barcode_number.validators
+            ]
+            fields['photo'] = BulkPhotoUploadField(required=False, allow_null=True)
+        return fields
 
     def update(self, instance, valiated_data):
         photo_data = valiated_data.pop('photo', None)
@@ -164,20 +483,18 @@ class BusinessStockSerializer(serializers.ModelSerializer):
         photo_data = validated_data.pop('photo', None)
         if photo_data is not None:
             validated_data['photo'] = self._get_photo(photo_data)
-        stock = super().create(validated_data)
-        if stock.barcode_number:
-            self._create_barcode(stock.barcode_number, stock.product, stock.business_account)
-        return stock
-
-    def _create_barcode(self, barcode_number, product_name, business_account):
-        from inventory.models import Barcode
-        barcode_data = {
-            'product_name': product_name,
-            'business_account': business_account,
-            'verified': False,
-            'created_strategy': Barcode.API
-        }
-        Barcode.objects.get_or_create(barcode_number=barcode_number, defaults=barcode_data)
+        stocks = create_stocks([Stock(**validated_data)], created_by_id=self._get_user_id())
+        return stocks[0]
+
+    def _get_user_id(self):
+        """
+        Returns the ID of the authenticated user, which may be a `ClaimsUser`
+        rather than a `User`.
+        """
+        user = getattr(self.context.get('request'), 'user', None)
+        if user is None or not user.is_authenticated:
+            return None
+        return user.pk
 
     def _get_photo(self, photo_data):
         """
@@ -207,6 +524,114 @@ class BusinessSoldSerializer(serializers.ModelSerializer):
         )
 
 
+class InventoryReportStockSerializer(serializers.Serializer):
+    id = serializers.UUIDField()
+    product = serializers.CharField()
+    unit = serializers.CharField()
+    quantity = serializers.DecimalField(max_digits=12, decimal_places=2)
+    price = serializers.DecimalField(max_digits=12, decimal_places=2)
+    value = serializers.DecimalField(max_digits=24, decimal_places=2,
+                                     help_text=_('Stock value (i.e. quantity x price).'))
+    value_share = serializers.DecimalField(max_digits=7, decimal_places=4, allow_null=True,
+                                           help_text=_('Share of the total inventory value.'))
+    value_rank = serializers.IntegerField(help_text=_('Rank of the stock by value.'))
+    units_sold = serializers.DecimalField(max_digits=24, decimal_places=2,
+                                          help_text=_('Quantity sold during the period.'))
+    days_of_cover = serializers.DecimalField(max_digits=24, decimal_places=1, allow_null=True,
+                                             help_text=_('Number of days the quantity left lasts '
+                                                         'at the sales rate of the period. `null` '
+                                                         'if nothing was sold.'))
+    is_dead_stock = serializers.BooleanField(help_text=_('Stock left but nothing sold during '
+                                                         'the period.'))
+
+
+class InventoryReportSerializer(serializers.Serializer):
+    date_from = serializers.DateTimeField()
+    date_to = serializers.DateTimeField()
+    days = serializers.IntegerField(help_text=_('Length of the period in days.'))
+    total_value = serializers.DecimalField(max_digits=24, decimal_places=2)
+    total_units_sold = serializers.DecimalField(max_digits=24, decimal_places=2)
+    dead_stock_count = serializers.IntegerField()
+    stocks = InventoryReportStockSerializer(many=True)
+
+
+class AgingBucketsSerializer(serializers.Serializer):
+    current = serializers.DecimalField(max_digits=24, decimal_places=2,
+                                       help_text=_('Amount not due yet.'))
+    days_1_to_30 = serializers.DecimalField(max_digits=24, decimal_places=2,
+                                            help_text=_('Amount 1 - 30 days overdue.'))
+    days_31_to_60 = serializers.DecimalField(max_digits=24, decimal_places=2,
+                                             help_text=_('Amount 31 - 60 days overdue.'))
+    days_61_to_90 = serializers.DecimalField(max_digits=24, decimal_places=2,
+                                             help_text=_('Amount 61 - 90 days overdue.'))
+    days_over_90 = serializers.DecimalField(max_digits=24, decimal_places=2,
+                                            help_text=_('Amount over 90 days overdue.'))
+    total = serializers.DecimalField(max_digits=24, decimal_places=2)
+
+
+class AgingReportCustomerSerializer(AgingBucketsSerializer):
+    customer_id = serializers.UUIDField()
+    customer_name = serializers.CharField()
+    customer_phone_number = serializers.CharField(allow_null=True)
+    oldest_pay_later_date = serializers.DateField(allow_null=True,
+                                                  help_text=_('Earliest due date.'))
+    last_payment_at = serializers.DateTimeField()
+
+
+class AgingReportSerializer(AgingBucketsSerializer):
+    as_of = serializers.DateField(help_text=_('Date the days overdue are counted to.'))
+    customer_count = serializers.IntegerField()
+    customers = AgingReportCustomerSerializer(many=True)
+
+
+class PnLPeriodSerializer(serializers.Serializer):
+    period = serializers.DateField(help_text=_('First day of the period.'))
+    sales = serializers.DecimalField(max_digits=24, decimal_places=2,
+                                     help_text=_('Total amount of sales (i.e. before TAX).'))
+    taxes = serializers.DecimalField(max_digits=24, decimal_places=2)
+    expenses = serializers.DecimalField(max_digits=24, decimal_places=2)
+    net_profit = serializers.DecimalField(max_digits=24, decimal_places=2,
+                                          help_text=_('Sales minus expenses.'))
+    running_net_profit = serializers.DecimalField(max_digits=24, decimal_places=2,
+                                                  help_text=_('Net profit from the start '
+                                                              'date to the end of the period.'))
+
+
+class PnLReportSerializer(serializers.Serializer):
+    date_from = serializers.DateField()
+    date_to = serializers.DateField()
+    bucket = serializers.CharField(help_text=_('Length of the periods.'))
+    sales = serializers.DecimalField(max_digits=24, decimal_places=2)
+    taxes = serializers.DecimalField(max_digits=24, decimal_places=2)
+    expenses = serializers.DecimalField(max_digits=24, decimal_places=2)
+    net_profit = serializers.DecimalField(max_digits=24, decimal_places=2)
+    periods = PnLPeriodSerializer(many=True)
+
+
+class CashFlowPeriodSerializer(serializers.Serializer):
+    period = serializers.DateField(help_text=_('First day of the period.'))
+    cash_in = serializers.DecimalField(max_digits=24, decimal_places=2,
+                                       help_text=_('Total amount of completed payments '
+                                                   '(i.e. after TAX).'))
+    cash_out = serializers.DecimalField(max_digits=24, decimal_places=2,
+                                        help_text=_('Total amount of expenses.'))
+    net_cash_flow = serializers.DecimalField(max_digits=24, decimal_places=2)
+    balance = serializers.DecimalField(max_digits=24, decimal_places=2,
+                                       help_text=_('Cash balance at the end of the period.'))
+
+
+class CashFlowReportSerializer(serializers.Serializer):
+    date_from = serializers.DateField()
+    date_to = serializers.DateField()
+    bucket = serializers.CharField(help_text=_('Length of the periods.'))
+    opening_balance = serializers.DecimalField(max_digits=24, decimal_places=2)
+    cash_in = serializers.DecimalField(max_digits=24, decimal_places=2)
+    cash_out = serializers.DecimalField(max_digits=24, decimal_places=2)
+    net_cash_flow = serializers.DecimalField(max_digits=24, decimal_places=2)
+    closing_balance = serializers.DecimalField(max_digits=24, decimal_places=2)
+    periods = CashFlowPeriodSerializer(many=True)
+
+
 class CustomerSerializer(serializers.ModelSerializer):
     photo = PhotoUploadSerializer(read_only=True)
 
@@ -483,7 +908,65 @@ class NotificationSerializer(serializers.ModelSerializer):
                             'action_date_label', 'created_at', 'updated_at')
 
 
+class NotificationCountSerializer(serializers.Serializer):
+    unread = serializers.IntegerField(help_text=_('Number of unseen notifications.'))
+
+
+class NotificationMarkSeenSerializer(serializers.Serializer):
+    ids = serializers.ListField(child=serializers.UUIDField(), required=False,
+                                allow_empty=False, max_length=1000,
+                                help_text=_('IDs of the notifications to mark as seen.'))
+    all = serializers.BooleanField(default=False,
+                                   help_text=_('Mark all notifications as seen.'))
+
+    def validate(self, data):
+        if data['all'] == ('ids' in data):
+            error = _('Either provide `ids` or set `all` to `true`.')
+            raise serializers.ValidationError({api_settings.NON_FIELD_ERRORS_KEY: [error]})
+        return data
+
+
+class NotificationMarkSeenResponseSerializer(serializers.Serializer):
+    updated = serializers.IntegerField(help_text=_('Number of notifications marked as seen.'))
+    unread = serializers.IntegerField(help_text=_('Number of unseen notifications left.'))
+
+
 class BusinessAccountTaxSerializer(serializers.ModelSerializer):
     class Meta:
         model = BusinessAccountTax
         fields = ('id', 'name', 'percentage', 'description', 'active', 'created_at', 'updated_at')
+
+
+class SMSCampaignSerializer(serializers.ModelSerializer):
+    ACTIVE_CAMPAIGN_ERROR = _('Wait for the current campaign to complete before starting '
+                              'another one.')
+
+    class Meta:
+        model = SMSCampaign
+        fields = ('id', 'message', 'min_days_overdue', 'status', 'recipient_count',
+                  'sent_count', 'failed_count', 'created_at', 'updated_at', 'completed_at')
+
+    def validate(self, data):
+        business_account = self.context['business_account']
+        active = (SMSCampaign.PENDING, SMSCampaign.SENDING)
+        if business_account.sms_campaigns.filter(status__in=active).exists():
+            raise serializers.ValidationError({
+                api_settings.NON_FIELD_ERRORS_KEY: [self.ACTIVE_CAMPAIGN_ERROR]
+            })
+        return data
+
+    def create(self, validated_data):
+        """
+        Concurrent requests can both pass the validation, so the violation of
+        the active campaign constraint is turned into the same validation
+        error. The savepoint keeps any outer transaction usable.
+        """
+        try:
+            with transaction.atomic():
+                return super().create(validated_data)
+        except IntegrityError as e:
+            if 'unique_active_sms_campaign' in str(e):
+                raise serializers.ValidationError({
+                    api_settings.NON_FIELD_ERRORS_KEY: [self.ACTIVE_CAMPAIGN_ERROR]
+                })
+            raise
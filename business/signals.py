@@ -0,0 +1,148 @@
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from expenses.models import Expense
+from payments.models import Payment, SoldItem
+from shared.utils import cache
+
+from .models import BusinessAccount, BusinessAccountTax, PeriodSnapshot
+from .periods import month_start, refresh_expenses, refresh_sales
+from .reports import CACHE_NAMESPACE as REPORT_CACHE_NAMESPACE
+from .tenancy import invalidate_business_ids
+
+
+def _invalidate_reports(business_id):
+    transaction.on_commit(partial(cache.invalidate, REPORT_CACHE_NAMESPACE, business_id))
+
+
+def _refresh_sales(business_id, datetimes):
+    """
+    Refresh the snapshots of the closed months of the payment dates, once
+    the current transaction is committed.
+    """
+    current_period = month_start(timezone.localdate())
+    periods = {month_start(timezone.localtime(value).date()) for value in datetimes if value}
+    periods = {period for period in periods if period < current_period}
+    if not periods:
+        return
+    closed = PeriodSnapshot.objects.filter(business_account_id=business_id, period__in=periods)
+    if closed.exists():
+        transaction.on_commit(partial(refresh_sales, business_id, periods))
+
+
+@receiver(pre_save, sender=Payment)
+def remember_payment_updated_at(sender, instance, **kwargs):
+    """
+    Remember the saved `updated_at` of updated payments, so that the cash in
+    of the month a completed payment was completed in can be refreshed.
+    """
+    if instance._state.adding:
+        return
+    instance._saved_updated_at = Payment.objects.filter(pk=instance.pk) \
+        .values_list('updated_at', flat=True).first()
+
+
+@receiver(post_save, sender=Payment)
+@receiver(post_delete, sender=Payment)
+def invalidate_payment_reports(sender, instance, **kwargs):
+    """
+    Invalidate the cached financial statements on payment writes, and
+    refresh the snapshots of the closed months the payment was made or
+    completed in.
+    """
+    business_id = instance.order.business_account_id
+    _refresh_sales(business_id, (instance.created_at, instance.updated_at,
+                                 getattr(instance, '_saved_updated_at', None)))
+    _invalidate_reports(business_id)
+
+
+@receiver(post_save, sender=SoldItem)
+@receiver(post_delete, sender=SoldItem)
+def invalidate_sold_item_reports(sender, instance, **kwargs):
+    """
+    Invalidate the cached financial statements on sold item writes, and
+    refresh the snapshots of the closed months their payment was made or
+    completed in.
+    """
+    payment = instance.payment
+    business_id = payment.order.business_account_id
+    _refresh_sales(business_id, (payment.created_at, payment.updated_at))
+    _invalidate_reports(business_id)
+
+
+@receiver(pre_save, sender=Expense)
+def remember_expense_date(sender, instance, **kwargs):
+    """
+    Remember the saved date of updated expenses, so that the snapshot of
+    the month they are moved from can be refreshed.
+    """
+    if instance._state.adding:
+        return
+    instance._saved_date = Expense.objects.filter(pk=instance.pk) \
+        .values_list('date', flat=True).first()
+
+
+@receiver(post_save, sender=Expense)
+@receiver(post_delete, sender=Expense)
+def invalidate_expense_reports(sender, instance, **kwargs):
+    """
+    Invalidate the cached financial statements on expense writes, and
+    refresh the snapshots of the closed months the expense is dated in.
+    """
+    periods = {month_start(instance.date)}
+    saved_date = getattr(instance, '_saved_date', None)
+    if saved_date is not None:
+        periods.add(month_start(saved_date))
+
+    business_id = instance.business_account_id
+    closed = PeriodSnapshot.objects.filter(business_account_id=business_id, period__in=periods)
+    if closed.exists():
+        transaction.on_commit(partial(refresh_expenses, business_id, periods))
+    _invalidate_reports(business_id)
+
+
+@receiver(post_save, sender=PeriodSnapshot)
+@receiver(post_delete, sender=PeriodSnapshot)
+def invalidate_snapshot_reports(sender, instance, **kwargs):
+    """
+    Invalidate the cached financial statements on snapshot writes (e.g. in
+    the admin).
+    """
+    _invalidate_reports(instance.business_account_id)
+
+
+@receiver(post_save, sender=BusinessAccountTax)
+@receiver(post_delete, sender=BusinessAccountTax)
+def invalidate_tax_reports(sender, instance, **kwargs):
+    """
+    Invalidate the cached financial statements on tax writes.
+    """
+    _invalidate_reports(instance.business_account_id)
+
+
+@receiver(pre_save, sender=BusinessAccount)
+def remember_business_account_user(sender, instance, **kwargs):
+    """
+    Remember the saved user of updated business accounts, so that the
+    business IDs of a previous owner are invalidated too.
+    """
+    if instance._state.adding:
+        return
+    instance._saved_user_id = BusinessAccount.objects.filter(pk=instance.pk) \
+        .values_list('user_id', flat=True).first()
+
+
+@receiver(post_save, sender=BusinessAccount)
+@receiver(post_delete, sender=BusinessAccount)
+def invalidate_business_ids_cache(sender, instance, **kwargs):
+    """
+    Invalidate the cached business IDs of the owners of the business
+    account (see `business.tenancy`).
+    """
+    user_ids = {instance.user_id, getattr(instance, '_saved_user_id', None)} - {None}
+    for user_id in user_ids:
+        transaction.on_commit(partial(invalidate_business_ids, user_id))
@@ -0,0 +1,18 @@
+from celery import shared_task
+
+from .models import BusinessAccount
+from .periods import close_periods as close_business_periods
+
+
+@shared_task
+def close_periods():
+    """
+    Close the months which are over for all business accounts.
+
+    Only months which are not closed yet are computed, so missed runs are
+    caught up by the next one.
+    """
+    count = 0
+    for business_account in BusinessAccount.objects.order_by('pk').iterator():
+        count += len(close_business_periods(business_account))
+    return count
@@ -0,0 +1,102 @@
+"""
+Request-scoped tenant context.
+
+The IDs of the business accounts of a user are cached for the access
+token lifetime (and invalidated on business account writes, see
+`business.signals`), so ownership checks are set-membership checks
+without any query. Users authenticated from their token claims (see
+`accounts.authentication`) bring their business IDs along, and only fall
+back to the cached IDs for business accounts created since the token was
+issued. The context is attached to every request by `TenantMiddleware` and
+resolved on first use, i.e. after the API authentication, so it is
+computed once per request.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.http import Http404
+from django.utils.functional import SimpleLazyObject
+
+from .models import BusinessAccount
+
+
+def _business_ids_key(user_id):
+    return f'tenancy:business-ids:{user_id}'
+
+
+def get_business_ids(user):
+    """
+    Returns the IDs (as strings) of the business accounts of the user.
+    """
+    key = _business_ids_key(user.pk)
+    business_ids = cache.get(key)
+    if business_ids is None:
+        business_ids = frozenset(
+            str(pk) for pk in BusinessAccount.objects.filter(user_id=user.pk)
+            .values_list('pk', flat=True)
+        )
+        timeout = settings.SIMPLE_JWT['ACCESS_TOKEN_LIFETIME'].total_seconds()
+        cache.set(key, business_ids, timeout)
+    return business_ids
+
+
+def invalidate_business_ids(user_id):
+    cache.delete(_business_ids_key(user_id))
+
+
+class TenantContext:
+    """
+    The business accounts of the user of a request.
+    """
+
+    def __init__(self, user):
+        self.user = user
+        self.business_ids = getattr(user, 'business_ids', None)
+        self.from_claims = self.business_ids is not None
+        if not self.from_claims:
+            self.business_ids = get_business_ids(user) if user.is_authenticated else frozenset()
+        self._business_accounts = {}
+
+    def owns(self, business_id):
+        business_id = str(business_id)
+        if business_id in self.business_ids:
+            return True
+        if self.from_claims and business_id in get_business_ids(self.user):
+            self.business_ids |= {business_id}
+            return True
+        return False
+
+    def get_business_account(self, business_id):
+        """
+        Returns the business account of the user, fetched at most once per
+        request.
+
+        Raises:
+          Http404: The business account is not owned by the user.
+        """
+        business_id = str(business_id)
+        if not self.owns(business_id):
+            raise Http404
+        if business_id not in self._business_accounts:
+            # The owner is checked again, in case the claims are out of date
+            business_account = BusinessAccount.objects.filter(pk=business_id,
+                                                              user_id=self.user.pk).first()
+            if business_account is None:
+                raise Http404
+            self._business_accounts[business_id] = business_account
+        return self._business_accounts[business_id]
+
+
+class TenantMiddleware:
+    """
+    Attach the tenant context of the user to the request as `tenant`.
+
+    The context is resolved lazily, since API requests are only
+    authenticated by the view (which sets the user of the `HttpRequest`).
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request.tenant = SimpleLazyObject(lambda: TenantContext(request.user))
+        return self.get_response(request)
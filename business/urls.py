@@ -2,9 +2,9 @@ from django.urls import path, include
 
 from rest_framework.routers import DefaultRouter
 
-from business.views import business_accounts, business_customers, \
+from business.views import business_accounts, business_campaigns, business_customers, \
     business_expenses, business_inventory, business_orders, business_payments,\
-    business_sales, business_notifications, business_taxes
+    business_sales, business_notifications, business_taxes, business_reports
 
 
 app_name = 'business'
@@ -21,6 +21,10 @@ router.register(
     r'(?P<business_id>[0-9a-f-]+)/expenses',
     business_expenses.BusinessExpenseViewSet
 )
+router.register(
+    r'(?P<business_id>[0-9a-f-]+)/recurring-expenses',
+    business_expenses.BusinessRecurringExpenseViewSet
+)
 router.register(
     r'(?P<business_id>[0-9a-f-]+)/inventory/stocks',
     business_inventory.BusinessStockViewSet
@@ -46,6 +50,10 @@ router.register(
     r'(?P<business_id>[0-9a-f-]+)/taxes',
     business_taxes.BusinessTaxViewSet
 )
+router.register(
+    r'(?P<business_id>[0-9a-f-]+)/sms-campaigns',
+    business_campaigns.SMSCampaignViewSet
+)
 
 # Must be at the bottom to match '' pattern
 router.register(r'', business_accounts.BusinessAccountViewSet)
@@ -83,5 +91,30 @@ urlpatterns = [
         business_orders.OrderDetailView.as_view(),
         name='order-detail'
     ),
+    path(
+        '<uuid:business_id>/inventory/report/',
+        business_inventory.InventoryReportView.as_view(),
+        name='inventory-report'
+    ),
+    path(
+        '<uuid:business_id>/reports/aging/',
+        business_reports.AgingReportView.as_view(),
+        name='aging-report'
+    ),
+    path(
+        '<uuid:business_id>/reports/aging.csv',
+        business_reports.AgingReportExportView.as_view(),
+        name='aging-report-export'
+    ),
+    path(
+        '<uuid:business_id>/reports/pnl/',
+        business_reports.PnLReportView.as_view(),
+        name='pnl-report'
+    ),
+    path(
+        '<uuid:business_id>/reports/cashflow/',
+        business_reports.CashFlowReportView.as_view(),
+        name='cashflow-report'
+    ),
     path('', include(router.urls)),
 ]
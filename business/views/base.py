@@ -1,10 +1,11 @@
-from django.shortcuts import get_object_or_404
+from accounts.authentication import get_business_authentication_classes
 
 
 class BaseBusinessAccountDetailViewSet:
     """
     Base view class for business account detail viewsets.
     """
+    authentication_classes = get_business_authentication_classes()
 
     def get_queryset(self):
         qs = super().get_queryset()
@@ -16,8 +17,7 @@ class BaseBusinessAccountDetailViewSet:
         Return the current active business account.
         """
         business_id = self.kwargs.get('business_id')
-        user_business_accounts = self.request.user.business_accounts.all()
-        return get_object_or_404(user_business_accounts, pk=business_id)
+        return self.request.tenant.get_business_account(business_id)
 
     def get_serializer_context(self):
         context = super().get_serializer_context()
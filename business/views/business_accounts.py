@@ -5,6 +5,7 @@ from rest_framework.viewsets import ReadOnlyModelViewSet
 from rest_framework.permissions import IsAuthenticated
 from drf_yasg.utils import swagger_auto_schema
 
+from accounts.authentication import get_business_authentication_classes
 from shared import schema as shared_schema
 
 from business.models import BusinessType, BusinessAccount
@@ -91,9 +92,10 @@ class BusinessAccountViewSet(ReadOnlyModelViewSet):
     queryset = BusinessAccount.objects.all()
     serializer_class = BusinessAccountSerializer
     permission_classes = [IsAdminOrBusinessOwner]
+    authentication_classes = get_business_authentication_classes()
 
     def get_queryset(self):
         qs = super().get_queryset()
         if not self.request.user.is_staff:
-            qs = qs.filter(user=self.request.user)
+            qs = qs.filter(user_id=self.request.user.pk)
         return qs
@@ -0,0 +1,80 @@
+from functools import partial
+
+from django.db import transaction
+from django.utils.decorators import method_decorator
+
+from rest_framework.mixins import CreateModelMixin, ListModelMixin, RetrieveModelMixin
+from rest_framework.viewsets import GenericViewSet
+from drf_yasg.utils import swagger_auto_schema
+
+from shared import schema as shared_schema
+
+from campaigns.models import SMSCampaign
+from campaigns.tasks import start_campaign
+from business.serializers import SMSCampaignSerializer
+from business.permissions import IsBusinessOwnedResource
+from .base import BaseBusinessAccountDetailViewSet
+
+
+@method_decorator(
+    name='list',
+    decorator=swagger_auto_schema(
+        tags=['SMS Campaigns'],
+        responses={
+            200: SMSCampaignSerializer(many=True),
+            401: shared_schema.unauthorized_401_response
+        }
+    )
+)
+@method_decorator(
+    name='retrieve',
+    decorator=swagger_auto_schema(
+        tags=['SMS Campaigns'],
+        responses={
+            200: SMSCampaignSerializer(),
+            401: shared_schema.unauthorized_401_response,
+            404: shared_schema.not_found_404_response
+        }
+    )
+)
+@method_decorator(
+    name='create',
+    decorator=swagger_auto_schema(
+        tags=['SMS Campaigns'],
+        responses={
+            201: SMSCampaignSerializer(),
+            400: 'Validation Error',
+            401: shared_schema.unauthorized_401_response
+        }
+    )
+)
+class SMSCampaignViewSet(BaseBusinessAccountDetailViewSet,
+                         CreateModelMixin,
+                         ListModelMixin,
+                         RetrieveModelMixin,
+                         GenericViewSet):
+    """
+    list:
+    SMS Campaign List
+
+    Returns a list (array) of the SMS campaigns of the current business account.
+
+    retrieve:
+    SMS Campaign Detail
+
+    Returns the details of an SMS campaign, including its delivery progress.
+
+    create:
+    SMS Campaign Create
+
+    Sends an SMS reminder to every customer with an overdue pay later payment.
+    The message is sent in the background; its progress is reported by the
+    `recipientCount`, `sentCount` and `failedCount` counters.
+    """
+    queryset = SMSCampaign.objects.all()
+    serializer_class = SMSCampaignSerializer
+    permission_classes = [IsBusinessOwnedResource]
+
+    def perform_create(self, serializer):
+        super().perform_create(serializer)
+        transaction.on_commit(partial(start_campaign.delay, serializer.instance.pk))
@@ -3,6 +3,10 @@ from PIL import Image
 from django.utils.decorators import method_decorator
 from django.utils.translation import gettext_lazy as _
 
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
 from rest_framework.viewsets import ModelViewSet
 from drf_yasg import openapi
 from drf_yasg.utils import swagger_auto_schema
@@ -10,7 +14,10 @@ from drf_yasg.utils import swagger_auto_schema
 from shared import schema as shared_schema
 from business import schema as business_schema
 from customers.models import Customer
-from business.serializers import BusinessCustomerSerializer
+from customers.services import import_customers, INVALID
+from customers.stats import get_customer_stats
+from business.serializers import BusinessCustomerSerializer, CustomerImportSerializer, \
+    CustomerImportResponseSerializer, CustomerStatsPageSerializer
 from business.permissions import IsBusinessOwnedResource
 from .base import BaseBusinessAccountDetailViewSet
 
@@ -128,6 +135,16 @@ class BusinessCustomerViewSet(BaseBusinessAccountDetailViewSet, ModelViewSet):
     serializer_class = BusinessCustomerSerializer
     permission_classes = [IsBusinessOwnedResource]
 
+    MAX_IMPORT_ROWS = 5000
+    STATS_ORDERING = {
+        'orderCount': 'order_count',
+        'lifetimeSpend': 'lifetime_spend',
+        'lastPurchaseAt': 'last_purchase_at',
+        'outstandingBalance': 'outstanding_balance',
+    }
+    STATS_DEFAULT_LIMIT = 50
+    STATS_MAX_LIMIT = 200
+
     def get_queryset(self):
         qs = super().get_queryset()
         search_query = self.request.query_params.get('search')
@@ -135,3 +152,128 @@ class BusinessCustomerViewSet(BaseBusinessAccountDetailViewSet, ModelViewSet):
             qs = qs.filter(name__icontains=search_query)
         return qs
 
+    @swagger_auto_schema(
+        operation_id='business-customer-bulk-import',
+        tags=['Customers'],
+        request_body=CustomerImportSerializer(many=True),
+        responses={
+            200: CustomerImportResponseSerializer(),
+            400: 'Validation Error',
+            401: shared_schema.unauthorized_401_response
+        }
+    )
+    @action(detail=False, methods=['post'], serializer_class=CustomerImportSerializer)
+    def bulk(self, request, *args, **kwargs):
+        """
+        Customers Bulk Import
+
+        Imports a list (array) of customers (up to 5000), e.g. from the phone contacts,
+        in a single request. Phone numbers are normalized to the `E164` format. Rows
+        whose phone number or email address is already registered for the current
+        business account (or appears on an earlier row) are skipped as duplicates.
+
+        The response reports the outcome of every row by its position: `created`,
+        `duplicate` (with the ID of the registered customer) or `invalid` (with the
+        validation errors).
+        """
+        if not isinstance(request.data, list):
+            raise ValidationError({'non_field_errors': [_('Expected a list of items.')]})
+        if len(request.data) > self.MAX_IMPORT_ROWS:
+            error = _('Ensure this field has no more than 5000 elements.')
+            raise ValidationError({'non_field_errors': [error]})
+
+        results = [None] * len(request.data)
+        rows, indexes = [], []
+        for index, data in enumerate(request.data):
+            serializer = CustomerImportSerializer(data=data)
+            if serializer.is_valid():
+                rows.append(serializer.validated_data)
+                indexes.append(index)
+            else:
+                results[index] = {'index': index, 'status': INVALID, 'errors': serializer.errors}
+
+        business_account = self.get_business_account()
+        imported = import_customers(business_account, rows)
+        for index, (import_status, customer_id) in zip(indexes, imported):
+            results[index] = {'index': index, 'status': import_status, 'id': customer_id}
+
+        data = {'created': 0, 'duplicate': 0, 'invalid': 0, 'results': results}
+        for result in results:
+            data[result['status']] += 1
+        return Response(CustomerImportResponseSerializer(data).data, status=status.HTTP_200_OK)
+
+    @swagger_auto_schema(
+        operation_id='business-customer-stats',
+        tags=['Customers'],
+        manual_parameters=[
+            openapi.Parameter(
+                'ordering',
+                in_=openapi.IN_QUERY,
+                type=openapi.TYPE_STRING,
+                enum=['orderCount', '-orderCount', 'lifetimeSpend', '-lifetimeSpend',
+                      'lastPurchaseAt', '-lastPurchaseAt', 'outstandingBalance',
+                      '-outstandingBalance'],
+                default='-lifetimeSpend',
+                description=_('Order results by an aggregate. Prefix with `-` for '
+                              'descending order.')
+            ),
+            openapi.Parameter(
+                'cursor',
+                in_=openapi.IN_QUERY,
+                type=openapi.TYPE_STRING,
+                description=_('The `next` cursor of the previous page.')
+            ),
+            openapi.Parameter(
+                'limit',
+                in_=openapi.IN_QUERY,
+                type=openapi.TYPE_INTEGER,
+                description=_('Number of results per page (1 - 200, default: 50).')
+            )
+        ],
+        responses={
+            200: CustomerStatsPageSerializer(),
+            400: 'Validation Error',
+            401: shared_schema.unauthorized_401_response
+        }
+    )
+    @action(detail=False, methods=['get'], serializer_class=CustomerStatsPageSerializer)
+    def stats(self, request, *args, **kwargs):
+        """
+        Customers Stats
+
+        Returns the customers of the current business account who have a completed
+        payment or an open `CREDIT` (i.e. pay later) payment, together with their number
+        of orders, lifetime spend, last purchase date and outstanding balance of `CREDIT`
+        payments which are not completed yet.
+
+        Results are ordered by the `ordering` aggregate (default: lifetime spend, the
+        top customers first) and paginated by cursor: pass the `next` cursor of a page
+        to get the following page with the same `ordering`.
+        """
+        ordering = request.query_params.get('ordering', '-lifetimeSpend')
+        field = self.STATS_ORDERING.get(ordering.lstrip('-'))
+        if field is None:
+            error = _('Invalid ordering.')
+            raise ValidationError({'ordering': [error]})
+        if ordering.startswith('-'):
+            field = f'-{field}'
+
+        limit = request.query_params.get('limit', self.STATS_DEFAULT_LIMIT)
+        try:
+            limit = int(limit)
+        except (TypeError, ValueError):
+            limit = 0
+        if not 1 <= limit <= self.STATS_MAX_LIMIT:
+            error = _('Ensure this value is between 1 and 200.')
+            raise ValidationError({'limit': [error]})
+
+        business_account = self.get_business_account()
+        cursor = request.query_params.get('cursor')
+        try:
+            customers, next_cursor = get_customer_stats(business_account, field, cursor, limit)
+        except ValueError:
+            raise ValidationError({'cursor': [_('Invalid cursor.')]})
+
+        data = {'next': next_cursor, 'results': customers}
+        serializer = self.get_serializer(data)
+        return Response(serializer.data)
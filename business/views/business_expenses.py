@@ -1,7 +1,13 @@
+from django.db import transaction
 from django.utils.decorators import method_decorator
 from django.utils.translation import gettext_lazy as _
 
-from rest_framework.viewsets import GenericViewSet
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.parsers import MultiPartParser
+from rest_framework.response import Response
+from rest_framework.viewsets import GenericViewSet, ModelViewSet
 from rest_framework.mixins import CreateModelMixin, ListModelMixin, \
     RetrieveModelMixin
 
@@ -9,9 +15,11 @@ from drf_yasg import openapi
 from drf_yasg.utils import swagger_auto_schema
 
 from shared import schema as shared_schema
-from expenses.models import Expense
+from expenses.models import Expense, RecurringExpense
+from expenses.services import create_expenses, read_csv_rows, read_xlsx_rows
 
-from business.serializers import BusinessExpenseSerializer
+from business.serializers import BusinessExpenseSerializer, ExpenseImportSerializer, \
+    ExpenseImportResponseSerializer, BusinessRecurringExpenseSerializer
 from business.permissions import IsBusinessOwnedResource
 from .base import BaseBusinessAccountDetailViewSet
 
@@ -87,9 +95,221 @@ class BusinessExpenseViewSet(*expense_mixins):
     serializer_class = BusinessExpenseSerializer
     permission_classes = [IsBusinessOwnedResource]
 
+    MAX_IMPORT_ROWS = 10000
+    MAX_IMPORT_ERRORS = 100
+    IMPORT_READERS = {
+        'csv': read_csv_rows,
+        'xlsx': read_xlsx_rows,
+    }
+
     def get_queryset(self):
         qs = super().get_queryset()
         search_query = self.request.query_params.get('search')
         if search_query is not None:
             qs = qs.filter(title__icontains=search_query)
         return qs
+
+    @swagger_auto_schema(
+        operation_id='business-expense-bulk-create',
+        tags=['Expenses'],
+        request_body=BusinessExpenseSerializer(many=True),
+        responses={
+            201: BusinessExpenseSerializer(many=True),
+            400: 'Validation Error',
+            401: shared_schema.unauthorized_401_response
+        }
+    )
+    @action(detail=False, methods=['post'])
+    def bulk(self, request, *args, **kwargs):
+        """
+        Expense Bulk Create
+
+        Creates many expense records (up to 1000) for the current business account
+        in a single request. The request body is a list (array) of expense objects.
+        If any of the expenses is invalid, none of them is created and the errors
+        are reported by the position of the expense in the list.
+        """
+        serializer = self.get_serializer(data=request.data, many=True)
+        serializer.is_valid(raise_exception=True)
+        self.perform_create(serializer)
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+    @swagger_auto_schema(
+        operation_id='business-expense-import',
+        tags=['Expenses'],
+        manual_parameters=[
+            openapi.Parameter(
+                'file',
+                in_=openapi.IN_FORM,
+                type=openapi.TYPE_FILE,
+                required=True,
+                description=_('A CSV (UTF-8) or Excel (.xlsx) file with title, amount and '
+                              'date columns.')
+            ),
+        ],
+        responses={
+            201: ExpenseImportResponseSerializer(),
+            400: 'Validation Error',
+            401: shared_schema.unauthorized_401_response
+        }
+    )
+    @action(detail=False, methods=['post'], url_path='import', parser_classes=[MultiPartParser])
+    def import_file(self, request, *args, **kwargs):
+        """
+        Expense Import
+
+        Imports expense records (up to 10000) for the current business account from
+        a CSV (UTF-8) or Excel (`.xlsx`) file, uploaded as a form data with a `file`
+        name. The first row of the file is the header, with `title`, `amount` and
+        `date` (`YYYY-MM-DD`) columns in any order. Other columns are ignored.
+
+        The file is read and inserted in batches as it is validated. If any of the
+        rows is invalid, none of them is created and the errors are reported by
+        the line number of the row in the file (up to 100 errors).
+        """
+        serializer = ExpenseImportSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        file = serializer.validated_data['file']
+        read_rows = self.IMPORT_READERS[serializer.get_file_type(file)]
+
+        errors = []
+
+        def validated_rows():
+            for count, (number, row) in enumerate(read_rows(file), start=1):
+                if count > self.MAX_IMPORT_ROWS:
+                    error = _('Ensure the file has no more than 10000 rows.')
+                    raise ValidationError({'file': [error]})
+                row_serializer = BusinessExpenseSerializer(data=row)
+                if not row_serializer.is_valid():
+                    errors.append({'row': number, 'errors': row_serializer.errors})
+                    if len(errors) >= self.MAX_IMPORT_ERRORS:
+                        return
+                elif not errors:  # Nothing is created once a row is invalid
+                    yield row_serializer.validated_data
+
+        business_account = self.get_business_account()
+        try:
+            with transaction.atomic():
+                expenses = create_expenses(business_account, validated_rows())
+                if errors:
+                    transaction.set_rollback(True)
+        except ValueError:
+            raise ValidationError({'file': [_('The file could not be read.')]})
+
+        if errors:
+            return Response({'rows': errors}, status=status.HTTP_400_BAD_REQUEST)
+        data = ExpenseImportResponseSerializer({'created': len(expenses)}).data
+        return Response(data, status=status.HTTP_201_CREATED)
+
+
+@method_decorator(
+    name='list',
+    decorator=swagger_auto_schema(
+        tags=['Expenses'],
+        responses={
+            200: BusinessRecurringExpenseSerializer(many=True),
+            401: shared_schema.unauthorized_401_response
+        }
+    )
+)
+@method_decorator(
+    name='retrieve',
+    decorator=swagger_auto_schema(
+        tags=['Expenses'],
+        responses={
+            200: BusinessRecurringExpenseSerializer(),
+            401: shared_schema.unauthorized_401_response,
+            404: shared_schema.not_found_404_response
+        }
+    )
+)
+@method_decorator(
+    name='create',
+    decorator=swagger_auto_schema(
+        tags=['Expenses'],
+        responses={
+            201: BusinessRecurringExpenseSerializer(),
+            400: 'Validation Error',
+            401: shared_schema.unauthorized_401_response
+        }
+    )
+)
+@method_decorator(
+    name='update',
+    decorator=swagger_auto_schema(
+        tags=['Expenses'],
+        responses={
+            200: BusinessRecurringExpenseSerializer(),
+            400: 'Validation Error',
+            401: shared_schema.unauthorized_401_response,
+            404: shared_schema.not_found_404_response
+        }
+    )
+)
+@method_decorator(
+    name='partial_update',
+    decorator=swagger_auto_schema(
+        tags=['Expenses'],
+        responses={
+            200: BusinessRecurringExpenseSerializer(),
+            400: 'Validation Error',
+            401: shared_schema.unauthorized_401_response,
+            404: shared_schema.not_found_404_response
+        }
+    )
+)
+@method_decorator(
+    name='destroy',
+    decorator=swagger_auto_schema(
+        tags=['Expenses'],
+        responses={
+            204: 'No Content',
+            401: shared_schema.unauthorized_401_response,
+            404: shared_schema.not_found_404_response
+        }
+    )
+)
+class BusinessRecurringExpenseViewSet(BaseBusinessAccountDetailViewSet, ModelViewSet):
+    """
+    list:
+    Recurring Expense List
+
+    Returns a list (array) of recurring expense objects for the current business
+    account.
+
+    retrieve:
+    Recurring Expense Detail
+
+    Returns the details of a recurring expense record.
+
+    create:
+    Recurring Expense Create
+
+    Creates a new recurring expense record for the current business account. The
+    expense is created on the days matching all of its `dayOfMonth`, `monthOfYear`
+    and `dayOfWeek` cron expressions (e.g. `1`, `*` and `*` for the 1st of every
+    month) between its `startDate` and `endDate`, by a daily job. Missed days are
+    caught up on the next run. `lastGeneratedDate` is the last day expenses were
+    created up to.
+
+    update:
+    Recurring Expense Update
+
+    Updates the details of a recurring expense record. Expenses which are already
+    created are not changed.
+
+    partial_update:
+    Recurring Expense Partial Update
+
+    Partially updates the details of a recurring expense record. Expenses which
+    are already created are not changed.
+
+    destroy:
+    Recurring Expense Delete
+
+    Deletes a recurring expense record. Expenses which are already created are
+    kept.
+    """
+    queryset = RecurringExpense.objects.all()
+    serializer_class = BusinessRecurringExpenseSerializer
+    permission_classes = [IsBusinessOwnedResource]
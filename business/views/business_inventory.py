@@ -1,3 +1,4 @@
+from django.db import transaction
 from django.shortcuts import get_object_or_404
 from django.utils.decorators import method_decorator
 from django.utils.translation import gettext_lazy as _
@@ -5,18 +6,25 @@ from django.utils.translation import gettext_lazy as _
 from rest_framework import status
 from rest_framework.viewsets import ModelViewSet, ReadOnlyModelViewSet
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.generics import GenericAPIView
+from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from drf_yasg import openapi
 from drf_yasg.utils import swagger_auto_schema
 
+from accounts.authentication import get_business_authentication_classes
 from shared import schema as shared_schema
 from inventory import schema as inventory_schema
 from inventory.models import Stock, Sold
+from inventory.reports import build_inventory_report
+from inventory import services as inventory_services
 from inventory.serializers import BarcodeFindSerializer
 
 from business import schema as business_schema
 from business.serializers import BusinessStockSerializer, RestockingSerializer, \
-    BusinessSoldSerializer
+    BusinessSoldSerializer, InventoryReportSerializer, BulkRestockingSerializer, \
+    BulkPriceSerializer
 from business.permissions import IsBusinessOwnedResource, \
     IsBusinessOwnedSoldItem
 from .base import BaseBusinessAccountDetailViewSet
@@ -171,6 +179,54 @@ class BusinessStockViewSet(BaseBusinessAccountDetailViewSet, ModelViewSet):
             return Response(data)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
+    @swagger_auto_schema(
+        operation_id='inventory-stock-bulk-create',
+        tags=['Inventory'],
+        request_body=openapi.Schema(
+            type=openapi.TYPE_ARRAY,
+            items=business_schema.stock_request_body
+        ),
+        responses={
+            201: BusinessStockSerializer(many=True),
+            400: 'Validation Error',
+            401: shared_schema.unauthorized_401_response
+        }
+    )
+    @action(detail=False, methods=['post'])
+    def bulk(self, request, *args, **kwargs):
+        """
+        Stock Bulk Create
+
+        Creates many inventory stock records (up to 1000) for the current business
+        account in a single request. The request body is a list (array) of stock
+        objects. If any of the stocks is invalid, none of them is created.
+        """
+        serializer = self.get_serializer(data=request.data, many=True)
+        serializer.is_valid(raise_exception=True)
+        self.perform_create(serializer)
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+    @swagger_auto_schema(
+        operation_id='inventory-stock-low-list',
+        tags=['Inventory'],
+        responses={
+            200: BusinessStockSerializer(many=True),
+            401: shared_schema.unauthorized_401_response
+        }
+    )
+    @action(detail=False)
+    def low(self, request, *args, **kwargs):
+        """
+        Low Stock List
+
+        Returns a list (array) of inventory stock objects whose quantity left is
+        at or below their `reorderLevel`. Stocks without a `reorderLevel` are
+        never included.
+        """
+        queryset = self.get_queryset().low()
+        serializer = self.get_serializer(queryset, many=True)
+        return Response(serializer.data)
+
     @swagger_auto_schema(
         operation_id='inventory-stock-restocking',
         tags=['Inventory'],
@@ -197,6 +253,107 @@ class BusinessStockViewSet(BaseBusinessAccountDetailViewSet, ModelViewSet):
             return Response(serializer.data)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
+    @swagger_auto_schema(
+        operation_id='inventory-stock-bulk-restocking',
+        tags=['Inventory'],
+        request_body=BulkRestockingSerializer(),
+        responses={
+            200: RestockingSerializer(many=True),
+            400: 'Validation Error',
+            401: shared_schema.unauthorized_401_response
+        }
+    )
+    @action(detail=False, methods=['put'], url_path='restock',
+            serializer_class=BulkRestockingSerializer)
+    def bulk_restock(self, request, *args, **kwargs):
+        """
+        Bulk Restock Inventory
+
+        Restock many inventory items in a single request. Stocks are selected either
+        with a list of `items`, each with its own `restockedQuantity`, or with a
+        `filter` expression together with a single `restockedQuantity` for all matched
+        stocks. The `lastRestockedDate` field of every restocked item is updated with
+        the current datetime timestamp.
+
+        All stocks are updated in a single transaction. If any of the `items` is not
+        found, nothing is updated.
+        """
+        serializer = BulkRestockingSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        business_account = self.get_business_account()
+        data = serializer.validated_data
+
+        with transaction.atomic():
+            if 'items' in data:
+                quantities = {item['id']: item['restocked_quantity'] for item in data['items']}
+                updated = inventory_services.restock_stocks(business_account, quantities)
+                self._check_bulk_updated(quantities, updated)
+            else:
+                queryset = serializer.filter_queryset(self.get_queryset())
+                updated = inventory_services.restock_queryset(
+                    business_account, queryset, data['restocked_quantity']
+                )
+
+        stocks = self.get_queryset().filter(pk__in=updated)
+        return Response(RestockingSerializer(stocks, many=True).data)
+
+    @swagger_auto_schema(
+        operation_id='inventory-stock-bulk-price-update',
+        tags=['Inventory'],
+        request_body=BulkPriceSerializer(),
+        responses={
+            200: BusinessStockSerializer(many=True),
+            400: 'Validation Error',
+            401: shared_schema.unauthorized_401_response
+        }
+    )
+    @action(detail=False, methods=['patch'], url_path='prices',
+            serializer_class=BulkPriceSerializer)
+    def bulk_prices(self, request, *args, **kwargs):
+        """
+        Bulk Price Update
+
+        Update the prices of many inventory items in a single request. Stocks are
+        selected either with a list of `items`, each with its new `price`, or with a
+        `filter` expression together with a `percentage` (e.g. `10` for +10%) or an
+        `amount` to add to the price of all matched stocks. Prices never drop below zero.
+
+        All stocks are updated in a single transaction. If any of the `items` is not
+        found, nothing is updated.
+        """
+        serializer = BulkPriceSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        business_account = self.get_business_account()
+        data = serializer.validated_data
+
+        with transaction.atomic():
+            if 'items' in data:
+                prices = {item['id']: item['price'] for item in data['items']}
+                updated = inventory_services.update_prices(business_account, prices)
+                self._check_bulk_updated(prices, updated)
+            else:
+                queryset = serializer.filter_queryset(self.get_queryset())
+                updated = inventory_services.adjust_prices(
+                    business_account, queryset,
+                    percentage=data.get('percentage'),
+                    amount=data.get('amount')
+                )
+
+        stocks = self.get_queryset().filter(pk__in=updated)
+        serializer = BusinessStockSerializer(stocks, many=True,
+                                             context=self.get_serializer_context())
+        return Response(serializer.data)
+
+    def _check_bulk_updated(self, items, updated):
+        """
+        Roll back a bulk update if some of the requested stocks are not found.
+        """
+        missing = set(items) - set(updated)
+        if missing:
+            ids = ', '.join(sorted(str(stock_id) for stock_id in missing))
+            error = {'items': [_('Stocks not found: ') + ids]}
+            raise ValidationError(error)
+
 
 @method_decorator(
     name='list',
@@ -243,6 +400,7 @@ class SoldInventoryViewSet(ReadOnlyModelViewSet):
     queryset = Sold.objects.filter(quantity__gt=0)
     serializer_class = BusinessSoldSerializer
     permission_classes = [IsBusinessOwnedSoldItem]
+    authentication_classes = get_business_authentication_classes()
 
     def get_queryset(self):
         qs = super().get_queryset()
@@ -253,3 +411,59 @@ class SoldInventoryViewSet(ReadOnlyModelViewSet):
             if search_query is not None:
                 qs = qs.filter(stock__product__icontains=search_query)
         return qs
+
+
+class InventoryReportView(BaseBusinessAccountDetailViewSet, GenericAPIView):
+    """
+    get:
+    Inventory Report
+
+    Returns the inventory valuation and turnover report of the current business
+    account over the last `days` days (default: 30).
+
+    **Response Body** <br />
+    - Total stock value (i.e. quantity x price) and the value of each stock
+    - Units sold during the period
+    - Days of cover at the sales rate of the period
+    - Dead stocks (i.e. stock left but nothing sold during the period)
+    """
+    serializer_class = InventoryReportSerializer
+    permission_classes = [IsAuthenticated]
+
+    DEFAULT_DAYS = 30
+    MAX_DAYS = 365
+
+    @swagger_auto_schema(
+        operation_id='inventory-report',
+        tags=['Inventory'],
+        manual_parameters=[
+            openapi.Parameter(
+                'days',
+                in_=openapi.IN_QUERY,
+                type=openapi.TYPE_INTEGER,
+                description=_('Length of the report period in days (1 - 365).')
+            )
+        ],
+        responses={
+            200: InventoryReportSerializer(),
+            400: 'Validation Error',
+            401: shared_schema.unauthorized_401_response,
+            404: shared_schema.not_found_404_response
+        }
+    )
+    def get(self, request, *args, **kwargs):
+        business_account = self.get_business_account()
+        report = build_inventory_report(business_account, self._get_days())
+        serializer = self.get_serializer(report)
+        return Response(serializer.data)
+
+    def _get_days(self):
+        days = self.request.query_params.get('days', self.DEFAULT_DAYS)
+        try:
+            days = int(days)
+        except (TypeError, ValueError):
+            days = 0
+        if not 1 <= days <= self.MAX_DAYS:
+            error = _('Ensure this value is between 1 and 365.')
+            raise ValidationError({'days': [error]})
+        return days
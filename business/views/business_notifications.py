@@ -1,16 +1,22 @@
+from django.http import Http404
 from django.utils.decorators import method_decorator
 from django.utils.translation import gettext_lazy as _
 
+from rest_framework.decorators import action
 from rest_framework.mixins import ListModelMixin, RetrieveModelMixin, \
     UpdateModelMixin
+from rest_framework.response import Response
 from rest_framework.viewsets import GenericViewSet
 
 from drf_yasg import openapi
 from drf_yasg.utils import swagger_auto_schema
 
+from notifications.counters import get_unread_count
 from notifications.models import Notification
+from notifications.services import mark_seen
 
-from business.serializers import NotificationSerializer
+from business.serializers import NotificationSerializer, NotificationCountSerializer, \
+    NotificationMarkSeenSerializer, NotificationMarkSeenResponseSerializer
 from business.permissions import IsBusinessOwnedResource
 from .base import BaseBusinessAccountDetailViewSet
 
@@ -87,7 +93,9 @@ class NotificationViewSet(*cls_mixins):
     Notification List
 
     Returns a list (array) of all notifications for the current business
-    account.
+    account. Instead of polling the list, new notifications can be received
+    as server-sent `notification` events from
+    `GET /business/<id>/notifications/stream/`.
 
     retrieve:
     Notification Detail
@@ -116,3 +124,56 @@ class NotificationViewSet(*cls_mixins):
         if search_query is not None:
             qs = qs.filter(notification_type__icontains=search_query)
         return qs
+
+    @swagger_auto_schema(
+        operation_id='business-notification-count',
+        tags=['Notifications'],
+        responses={
+            200: NotificationCountSerializer(),
+            401: 'Unauthorized',
+            404: 'Not Found'
+        }
+    )
+    @action(detail=False)
+    def count(self, request, *args, **kwargs):
+        """
+        Notification Count
+
+        Returns the number of unseen notifications of the current business account,
+        e.g. for a badge. The count is served from a cached counter, so it is cheap
+        to poll.
+        """
+        business_id = self.kwargs.get('business_id')
+        if not request.tenant.owns(business_id):
+            raise Http404
+        data = {'unread': get_unread_count(business_id)}
+        return Response(NotificationCountSerializer(data).data)
+
+    @swagger_auto_schema(
+        operation_id='business-notification-mark-seen',
+        tags=['Notifications'],
+        request_body=NotificationMarkSeenSerializer(),
+        responses={
+            200: NotificationMarkSeenResponseSerializer(),
+            400: 'Validation Error',
+            401: 'Unauthorized',
+            404: 'Not Found'
+        }
+    )
+    @action(detail=False, methods=['post'], url_path='mark-seen',
+            serializer_class=NotificationMarkSeenSerializer)
+    def mark_seen(self, request, *args, **kwargs):
+        """
+        Notification Bulk Mark Seen
+
+        Mark many notifications of the current business account as seen in a single
+        request, either by a list of their `ids` or all of them with `all` set to
+        `true`. IDs of notifications which are already seen (or not found) are
+        ignored.
+        """
+        serializer = NotificationMarkSeenSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        business_account = self.get_business_account()
+        updated = mark_seen(business_account.pk, serializer.validated_data.get('ids'))
+        data = {'updated': updated, 'unread': get_unread_count(business_account.pk)}
+        return Response(NotificationMarkSeenResponseSerializer(data).data)
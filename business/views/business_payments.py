@@ -1,16 +1,20 @@
 from django.db.models import Q
-from django.http import HttpResponse
+from django.http import Http404, HttpResponse, StreamingHttpResponse
+from django.utils.dateparse import parse_date
 from django.utils.decorators import method_decorator
 from django.utils.translation import gettext_lazy as _
 
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.mixins import CreateModelMixin, RetrieveModelMixin, \
     UpdateModelMixin, ListModelMixin
 from rest_framework.viewsets import GenericViewSet
 from drf_yasg import openapi
 from drf_yasg.utils import swagger_auto_schema
 
+from accounts.authentication import get_business_authentication_classes
 from payments.models import Payment
+from payments.receipts import ReceiptRenderer, iter_payments, stream_receipts_zip
 from business.serializers import PaymentSerializer
 from business.permissions import IsBusinessOwnedPayment, IsPaymentNotCompleted
 from notifications.helpers.payment_notifications import pay_later_reminder
@@ -188,6 +192,7 @@ class BusinessPaymentViewSet(*cls_args):
     queryset = Payment.objects.all()
     serializer_class = PaymentSerializer
     permission_classes = [IsBusinessOwnedPayment]
+    authentication_classes = get_business_authentication_classes()
 
     def get_queryset(self):
         qs = super().get_queryset()
@@ -242,6 +247,72 @@ class BusinessPaymentViewSet(*cls_args):
         response['Content-Disposition'] = 'attachment; filename="Receipt.pdf"'
         return response
 
+    @swagger_auto_schema(
+        operation_id='business-payment-receipts-zip',
+        tags=['Payments'],
+        manual_parameters=[
+            openapi.Parameter(
+                'from',
+                in_=openapi.IN_QUERY,
+                type=openapi.TYPE_STRING,
+                format=openapi.FORMAT_DATE,
+                description=_('Include payments created on or after this date.')
+            ),
+            openapi.Parameter(
+                'to',
+                in_=openapi.IN_QUERY,
+                type=openapi.TYPE_STRING,
+                format=openapi.FORMAT_DATE,
+                description=_('Include payments created on or before this date.')
+            )
+        ],
+        responses={
+            200: 'A ZIP archive of PDF receipts',
+            400: 'Validation Errors',
+            401: 'Unauthorized',
+            404: 'Not Found',
+        }
+    )
+    @action(detail=False, url_path='receipts.zip', serializer_class=None)
+    def receipts_zip(self, request, business_id=None):
+        """
+        Payment Receipts Export
+
+        Returns a ZIP archive of the PDF receipts of all payments created
+        between the `from` and `to` dates (inclusive). Other filters of the
+        payment list endpoint are also applied. The archive is streamed, so
+        the download starts before all receipts are rendered.
+        """
+        if not request.tenant.owns(business_id):
+            raise Http404
+        qs = self.get_queryset()
+
+        date_from = self._get_date_query_param('from')
+        if date_from is not None:
+            qs = qs.filter(created_at__date__gte=date_from)
+
+        date_to = self._get_date_query_param('to')
+        if date_to is not None:
+            qs = qs.filter(created_at__date__lte=date_to)
+
+        renderer = ReceiptRenderer(request.build_absolute_uri())
+        response = StreamingHttpResponse(
+            stream_receipts_zip(iter_payments(qs), renderer),
+            content_type='application/zip'
+        )
+        response['Content-Disposition'] = 'attachment; filename="Receipts.zip"'
+        return response
+
+    def _get_date_query_param(self, name):
+        value = self.request.query_params.get(name)
+        if not value:
+            return None
+        date = parse_date(value)
+        if date is None:
+            error = _('Date has wrong format. Use the format `yyyy-mm-dd`.')
+            raise ValidationError({name: [error]})
+        return date
+
     def perform_create(self, serializer):
         payment = serializer.save()
 
@@ -0,0 +1,227 @@
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from django.utils.translation import gettext_lazy as _
+
+from rest_framework.exceptions import ValidationError
+from rest_framework.generics import GenericAPIView
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from drf_yasg import openapi
+from drf_yasg.utils import swagger_auto_schema
+
+from shared import schema as shared_schema
+from payments.reports import build_aging_report, stream_aging_csv
+
+from business.reports import BUCKETS, build_cashflow_report, build_pnl_report
+from business.serializers import AgingReportSerializer, CashFlowReportSerializer, \
+    PnLReportSerializer
+from .base import BaseBusinessAccountDetailViewSet
+
+
+as_of_parameter = openapi.Parameter(
+    'asOf',
+    in_=openapi.IN_QUERY,
+    type=openapi.TYPE_STRING,
+    format=openapi.FORMAT_DATE,
+    description=_('Count the days overdue to this date (default: today).')
+)
+
+
+class BaseReportView(BaseBusinessAccountDetailViewSet, GenericAPIView):
+    permission_classes = [IsAuthenticated]
+
+    def _get_date_query_param(self, name, default=None):
+        value = self.request.query_params.get(name)
+        if not value:
+            return default
+        date = parse_date(value)
+        if date is None:
+            error = _('Date has wrong format. Use the format `yyyy-mm-dd`.')
+            raise ValidationError({name: [error]})
+        return date
+
+
+statement_parameters = [
+    openapi.Parameter(
+        'from',
+        in_=openapi.IN_QUERY,
+        type=openapi.TYPE_STRING,
+        format=openapi.FORMAT_DATE,
+        description=_('Start date (default: the first day of the current year).')
+    ),
+    openapi.Parameter(
+        'to',
+        in_=openapi.IN_QUERY,
+        type=openapi.TYPE_STRING,
+        format=openapi.FORMAT_DATE,
+        description=_('End date (default: today).')
+    ),
+    openapi.Parameter(
+        'bucket',
+        in_=openapi.IN_QUERY,
+        type=openapi.TYPE_STRING,
+        enum=list(BUCKETS),
+        default='month',
+        description=_('Length of the periods the statement is broken into.')
+    ),
+]
+
+
+class AgingReportView(BaseReportView):
+    """
+    get:
+    Accounts Receivable Aging Report
+
+    Returns the amounts owed by customers through `CREDIT` (i.e. pay later) payments
+    which are not completed yet, grouped by the number of days past their pay later
+    date: current (i.e. not due yet), 1 - 30, 31 - 60, 61 - 90 and over 90 days.
+
+    Customers are ordered by their total balance, the largest first. Use the CSV
+    export for large reports.
+    """
+    serializer_class = AgingReportSerializer
+
+    @swagger_auto_schema(
+        operation_id='aging-report',
+        tags=['Reports'],
+        manual_parameters=[as_of_parameter],
+        responses={
+            200: AgingReportSerializer(),
+            400: 'Validation Error',
+            401: shared_schema.unauthorized_401_response,
+            404: shared_schema.not_found_404_response
+        }
+    )
+    def get(self, request, *args, **kwargs):
+        business_account = self.get_business_account()
+        as_of = self._get_date_query_param('asOf')
+        report = build_aging_report(business_account, as_of)
+        serializer = self.get_serializer(report)
+        return Response(serializer.data)
+
+
+class AgingReportExportView(BaseReportView):
+    """
+    get:
+    Accounts Receivable Aging Report Export
+
+    Returns the accounts receivable aging report as a CSV file, one row per customer.
+    The file is streamed while it is generated.
+    """
+
+    @swagger_auto_schema(
+        operation_id='aging-report-export',
+        tags=['Reports'],
+        manual_parameters=[as_of_parameter],
+        responses={
+            200: 'A CSV file',
+            400: 'Validation Error',
+            401: shared_schema.unauthorized_401_response,
+            404: shared_schema.not_found_404_response
+        }
+    )
+    def get(self, request, *args, **kwargs):
+        business_account = self.get_business_account()
+        as_of = self._get_date_query_param('asOf', timezone.localdate())
+        response = StreamingHttpResponse(
+            stream_aging_csv(business_account, as_of),
+            content_type='text/csv'
+        )
+        filename = f'aging-report-{as_of:%Y%m%d}.csv'
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
+
+
+class BaseStatementView(BaseReportView):
+    """
+    Base view for financial statements over a date range broken into periods.
+    """
+    MAX_PERIODS = 366
+
+    # Approximate number of days per period, to limit the number of periods
+    BUCKET_DAYS = {'day': 1, 'week': 7, 'month': 28, 'quarter': 89, 'year': 365}
+
+    build_report = None
+
+    def get(self, request, *args, **kwargs):
+        business_account = self.get_business_account()
+        today = timezone.localdate()
+        date_from = self._get_date_query_param('from', today.replace(month=1, day=1))
+        date_to = self._get_date_query_param('to', today)
+        if date_from > date_to:
+            error = _('Ensure the start date is not after the end date.')
+            raise ValidationError({'from': [error]})
+
+        bucket = request.query_params.get('bucket', 'month')
+        if bucket not in BUCKETS:
+            error = _('Invalid bucket.')
+            raise ValidationError({'bucket': [error]})
+        if (date_to - date_from).days // self.BUCKET_DAYS[bucket] >= self.MAX_PERIODS:
+            error = _('Ensure the date range has no more than 366 periods.')
+            raise ValidationError({'bucket': [error]})
+
+        report = self.build_report(business_account, date_from, date_to, bucket)
+        serializer = self.get_serializer(report)
+        return Response(serializer.data)
+
+
+class PnLReportView(BaseStatementView):
+    """
+    get:
+    Profit & Loss Statement
+
+    Returns the sales, taxes, expenses and net profit of the current business account
+    between two dates, broken into periods (days, weeks, months, quarters or years).
+
+    Sales are recognized when they are made, i.e. completed payments and open `CREDIT`
+    (pay later) payments by their created date. Sales amounts are before TAX; taxes
+    are collected on top of sales and are not part of the profit. Each period includes
+    the running net profit since the start date.
+    """
+    serializer_class = PnLReportSerializer
+    build_report = staticmethod(build_pnl_report)
+
+    @swagger_auto_schema(
+        operation_id='pnl-report',
+        tags=['Reports'],
+        manual_parameters=statement_parameters,
+        responses={
+            200: PnLReportSerializer(),
+            400: 'Validation Error',
+            401: shared_schema.unauthorized_401_response,
+            404: shared_schema.not_found_404_response
+        }
+    )
+    def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
+
+
+class CashFlowReportView(BaseStatementView):
+    """
+    get:
+    Cash Flow Statement
+
+    Returns the cash coming in (completed payments, after TAX) and going out (expenses)
+    of the current business account between two dates, broken into periods (days,
+    weeks, months, quarters or years).
+
+    The cash balance starts with the net cash flow of everything before the start date
+    and is given at the end of each period.
+    """
+    serializer_class = CashFlowReportSerializer
+    build_report = staticmethod(build_cashflow_report)
+
+    @swagger_auto_schema(
+        operation_id='cashflow-report',
+        tags=['Reports'],
+        manual_parameters=statement_parameters,
+        responses={
+            200: CashFlowReportSerializer(),
+            400: 'Validation Error',
+            401: shared_schema.unauthorized_401_response,
+            404: shared_schema.not_found_404_response
+        }
+    )
+    def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
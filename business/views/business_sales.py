@@ -1,4 +1,3 @@
-from django.shortcuts import get_object_or_404
 from django.utils.decorators import method_decorator
 from django.utils.translation import gettext_lazy as _
 
@@ -7,6 +6,7 @@ from django_filters import rest_framework as filters
 from drf_yasg import openapi
 from drf_yasg.utils import swagger_auto_schema
 
+from accounts.authentication import get_business_authentication_classes
 from business.permissions import IsBusinessOwnedPayment
 from business.serializers import PaymentSerializer
 from payments.filters import SalesFilter
@@ -87,6 +87,7 @@ class SalesViewSet(ReadOnlyModelViewSet):
     queryset = Payment.objects.filter(status=Payment.COMPLETED)
     serializer_class = PaymentSerializer
     permission_classes = [IsBusinessOwnedPayment]
+    authentication_classes = get_business_authentication_classes()
     filter_backends = (filters.DjangoFilterBackend,)
     filterset_class = SalesFilter
 
@@ -100,8 +101,7 @@ class SalesViewSet(ReadOnlyModelViewSet):
         Return the current active business account.
         """
         business_id = self.kwargs.get('business_id')
-        user_business_accounts = self.request.user.business_accounts.all()
-        return get_object_or_404(user_business_accounts, pk=business_id)
+        return self.request.tenant.get_business_account(business_id)
 
     def get_serializer_context(self):
         context = super().get_serializer_context()
@@ -0,0 +1,12 @@
+from django.contrib import admin
+
+from .models import SMSCampaign
+
+
+@admin.register(SMSCampaign)
+class SMSCampaignAdmin(admin.ModelAdmin):
+    list_display = ('business_account', 'status', 'recipient_count', 'sent_count',
+                    'failed_count', 'created_at', 'completed_at')
+    list_filter = ('status', )
+    readonly_fields = ('status', 'recipient_count', 'sent_count', 'failed_count',
+                       'completed_at')
@@ -0,0 +1,39 @@
+# Generated by Django 3.2.7 on 2026-10-19 06:12
+
+import campaigns.models
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('business', '0008_periodsnapshot'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SMSCampaign',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('message', models.TextField(help_text='Message template. Placeholders: `{customer_name}`, `{business_name}`, `{amount}`, `{currency}`, `{due_date}` and `{days_overdue}`.', max_length=480, validators=[campaigns.models.MessageTemplateValidator()])),
+                ('min_days_overdue', models.PositiveIntegerField(default=1, help_text='Only customers with a payment at least this many days past its pay later date are reminded.')),
+                ('status', models.CharField(choices=[('PENDING', 'Pending'), ('SENDING', 'Sending'), ('COMPLETED', 'Completed')], default='PENDING', editable=False, max_length=10)),
+                ('recipient_count', models.PositiveIntegerField(default=0, editable=False)),
+                ('sent_count', models.PositiveIntegerField(default=0, editable=False)),
+                ('failed_count', models.PositiveIntegerField(default=0, editable=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('completed_at', models.DateTimeField(blank=True, editable=False, null=True)),
+                ('business_account', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='sms_campaigns', to='business.businessaccount')),
+            ],
+            options={
+                'verbose_name': 'SMS Campaign',
+                'verbose_name_plural': 'SMS Campaigns',
+                'ordering': ('-created_at',),
+            },
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 3.2.7 on 2026-10-19 06:38
+
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def complete_duplicate_campaigns(apps, schema_editor):
+    """
+    Complete all but the latest active campaign of each business account,
+    counting their unsent messages as failed.
+    """
+    SMSCampaign = apps.get_model('campaigns', 'SMSCampaign')
+    latest = {}
+    duplicates = []
+    active = SMSCampaign.objects.filter(status__in=['PENDING', 'SENDING']).order_by('-created_at')
+    for campaign in active:
+        if campaign.business_account_id in latest:
+            duplicates.append(campaign)
+        else:
+            latest[campaign.business_account_id] = campaign
+    now = timezone.now()
+    for campaign in duplicates:
+        campaign.status = 'COMPLETED'
+        campaign.failed_count = max(campaign.recipient_count - campaign.sent_count, 0)
+        campaign.completed_at = now
+        campaign.save(update_fields=['status', 'failed_count', 'completed_at', 'updated_at'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('campaigns', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(complete_duplicate_campaigns, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='smscampaign',
+            constraint=models.UniqueConstraint(condition=models.Q(('status__in', ['PENDING', 'SENDING'])), fields=('business_account',), name='unique_active_sms_campaign'),
+        ),
+    ]
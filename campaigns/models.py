@@ -0,0 +1,97 @@
+import re
+from uuid import uuid4
+
+from django.core.exceptions import ValidationError
+from django.db import models
+from django.db.models import Q
+from django.utils.deconstruct import deconstructible
+from django.utils.translation import gettext_lazy as _
+
+from business.models import BusinessAccount
+
+
+# Placeholders of the campaign messages, e.g. `{customer_name}`
+PLACEHOLDER_RE = re.compile(r'\{(\w+)\}')
+PLACEHOLDERS = ('customer_name', 'business_name', 'amount', 'currency', 'due_date',
+                'days_overdue')
+
+
+@deconstructible
+class MessageTemplateValidator:
+    """
+    Validate that a message template only uses known placeholders.
+    """
+
+    def __call__(self, value):
+        unknown = sorted(set(PLACEHOLDER_RE.findall(value)) - set(PLACEHOLDERS))
+        if unknown:
+            raise ValidationError(
+                _('Unknown placeholders: %(placeholders)s. Use %(known)s.'),
+                params={
+                    'placeholders': ', '.join(f'{{{name}}}' for name in unknown),
+                    'known': ', '.join(f'{{{name}}}' for name in PLACEHOLDERS),
+                }
+            )
+
+    def __eq__(self, other):
+        return isinstance(other, MessageTemplateValidator)
+
+
+class SMSCampaign(models.Model):
+    """
+    An SMS reminder to every customer of a business account with overdue
+    `CREDIT` payments.
+
+    Recipients are selected when the campaign starts, and their messages
+    are sent in chunks (see `campaigns.services`). The counters are updated
+    as the chunks are sent. A business account has at most one active
+    (pending or sending) campaign.
+    """
+    PENDING = 'PENDING'
+    SENDING = 'SENDING'
+    COMPLETED = 'COMPLETED'
+
+    STATUS_CHOICES = (
+        (PENDING, _('Pending')),
+        (SENDING, _('Sending')),
+        (COMPLETED, _('Completed')),
+    )
+
+    id = models.UUIDField(primary_key=True, editable=False, default=uuid4)
+    business_account = models.ForeignKey(BusinessAccount,
+                                         on_delete=models.CASCADE,
+                                         related_name='sms_campaigns')
+    message = models.TextField(
+        max_length=480,  # 3 SMS segments
+        validators=[MessageTemplateValidator()],
+        help_text=_('Message template. Placeholders: `{customer_name}`, `{business_name}`, '
+                    '`{amount}`, `{currency}`, `{due_date}` and `{days_overdue}`.')
+    )
+    min_days_overdue = models.PositiveIntegerField(
+        default=1,
+        help_text=_('Only customers with a payment at least this many days past its pay '
+                    'later date are reminded.')
+    )
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDING,
+                              editable=False)
+    recipient_count = models.PositiveIntegerField(default=0, editable=False)
+    sent_count = models.PositiveIntegerField(default=0, editable=False)
+    failed_count = models.PositiveIntegerField(default=0, editable=False)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    completed_at = models.DateTimeField(null=True, blank=True, editable=False)
+
+    class Meta:
+        verbose_name = _('SMS Campaign')
+        verbose_name_plural = _('SMS Campaigns')
+        ordering = ('-created_at', )
+        constraints = [
+            models.UniqueConstraint(
+                fields=['business_account'],
+                condition=Q(status__in=['PENDING', 'SENDING']),
+                name='unique_active_sms_campaign'
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.business_account} - {self.created_at:%Y-%m-%d %H:%M}'
@@ -0,0 +1,239 @@
+"""
+SMS campaigns for overdue `CREDIT` payments.
+
+When a campaign starts, its recipients are counted with the aging query of
+the business account (one grouped query, see `payments.reports`). They are
+then selected and their messages rendered one chunk at a time, in customer
+order, by a chain of tasks on the `sms` Celery queue (see
+`campaigns.tasks`). Each chunk schedules the next one a short delay later,
+so no task is scheduled far ahead, where the Redis broker would deliver it
+again once its visibility timeout (1 hour) is over.
+
+Sends are rate limited per business account (`SMS_CAMPAIGN_RATE_LIMIT`
+messages per minute, across its campaigns), so a large campaign can't
+hog the gateways. Chunks over the limit are deferred to the next minute.
+
+Campaigns without progress for `SMS_CAMPAIGN_STALE_TIMEOUT` minutes (e.g.
+a lost chunk task) are completed by a beat job, so they don't block the
+next campaign of their business account.
+"""
+import time
+from datetime import timedelta
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F
+from django.db.models.functions import Greatest
+from django.utils import timezone
+from django.utils.formats import date_format
+
+from payments.reports import get_aging_queryset, get_tax_percentage
+from shared.sms.gateways import get_sms_gateway
+
+from .models import PLACEHOLDER_RE, SMSCampaign
+
+
+RATE_LIMIT_CACHE_KEY = 'campaigns:sms-rate:{}:{}'
+
+
+def render_message(template, values):
+    """
+    Returns the message template with its placeholders replaced by the
+    values. Unknown placeholders are kept as they are.
+    """
+    return PLACEHOLDER_RE.sub(lambda match: str(values.get(match[1], match[0])), template)
+
+
+def get_recipients(business_account, min_days_overdue, today=None):
+    """
+    Returns the aging rows (see `get_aging_queryset`) of the customers of
+    the business account with a phone number and a payment at least
+    `min_days_overdue` days past its pay later date.
+    """
+    today = today or timezone.localdate()
+    return get_aging_queryset(business_account, today) \
+        .filter(customer_phone_number__isnull=False,
+                oldest_pay_later_date__lte=today - timedelta(days=min_days_overdue)) \
+        .exclude(customer_phone_number='')
+
+
+def get_campaign_date(campaign):
+    """
+    Returns the date the days overdue of the campaign are counted to, i.e.
+    the day it was created, so every chunk selects the same recipients.
+    """
+    return timezone.localdate(campaign.created_at)
+
+
+def get_chunk(campaign, after=None):
+    """
+    Returns the next chunk of recipients of the campaign (in customer
+    order) with their rendered messages.
+
+    params:
+      after: ID of the last customer of the previous chunk.
+
+    Returns:
+      A `(customer_id, messages)` tuple, where `customer_id` is the ID of the
+      last customer of the chunk and `messages` is the list of `(to, body)`
+      messages (`SMS_CAMPAIGN_CHUNK_SIZE` at most).
+    """
+    today = get_campaign_date(campaign)
+    business_account = campaign.business_account
+    recipients = get_recipients(business_account, campaign.min_days_overdue, today)
+    if after is not None:
+        recipients = recipients.filter(order__customer__gt=after)
+    rows = list(recipients.order_by('customer_id')[:settings.SMS_CAMPAIGN_CHUNK_SIZE])
+    if not rows:
+        return after, []
+
+    tax_rate = Decimal(get_tax_percentage(business_account)) / 100
+    messages = []
+    for row in rows:
+        overdue = (row['total'] - row['current']) * (1 + tax_rate)
+        messages.append((str(row['customer_phone_number']), render_message(campaign.message, {
+            'customer_name': row['customer_name'],
+            'business_name': business_account.name,
+            'amount': f'{overdue:,.2f}',
+            'currency': business_account.currency,
+            'due_date': date_format(row['oldest_pay_later_date']),
+            'days_overdue': (today - row['oldest_pay_later_date']).days,
+        })))
+    return str(rows[-1]['customer_id']), messages
+
+
+@transaction.atomic
+def start_campaign(campaign_id):
+    """
+    Count the recipients of a pending campaign and mark it as sending, or
+    completed if it has no recipients.
+
+    Returns:
+      The campaign, or `None` if it was already started.
+    """
+    campaign = SMSCampaign.objects.select_for_update() \
+        .select_related('business_account') \
+        .filter(pk=campaign_id, status=SMSCampaign.PENDING) \
+        .first()
+    if campaign is None:
+        return None
+
+    campaign.recipient_count = get_recipients(
+        campaign.business_account, campaign.min_days_overdue, get_campaign_date(campaign)
+    ).count()
+    campaign.status = SMSCampaign.SENDING if campaign.recipient_count else SMSCampaign.COMPLETED
+    if not campaign.recipient_count:
+        campaign.completed_at = timezone.now()
+    campaign.save(update_fields=['recipient_count', 'status', 'completed_at', 'updated_at'])
+    return campaign
+
+
+def get_chunk_delay(chunk_size):
+    """
+    Returns the number of seconds to wait before selecting the chunk after
+    a chunk of that size, which spreads the chunks of a campaign over the
+    rate limit. Capped to a minute, since the rate limit defers the sends
+    over it anyway.
+    """
+    return min(chunk_size * 60 // settings.SMS_CAMPAIGN_RATE_LIMIT, 60)
+
+
+def reserve_sends(business_id, count):
+    """
+    Reserve `count` sends of the business account in the rate limit of the
+    current minute.
+
+    Returns:
+      0 if the sends are within the limit, or else the number of seconds to
+      wait until the next minute.
+    """
+    now = time.time()
+    window = int(now // 60)
+    key = RATE_LIMIT_CACHE_KEY.format(business_id, window)
+    cache.add(key, 0, 2 * 60)
+    total = cache.incr(key, count)
+    if total <= settings.SMS_CAMPAIGN_RATE_LIMIT or total == count:
+        return 0  # The first sends of a minute always go, even over the limit
+    cache.decr(key, count)
+    return int((window + 1) * 60 - now) + 1
+
+
+def send_messages(campaign_id, messages, retry_failed=True):
+    """
+    Send the messages of the campaign with the SMS gateway and update the
+    campaign counters.
+
+    params:
+      retry_failed (bool): Whether messages which failed with transient
+      gateway errors are returned to be retried, instead of being counted
+      as failed.
+
+    Returns:
+      The list of messages to retry.
+    """
+    retry = []
+    sent = failed = 0
+    for message, result in zip(messages, get_sms_gateway().send_many(messages)):
+        if result.error is None:
+            sent += 1
+        elif retry_failed and result.error.retryable:
+            retry.append(message)
+        else:
+            failed += 1
+    record_progress(campaign_id, sent, failed)
+    return retry
+
+
+def record_progress(campaign_id, sent, failed):
+    """
+    Add to the sent and failed counters of the campaign, and complete it
+    once all its messages are sent or failed.
+    """
+    if not sent and not failed:
+        return
+    campaigns = SMSCampaign.objects.filter(pk=campaign_id)
+    campaigns.update(sent_count=F('sent_count') + sent,
+                     failed_count=F('failed_count') + failed,
+                     updated_at=timezone.now())
+    _complete_sent(campaigns)
+
+
+def record_selected(campaign_id, selected):
+    """
+    Set the recipient count of the campaign to the number of recipients its
+    chunks selected, once they are all selected, since customers may have
+    paid (or be overdue) since the campaign started. Complete the campaign
+    if their messages are all sent or failed already.
+    """
+    campaigns = SMSCampaign.objects.filter(pk=campaign_id)
+    campaigns.update(recipient_count=selected, updated_at=timezone.now())
+    _complete_sent(campaigns)
+
+
+def _complete_sent(campaigns):
+    campaigns.filter(status=SMSCampaign.SENDING,
+                     recipient_count__lte=F('sent_count') + F('failed_count')) \
+        .update(status=SMSCampaign.COMPLETED, completed_at=timezone.now())
+
+
+def complete_stale_campaigns():
+    """
+    Complete the active campaigns without progress for
+    `SMS_CAMPAIGN_STALE_TIMEOUT` minutes. Their messages which weren't sent
+    are counted as failed.
+
+    Returns:
+      The number of completed campaigns.
+    """
+    now = timezone.now()
+    return SMSCampaign.objects.filter(
+        status__in=(SMSCampaign.PENDING, SMSCampaign.SENDING),
+        updated_at__lt=now - timedelta(minutes=settings.SMS_CAMPAIGN_STALE_TIMEOUT)
+    ).update(
+        status=SMSCampaign.COMPLETED,
+        failed_count=Greatest(F('recipient_count') - F('sent_count'), 0),
+        completed_at=now,
+        updated_at=now
+    )
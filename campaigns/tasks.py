@@ -0,0 +1,79 @@
+from celery import shared_task
+from celery.utils.time import get_exponential_backoff_interval
+from django.conf import settings
+
+from . import services
+from .models import SMSCampaign
+
+
+@shared_task
+def start_campaign(campaign_id):
+    """
+    Count the recipients of the campaign and start selecting its chunks.
+    """
+    campaign = services.start_campaign(campaign_id)
+    if campaign is not None and campaign.status == SMSCampaign.SENDING:
+        send_next_chunk.delay(campaign_id, str(campaign.business_account_id))
+
+
+@shared_task
+def send_next_chunk(campaign_id, business_id, after=None, selected=0):
+    """
+    Select the chunk of recipients of the campaign after the customer, and
+    enqueue its messages. The next chunk is selected after a delay which
+    spreads the chunks over the rate limit of the business account.
+
+    params:
+      after: ID of the last customer of the previous chunk.
+      selected (int): Number of recipients the previous chunks selected.
+    """
+    campaign = SMSCampaign.objects.select_related('business_account') \
+        .filter(pk=campaign_id).first()
+    if campaign is None:
+        return
+
+    customer_id, messages = services.get_chunk(campaign, after)
+    selected += len(messages)
+    if len(messages) == settings.SMS_CAMPAIGN_CHUNK_SIZE:
+        send_next_chunk.apply_async(args=(campaign_id, business_id, customer_id, selected),
+                                    countdown=services.get_chunk_delay(len(messages)))
+    else:
+        services.record_selected(campaign_id, selected)
+    if messages:
+        send_campaign_chunk.delay(campaign_id, business_id, messages)
+
+
+@shared_task(bind=True, max_retries=3)
+def send_campaign_chunk(self, campaign_id, business_id, messages):
+    """
+    Send a chunk of the messages of the campaign. Chunks over the rate
+    limit of the business account are deferred to the next minute, and
+    messages which failed with transient gateway errors are retried with an
+    exponential backoff (with jitter).
+    """
+    delay = services.reserve_sends(business_id, len(messages))
+    if delay:
+        send_campaign_chunk.apply_async(args=(campaign_id, business_id, messages),
+                                        countdown=delay)
+        return
+
+    retry_failed = self.request.retries < self.max_retries
+    try:
+        retry = services.send_messages(campaign_id, messages, retry_failed=retry_failed)
+    except Exception:
+        # Count the chunk as failed, so that the campaign still completes
+        services.record_progress(campaign_id, 0, len(messages))
+        raise
+    if retry:
+        countdown = get_exponential_backoff_interval(
+            factor=10, retries=self.request.retries, maximum=10 * 60, full_jitter=True
+        )
+        raise self.retry(args=(campaign_id, business_id, retry), countdown=countdown)
+
+
+@shared_task
+def complete_stale_campaigns():
+    """
+    Complete the campaigns stuck without progress.
+    """
+    return services.complete_stale_campaigns()
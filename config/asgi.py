@@ -0,0 +1,26 @@
+"""
+ASGI config for config project.
+
+It exposes the ASGI callable as a module-level variable named ``application``.
+The notification stream is served asynchronously, other requests by Django.
+
+For more information on this file, see
+https://docs.djangoproject.com/en/3.2/howto/deployment/asgi/
+"""
+
+import os
+from decouple import config
+
+from django.core.asgi import get_asgi_application
+
+os.environ.setdefault(
+    'DJANGO_SETTINGS_MODULE',
+    config('DJANGO_SETTINGS_MODULE', 'config.settings.development')
+)
+
+django_application = get_asgi_application()
+
+# Imported once Django is set up
+from notifications.asgi import NotificationStreamApplication  # noqa: E402
+
+application = NotificationStreamApplication(django_application)
@@ -1,6 +1,7 @@
 import os
 from datetime import timedelta
 from decimal import Decimal
+from celery.schedules import crontab
 from decouple import config, Csv
 from environ import Path
 
@@ -54,16 +55,21 @@ INSTALLED_APPS += [
     'orders.apps.OrdersConfig',
     'payments.apps.PaymentsConfig',
     'notifications.apps.NotificationsConfig',
+    'campaigns.apps.CampaignsConfig',
 ]
 
+# Sessions, CSRF, authentication & messages are skipped on the JSON API routes
+# (see `shared.middleware`)
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
-    'django.contrib.sessions.middleware.SessionMiddleware',
+    'shared.middleware.CompressionMiddleware',
+    'shared.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.common.CommonMiddleware',
-    'django.middleware.csrf.CsrfViewMiddleware',
-    'django.contrib.auth.middleware.AuthenticationMiddleware',
-    'django.contrib.messages.middleware.MessageMiddleware',
+    'shared.middleware.CsrfViewMiddleware',
+    'shared.middleware.AuthenticationMiddleware',
+    'business.tenancy.TenantMiddleware',
+    'shared.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
@@ -102,6 +108,21 @@ DATABASES = {
 }
 
 
+# Cache
+REDIS_CACHE_URL = config('REDIS_CACHE_URL', default=None)
+
+if REDIS_CACHE_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django_redis.cache.RedisCache',
+            'LOCATION': REDIS_CACHE_URL,
+            'OPTIONS': {
+                'CLIENT_CLASS': 'django_redis.client.DefaultClient',
+            }
+        }
+    }
+
+
 # Password validation
 # https://docs.djangoproject.com/en/2.0/ref/settings/#auth-password-validators
 
@@ -170,21 +191,45 @@ EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
 SITE_ID = 1
 
 
+# Response compression (brotli or gzip) of the JSON & MessagePack API responses
+# of at least `COMPRESSION_MIN_SIZE` bytes, see `shared.middleware.CompressionMiddleware`
+COMPRESSION_MIN_SIZE = config('COMPRESSION_MIN_SIZE', default=1024, cast=int)
+COMPRESSION_BROTLI_QUALITY = config('COMPRESSION_BROTLI_QUALITY', default=5, cast=int)  # 0-11
+COMPRESSION_CONTENT_TYPES = ('application/json', 'application/msgpack')
+
+
+# API authentication. With `API_TOKEN_AUTH_ONLY`, the API only accepts JWTs
+# (no session or basic auth), and the business routes authenticate them from
+# their claims without loading the user (see `accounts.authentication`).
+API_TOKEN_AUTH_ONLY = config('API_TOKEN_AUTH_ONLY', default=True, cast=bool)
+
+# JSON API routes, which skip the site middleware with `API_TOKEN_AUTH_ONLY`
+API_ROUTE_PREFIXES = ('/business/', '/accounts/', '/orders/', '/inventory/', '/photos/')
+
+# Public URL of the API, for the absolute URLs built without a request (e.g.
+# in beat jobs)
+API_BASE_URL = config('API_BASE_URL', default='http://localhost:8000/')
+
+API_AUTHENTICATION_CLASSES = ('dj_rest_auth.jwt_auth.JWTCookieAuthentication', )
+if not API_TOKEN_AUTH_ONLY:
+    API_AUTHENTICATION_CLASSES += (
+        'rest_framework.authentication.SessionAuthentication',
+        'rest_framework.authentication.BasicAuthentication',
+    )
+
+
 # Django REST Framework
 REST_FRAMEWORK = {
-    'DEFAULT_AUTHENTICATION_CLASSES': (
-        'dj_rest_auth.jwt_auth.JWTCookieAuthentication',
-        'rest_framework.authentication.SessionAuthentication',
-        'rest_framework.authentication.BasicAuthentication'
-    ),
+    'DEFAULT_AUTHENTICATION_CLASSES': API_AUTHENTICATION_CLASSES,
     'DEFAULT_RENDERER_CLASSES': (
-        'djangorestframework_camel_case.render.CamelCaseJSONRenderer',
+        'shared.renderers.CamelCaseJSONRenderer',
         'djangorestframework_camel_case.render.CamelCaseBrowsableAPIRenderer',
+        'shared.renderers.CamelCaseMessagePackRenderer',
     ),
     'DEFAULT_PARSER_CLASSES': (
         'djangorestframework_camel_case.parser.CamelCaseFormParser',
         'djangorestframework_camel_case.parser.CamelCaseMultiPartParser',
-        'djangorestframework_camel_case.parser.CamelCaseJSONParser',
+        'shared.parsers.CamelCaseJSONParser',
     ),
     'COERCE_DECIMAL_TO_STRING': False,
 }
@@ -240,12 +285,102 @@ SIMPLE_JWT = {
 TWILIO_ACCOUNT_SID = config('TWILIO_ACCOUNT_SID')
 TWILIO_AUTH_TOKEN = config('TWILIO_AUTH_TOKEN')
 TWILIO_PHONE_NUMBER = config('TWILIO_PHONE_NUMBER')
+TWILIO_VERIFY_SERVICE_SID = config('TWILIO_VERIFY_SERVICE_SID', default=None)
+TWILIO_TIMEOUT = config('TWILIO_TIMEOUT', default=10, cast=int)  # In seconds
+
+# Termii
+TERMII_API_KEY = config('TERMII_API_KEY', default=None)
+TERMII_SENDER_ID = config('TERMII_SENDER_ID', default='Dukka')
+TERMII_TIMEOUT = config('TERMII_TIMEOUT', default=10, cast=int)  # In seconds
+
+
+# SMS gateways, in failover order, e.g. `shared.sms.gateways.InMemoryGateway`
+# for tests and benchmarks
+SMS_GATEWAYS = config('SMS_GATEWAYS', default='shared.sms.gateways.TwilioGateway', cast=Csv())
+SMS_CONCURRENCY = config('SMS_CONCURRENCY', default=8, cast=int)  # Messages sent at once
+# A gateway is skipped for `SMS_FAILOVER_COOLDOWN` seconds once its recent error
+# rate or average latency (in seconds) crosses these
+SMS_FAILOVER_ERROR_RATE = config('SMS_FAILOVER_ERROR_RATE', default=0.5, cast=float)
+SMS_FAILOVER_LATENCY = config('SMS_FAILOVER_LATENCY', default=5, cast=float)
+SMS_FAILOVER_COOLDOWN = config('SMS_FAILOVER_COOLDOWN', default=60, cast=int)
+
+# SMS campaigns are sent in chunks, up to `SMS_CAMPAIGN_RATE_LIMIT` messages per
+# minute per business account
+SMS_CAMPAIGN_CHUNK_SIZE = config('SMS_CAMPAIGN_CHUNK_SIZE', default=100, cast=int)
+SMS_CAMPAIGN_RATE_LIMIT = config('SMS_CAMPAIGN_RATE_LIMIT', default=300, cast=int)
+# Campaigns without progress for that many minutes are completed
+SMS_CAMPAIGN_STALE_TIMEOUT = config('SMS_CAMPAIGN_STALE_TIMEOUT', default=120, cast=int)
+
+
+# OTP provider, e.g. `shared.sms.otp.FakeOTPProvider` for tests and benchmarks
+OTP_PROVIDER = config('OTP_PROVIDER', default='shared.sms.otp.TwilioVerifyProvider')
+
+
+# Celery
+CELERY_BROKER_URL = config('CELERY_BROKER_URL', default='redis://localhost:6379/0')
+CELERY_RESULT_BACKEND = 'django-db'
+CELERY_TIMEZONE = TIME_ZONE
+CELERY_BEAT_SCHEDULER = 'django_celery_beat.schedulers:DatabaseScheduler'
+CELERY_TASK_ROUTES = {
+    # OTPs are consumed by their own worker (`otp-worker` in docker-compose), so
+    # they don't wait behind the reports, bulk and campaign jobs
+    'shared.tasks.send_otp': {'queue': 'otp'},
+    'campaigns.tasks.*': {'queue': 'sms'},
+}
+CELERY_BEAT_SCHEDULE = {
+    'send-low-stock-alerts': {
+        'task': 'inventory.tasks.send_low_stock_alerts',
+        'schedule': crontab(minute=0),  # Hourly
+    },
+    'generate-recurring-expenses': {
+        'task': 'expenses.tasks.generate_recurring_expenses',
+        'schedule': crontab(minute=15, hour=0),  # Daily, before the periods are closed
+    },
+    'close-periods': {
+        'task': 'business.tasks.close_periods',
+        'schedule': crontab(minute=30, hour=0),  # Daily, catches up missed months
+    },
+    'reconcile-unread-notification-counts': {
+        'task': 'notifications.tasks.reconcile_unread_counts',
+        'schedule': crontab(minute='*/15'),
+    },
+    'archive-notifications': {
+        'task': 'notifications.tasks.archive_notifications',
+        'schedule': crontab(minute=0, hour=3),  # Daily
+    },
+    'complete-stale-sms-campaigns': {
+        'task': 'campaigns.tasks.complete_stale_campaigns',
+        'schedule': crontab(minute='*/15'),
+    },
+}
+
+
+# Notification stream
+NOTIFICATION_STREAM_REDIS_URL = config('NOTIFICATION_STREAM_REDIS_URL', default=REDIS_CACHE_URL)
+NOTIFICATION_STREAM_HEARTBEAT = config('NOTIFICATION_STREAM_HEARTBEAT', default=15, cast=int)
+
+
+# Notification retention, seen notifications older than that are archived
+# (or deleted, with `NOTIFICATION_ARCHIVE` off)
+NOTIFICATION_RETENTION_DAYS = config('NOTIFICATION_RETENTION_DAYS', default=90, cast=int)
+NOTIFICATION_ARCHIVE = config('NOTIFICATION_ARCHIVE', default=True, cast=bool)
 
 
 # TAX Constants
 VAT = Decimal('0.075')  # 7.5%
 
 
+# PDF Receipts
+RECEIPT_RENDER_WORKERS = config('RECEIPT_RENDER_WORKERS', default=2, cast=int)
+RECEIPT_BASE_URL = config('RECEIPT_BASE_URL', default='http://localhost:8000/')
+
+
+# Customer Stats
+# Read the stats from the summary table. Run `manage.py refresh_customer_stats`
+# after turning it on.
+CUSTOMER_STATS_MATERIALIZED = config('CUSTOMER_STATS_MATERIALIZED', default=False, cast=bool)
+
+
 # Static & media files
 STATICFILES_DIRS = (
     os.path.join(BASE_DIR, 'static'),
@@ -4,3 +4,7 @@ from .base import *
 DEBUG = True
 ALLOWED_HOSTS = ['*']
 ENVIRONMENT = 'testing'
+
+
+OTP_PROVIDER = 'shared.sms.otp.FakeOTPProvider'
+SMS_GATEWAYS = ['shared.sms.gateways.InMemoryGateway']
@@ -0,0 +1,31 @@
+from django.core.management import BaseCommand
+
+from customers.models import Customer
+from customers.stats import refresh_customer_stats
+
+
+class Command(BaseCommand):
+    help = ('Recompute the materialized customer stats, e.g. after turning on '
+            '`CUSTOMER_STATS_MATERIALIZED`.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--business', help='Limit to a single business account ID.')
+        parser.add_argument('--batch-size', type=int, default=1000,
+                            help='Number of customers refreshed per transaction.')
+
+    def handle(self, *args, **options):
+        qs = Customer.objects.order_by('pk')
+        if options['business']:
+            qs = qs.filter(business_account__id=options['business'])
+
+        count = 0
+        last_pk = None
+        while True:
+            batch = qs if last_pk is None else qs.filter(pk__gt=last_pk)
+            customer_ids = list(batch.values_list('pk', flat=True)[:options['batch_size']])
+            if not customer_ids:
+                break
+            refresh_customer_stats(customer_ids)
+            count += len(customer_ids)
+            last_pk = customer_ids[-1]
+        self.stdout.write(f'Stats of {count} customers are refreshed.')
@@ -0,0 +1,85 @@
+# Generated by Django 3.2.7 on 2026-10-19 05:43
+
+from django.db import migrations, models
+
+
+# The unique indexes are built concurrently, so the customers table stays
+# writable while they are being built. `CREATE INDEX CONCURRENTLY` cannot
+# run inside a transaction, hence `atomic = False`.
+CONSTRAINTS = (
+    ('unique_customer_phone_number', 'phone_number'),
+    ('unique_customer_email', 'email'),
+)
+
+
+def check_duplicates(apps, schema_editor):
+    """
+    Abort with a report of the duplicated customers, which must be merged
+    or cleaned up before the unique indexes can be built.
+    """
+    Customer = apps.get_model('customers', 'Customer')
+    table = Customer._meta.db_table
+    duplicates = []
+    with schema_editor.connection.cursor() as cursor:
+        for _, column in CONSTRAINTS:
+            cursor.execute(
+                f'SELECT business_account_id, {column}, COUNT(*) FROM {table} '
+                f"WHERE {column} IS NOT NULL AND {column} <> '' "
+                f'GROUP BY business_account_id, {column} HAVING COUNT(*) > 1'
+            )
+            duplicates += [
+                f'  business account {business_id}: {column} {value!r} ({count} customers)'
+                for business_id, value, count in cursor.fetchall()
+            ]
+
+    if duplicates:
+        raise RuntimeError(
+            'Duplicated customers must be resolved before applying this migration:\n' +
+            '\n'.join(duplicates)
+        )
+
+
+def create_index_sql(name, column):
+    """
+    Returns the statements building the unique index. A failed concurrent
+    build (e.g. a duplicate inserted after the check) leaves an invalid
+    index behind, so it is dropped first and a rerun builds it again.
+    """
+    return [
+        f'DROP INDEX CONCURRENTLY IF EXISTS "{name}"',
+        f'CREATE UNIQUE INDEX CONCURRENTLY "{name}" '
+        f'ON "customers_customer" ("business_account_id", "{column}") '
+        f'WHERE ("{column}" IS NOT NULL AND NOT ("{column}" = \'\' AND "{column}" IS NOT NULL))',
+    ]
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('customers', '0002_alter_customer_photo'),
+    ]
+
+    operations = [
+        migrations.RunPython(check_duplicates, migrations.RunPython.noop),
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                migrations.RunSQL(
+                    create_index_sql(name, column),
+                    f'DROP INDEX CONCURRENTLY IF EXISTS "{name}"'
+                )
+                for name, column in CONSTRAINTS
+            ],
+            state_operations=[
+                migrations.AddConstraint(
+                    model_name='customer',
+                    constraint=models.UniqueConstraint(condition=models.Q(('phone_number__isnull', False), models.Q(('phone_number', ''), _negated=True)), fields=('business_account', 'phone_number'), name='unique_customer_phone_number'),
+                ),
+                migrations.AddConstraint(
+                    model_name='customer',
+                    constraint=models.UniqueConstraint(condition=models.Q(('email__isnull', False), models.Q(('email', ''), _negated=True)), fields=('business_account', 'email'), name='unique_customer_email'),
+                ),
+            ]
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 3.2.7 on 2026-10-19 05:47
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('business', '0007_businessaccount_photo'),
+        ('customers', '0003_unique_customer_phone_number_email'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CustomerStats',
+            fields=[
+                ('customer', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='customers.customer')),
+                ('order_count', models.PositiveIntegerField(default=0)),
+                ('lifetime_spend', models.DecimalField(decimal_places=2, default=0, max_digits=24)),
+                ('last_purchase_at', models.DateTimeField()),
+                ('outstanding_balance', models.DecimalField(decimal_places=2, default=0, max_digits=24)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('business_account', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='customer_stats', to='business.businessaccount')),
+            ],
+            options={
+                'verbose_name': 'Customer Stats',
+                'verbose_name_plural': 'Customer Stats',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='customerstats',
+            index=models.Index(fields=['business_account', '-lifetime_spend'], name='customers_stats_spend_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='customerstats',
+            index=models.Index(fields=['business_account', '-outstanding_balance'], name='customers_stats_balance_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='customerstats',
+            index=models.Index(fields=['business_account', '-last_purchase_at'], name='customers_stats_last_idx'),
+        ),
+    ]
@@ -1,6 +1,7 @@
 from uuid import uuid4
 
 from django.db import models
+from django.db.models import Q
 from django.utils.translation import gettext_lazy as _
 
 from phonenumber_field.modelfields import PhoneNumberField
@@ -28,6 +29,55 @@ class Customer(models.Model):
         verbose_name = _('Customer')
         verbose_name_plural = _('Customers')
         ordering = ('-created_at', )
+        constraints = [
+            # Phone number & email are optional, but unique per business account
+            models.UniqueConstraint(
+                fields=['business_account', 'phone_number'],
+                condition=Q(phone_number__isnull=False) & ~Q(phone_number=''),
+                name='unique_customer_phone_number'
+            ),
+            models.UniqueConstraint(
+                fields=['business_account', 'email'],
+                condition=Q(email__isnull=False) & ~Q(email=''),
+                name='unique_customer_email'
+            ),
+        ]
 
     def __str__(self):
         return self.name
+
+
+class CustomerStats(models.Model):
+    """
+    Materialized purchase aggregates of a customer (see `customers.stats`).
+
+    Amounts are before TAX, which is added when the stats are read, so
+    that they stay valid when the taxes of the business account change.
+    """
+    customer = models.OneToOneField(Customer,
+                                    primary_key=True,
+                                    on_delete=models.CASCADE,
+                                    related_name='stats')
+    business_account = models.ForeignKey(BusinessAccount,
+                                         on_delete=models.CASCADE,
+                                         related_name='customer_stats')
+    order_count = models.PositiveIntegerField(default=0)
+    lifetime_spend = models.DecimalField(max_digits=24, decimal_places=2, default=0)
+    last_purchase_at = models.DateTimeField()
+    outstanding_balance = models.DecimalField(max_digits=24, decimal_places=2, default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = _('Customer Stats')
+        verbose_name_plural = _('Customer Stats')
+        indexes = [
+            models.Index(fields=['business_account', '-lifetime_spend'],
+                         name='customers_stats_spend_idx'),
+            models.Index(fields=['business_account', '-outstanding_balance'],
+                         name='customers_stats_balance_idx'),
+            models.Index(fields=['business_account', '-last_purchase_at'],
+                         name='customers_stats_last_idx'),
+        ]
+
+    def __str__(self):
+        return str(self.customer)
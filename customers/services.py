@@ -0,0 +1,91 @@
+"""
+Customer import.
+
+Duplicates are detected with one query per batch. Customers registered
+concurrently are caught by the unique constraints of `Customer`.
+"""
+from django.db import transaction
+from django.db.models import Q
+
+from .models import Customer
+
+
+CREATED = 'created'
+DUPLICATE = 'duplicate'
+INVALID = 'invalid'
+
+
+@transaction.atomic
+def import_customers(business_account, rows, batch_size=500):
+    """
+    Bulk create customers of the business account, skipping duplicates.
+
+    A row is a duplicate if its phone number or email address is already
+    registered for the business account, or appears on an earlier row.
+
+    params:
+      rows (list): Dicts with `name`, `phone_number` (E164 or `None`) and
+      `email` (or `None`) keys.
+
+    Returns:
+      A list of `(status, customer_id)` tuples in the order of `rows`. For
+      duplicates, the ID is the one of the already registered customer, or
+      `None` if that customer was registered during the import.
+    """
+    results = []
+    seen = {}  # Phone numbers & emails of earlier rows mapped to customer IDs
+    for start in range(0, len(rows), batch_size):
+        batch = rows[start:start + batch_size]
+        results += _import_batch(business_account, batch, seen)
+    return results
+
+
+def _import_batch(business_account, rows, seen):
+    phone_numbers = {row['phone_number'] for row in rows if row['phone_number']}
+    emails = {row['email'] for row in rows if row['email']}
+
+    existing = Customer.objects.filter(business_account=business_account).filter(
+        Q(phone_number__in=phone_numbers) | Q(email__in=emails)
+    ).values_list('id', 'phone_number', 'email')
+    for customer_id, phone_number, email in existing:
+        for key in _unique_keys(phone_number, email):
+            seen.setdefault(key, customer_id)
+
+    results = []
+    customers = []
+    for row in rows:
+        keys = _unique_keys(row['phone_number'], row['email'])
+        duplicate_of = next((seen[key] for key in keys if key in seen), None)
+        if duplicate_of is not None:
+            results.append((DUPLICATE, duplicate_of))
+            continue
+
+        customer = Customer(business_account=business_account, **row)
+        for key in keys:
+            seen[key] = customer.pk
+        customers.append(customer)
+        results.append((CREATED, customer.pk))
+
+    # Rows conflicting with customers registered since the duplicate query
+    # are skipped by the database.
+    Customer.objects.bulk_create(customers, ignore_conflicts=True)
+    inserted = set(Customer.objects.filter(
+        pk__in=[customer.pk for customer in customers]
+    ).values_list('pk', flat=True))
+    return [
+        (status, customer_id) if status != CREATED or customer_id in inserted
+        else (DUPLICATE, None)
+        for status, customer_id in results
+    ]
+
+
+def _unique_keys(phone_number, email):
+    """
+    Returns the values which must be unique per business account.
+    """
+    keys = []
+    if phone_number:
+        keys.append(('phone_number', str(phone_number)))
+    if email:
+        keys.append(('email', email))
+    return keys
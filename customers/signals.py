@@ -0,0 +1,25 @@
+from functools import partial
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from payments.models import Payment
+
+from .stats import refresh_customer_stats
+
+
+@receiver(post_save, sender=Payment)
+@receiver(post_delete, sender=Payment)
+def refresh_payment_customer_stats(sender, instance, **kwargs):
+    """
+    Refresh the materialized stats of the customer on completed and pay
+    later payments.
+    """
+    if not settings.CUSTOMER_STATS_MATERIALIZED:
+        return
+    if instance.status != Payment.COMPLETED and instance.mode_of_payment != Payment.CREDIT:
+        return
+    customer_id = instance.order.customer_id
+    transaction.on_commit(partial(refresh_customer_stats, [customer_id]))
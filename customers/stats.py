@@ -0,0 +1,130 @@
+"""
+Customer purchase aggregates.
+
+The order count, lifetime spend, last purchase and outstanding `CREDIT`
+balance of customers are computed by the database in one grouped query
+over orders, payments and sold items. Only customers with a completed or
+an open `CREDIT` payment (see `PaymentQuerySet.receivable`) are included.
+
+With `CUSTOMER_STATS_MATERIALIZED` on, the aggregates are read from the
+`CustomerStats` summary table instead, which is refreshed on payment
+writes (see `customers.signals`) and backfilled by the
+`refresh_customer_stats` command.
+"""
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, DecimalField, ExpressionWrapper, F, Max, Q, Sum, Value
+from django.db.models.functions import Coalesce
+
+from payments.models import Payment
+from shared.utils.pagination import keyset_paginate
+
+from .models import Customer, CustomerStats
+
+
+DECIMAL = DecimalField(max_digits=24, decimal_places=2)
+
+# Fields the stats can be ordered by
+ORDERING_FIELDS = ('order_count', 'lifetime_spend', 'last_purchase_at', 'outstanding_balance')
+
+
+def annotate_stats(queryset):
+    """
+    Annotate a customer queryset with the purchase aggregates, computed
+    from the payments. Amounts are before TAX.
+    """
+    completed = Q(orders__payment__status=Payment.COMPLETED)
+    receivable = Q(orders__payment__mode_of_payment=Payment.CREDIT) & \
+        ~Q(orders__payment__status=Payment.COMPLETED) & \
+        ~Q(orders__payment__status=Payment.FAILED)
+
+    # Filtering before annotating restricts the aggregates to these payments
+    queryset = queryset.filter(completed | receivable)
+    amount = ExpressionWrapper(
+        F('orders__payment__sold_items__quantity') * F('orders__payment__sold_items__price'),
+        output_field=DECIMAL
+    )
+    return queryset.annotate(
+        order_count=Count('orders__payment', filter=completed, distinct=True),
+        lifetime_spend=Coalesce(Sum(amount, filter=completed), Value(Decimal(0)),
+                                output_field=DECIMAL),
+        last_purchase_at=Max('orders__payment__created_at'),
+        outstanding_balance=Coalesce(Sum(amount, filter=receivable), Value(Decimal(0)),
+                                     output_field=DECIMAL),
+    )
+
+
+def annotate_materialized_stats(queryset):
+    """
+    Annotate a customer queryset with the purchase aggregates, read from
+    the summary table. Amounts are before TAX.
+    """
+    return queryset.filter(stats__isnull=False).annotate(
+        order_count=F('stats__order_count'),
+        lifetime_spend=F('stats__lifetime_spend'),
+        last_purchase_at=F('stats__last_purchase_at'),
+        outstanding_balance=F('stats__outstanding_balance'),
+    )
+
+
+def get_customer_stats(business_account, ordering='-lifetime_spend', cursor=None, limit=50):
+    """
+    Returns a page of the customers of the business account annotated with
+    their purchase aggregates. Amounts include the active taxes.
+
+    params:
+      ordering (str): One of `ORDERING_FIELDS`, optionally prefixed with `-`.
+      cursor (str): The cursor returned with the previous page.
+      limit (int): Maximum number of customers in the page.
+
+    Returns:
+      A `(customers, next_cursor)` tuple.
+
+    Raises:
+      ValueError: The cursor is malformed.
+    """
+    queryset = Customer.objects.filter(business_account=business_account).select_related('photo')
+    if settings.CUSTOMER_STATS_MATERIALIZED:
+        queryset = annotate_materialized_stats(queryset)
+    else:
+        queryset = annotate_stats(queryset)
+    customers, next_cursor = keyset_paginate(queryset, ordering, cursor, limit)
+
+    # The same percentage applies to all amounts, so adding the taxes after
+    # the ordering keeps the order (and the cursor) valid.
+    taxes = business_account.taxes.active()
+    tax_percentage = sum(tax.percentage for tax in taxes)
+    for customer in customers:
+        customer.lifetime_spend = _add_taxes(customer.lifetime_spend, tax_percentage)
+        customer.outstanding_balance = _add_taxes(customer.outstanding_balance, tax_percentage)
+    return customers, next_cursor
+
+
+def _add_taxes(amount, tax_percentage):
+    return round(amount + amount * tax_percentage / 100, 2)
+
+
+@transaction.atomic
+def refresh_customer_stats(customer_ids):
+    """
+    Recompute the summary table rows of the customers.
+    """
+    rows = annotate_stats(Customer.objects.filter(pk__in=customer_ids)).values_list(
+        'pk', 'business_account_id', *ORDERING_FIELDS
+    )
+    stats = [
+        CustomerStats(
+            customer_id=customer_id,
+            business_account_id=business_id,
+            order_count=order_count,
+            lifetime_spend=lifetime_spend,
+            last_purchase_at=last_purchase_at,
+            outstanding_balance=outstanding_balance
+        )
+        for customer_id, business_id, order_count, lifetime_spend, last_purchase_at,
+        outstanding_balance in rows
+    ]
+    CustomerStats.objects.filter(customer_id__in=customer_ids).delete()
+    CustomerStats.objects.bulk_create(stats)
@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from .models import Expense
+from .models import Expense, RecurringExpense
 
 
 @admin.register(Expense)
@@ -8,3 +8,12 @@ class ExpenseAdmin(admin.ModelAdmin):
     list_display = ('title', 'business_account', 'amount', 'date', 'created_at')
     list_filter = ('date', )
     search_fields = ('title', )
+
+
+@admin.register(RecurringExpense)
+class RecurringExpenseAdmin(admin.ModelAdmin):
+    list_display = ('title', 'business_account', 'amount', 'day_of_month', 'month_of_year',
+                    'day_of_week', 'is_active', 'last_generated_date')
+    list_filter = ('is_active', )
+    search_fields = ('title', )
+    readonly_fields = ('last_generated_date', )
@@ -0,0 +1,57 @@
+# Generated by Django 3.2.7 on 2026-10-19 05:59
+
+from django.db import migrations, models
+import django.db.models.deletion
+import expenses.models
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('business', '0008_periodsnapshot'),
+        ('expenses', '0002_auto_20210902_1955'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RecurringExpense',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('title', models.CharField(max_length=100)),
+                ('amount', models.DecimalField(decimal_places=2, max_digits=12)),
+                ('day_of_month', models.CharField(default='*', help_text='Cron expression of the days of the month (1-31), e.g. "1" or "1,15".', max_length=124, validators=[expenses.models.CronFieldValidator('day_of_month')])),
+                ('month_of_year', models.CharField(default='*', help_text='Cron expression of the months (1-12), e.g. "*" or "*/3".', max_length=64, validators=[expenses.models.CronFieldValidator('month_of_year')])),
+                ('day_of_week', models.CharField(default='*', help_text='Cron expression of the days of the week (0-6, Sunday = 0), e.g. "*" or "mon-fri".', max_length=64, validators=[expenses.models.CronFieldValidator('day_of_week')])),
+                ('start_date', models.DateField()),
+                ('end_date', models.DateField(blank=True, null=True)),
+                ('is_active', models.BooleanField(default=True)),
+                ('last_generated_date', models.DateField(blank=True, editable=False, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Recurring Expense',
+                'verbose_name_plural': 'Recurring Expenses',
+                'ordering': ('-created_at',),
+            },
+        ),
+        migrations.AddField(
+            model_name='recurringexpense',
+            name='business_account',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='recurring_expenses', to='business.businessaccount'),
+        ),
+        migrations.AddField(
+            model_name='expense',
+            name='recurring_expense',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='expenses', to='expenses.recurringexpense'),
+        ),
+        migrations.AddIndex(
+            model_name='recurringexpense',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['last_generated_date'], name='expenses_recurring_due_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='expense',
+            constraint=models.UniqueConstraint(fields=('recurring_expense', 'date'), name='unique_recurring_expense_date'),
+        ),
+    ]
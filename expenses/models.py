@@ -1,16 +1,99 @@
 from uuid import uuid4
 
+from celery.schedules import crontab
+from django.core.exceptions import ValidationError
 from django.db import models
+from django.db.models import Q
+from django.utils.deconstruct import deconstructible
 from django.utils.translation import gettext_lazy as _
 
 from business.models import BusinessAccount
 
 
+@deconstructible
+class CronFieldValidator:
+    """
+    Validate a field of a cron expression (e.g. `1,15`, `mon-fri` or `*/2`).
+    """
+    message = _('Enter a valid cron expression.')
+
+    def __init__(self, field):
+        self.field = field
+
+    def __call__(self, value):
+        try:
+            crontab(**{self.field: value})
+        except (ValueError, TypeError):
+            raise ValidationError(self.message, code='invalid')
+
+    def __eq__(self, other):
+        return isinstance(other, CronFieldValidator) and self.field == other.field
+
+
+class RecurringExpense(models.Model):
+    """
+    A template of an expense which recurs on a cron-like schedule of days
+    (e.g. rent on the 1st of every month).
+
+    Due expenses are created by the `generate_recurring_expenses` beat job.
+    `last_generated_date` is the high-water mark of the job: expenses are
+    only created for the days after it, so missed runs are caught up by the
+    next one without creating any expense twice.
+    """
+    id = models.UUIDField(primary_key=True, editable=False, default=uuid4)
+    business_account = models.ForeignKey(BusinessAccount,
+                                         on_delete=models.CASCADE,
+                                         related_name='recurring_expenses')
+    title = models.CharField(max_length=100)
+    amount = models.DecimalField(max_digits=12, decimal_places=2)
+    day_of_month = models.CharField(max_length=124, default='*',
+                                    validators=[CronFieldValidator('day_of_month')],
+                                    help_text=_('Cron expression of the days of the month '
+                                                '(1-31), e.g. "1" or "1,15".'))
+    month_of_year = models.CharField(max_length=64, default='*',
+                                     validators=[CronFieldValidator('month_of_year')],
+                                     help_text=_('Cron expression of the months (1-12), '
+                                                 'e.g. "*" or "*/3".'))
+    day_of_week = models.CharField(max_length=64, default='*',
+                                   validators=[CronFieldValidator('day_of_week')],
+                                   help_text=_('Cron expression of the days of the week '
+                                               '(0-6, Sunday = 0), e.g. "*" or "mon-fri".'))
+    start_date = models.DateField()
+    end_date = models.DateField(blank=True, null=True)
+    is_active = models.BooleanField(default=True)
+    last_generated_date = models.DateField(blank=True, null=True, editable=False)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = _('Recurring Expense')
+        verbose_name_plural = _('Recurring Expenses')
+        ordering = ('-created_at', )
+        indexes = [
+            models.Index(fields=['last_generated_date'],
+                         condition=Q(is_active=True),
+                         name='expenses_recurring_due_idx'),
+        ]
+
+    def __str__(self):
+        return self.title
+
+    def get_schedule(self):
+        return crontab(minute=0, hour=0, day_of_month=self.day_of_month,
+                       month_of_year=self.month_of_year, day_of_week=self.day_of_week)
+
+
 class Expense(models.Model):
     id = models.UUIDField(primary_key=True, editable=False, default=uuid4)
     business_account = models.ForeignKey(BusinessAccount,
                                          on_delete=models.CASCADE,
                                          related_name='expenses')
+    recurring_expense = models.ForeignKey(RecurringExpense,
+                                          on_delete=models.SET_NULL,
+                                          related_name='expenses',
+                                          blank=True,
+                                          null=True,
+                                          editable=False)
     title = models.CharField(max_length=100)
     amount = models.DecimalField(max_digits=12, decimal_places=2)
     date = models.DateField()
@@ -20,6 +103,10 @@ class Expense(models.Model):
         verbose_name = _('Expense')
         verbose_name_plural = _('Expenses')
         ordering = ('-created_at', )
+        constraints = [
+            models.UniqueConstraint(fields=['recurring_expense', 'date'],
+                                    name='unique_recurring_expense_date'),
+        ]
 
     def __str__(self):
         return self.title
@@ -0,0 +1,211 @@
+"""
+Expense batch create, spreadsheet import and recurring expenses.
+
+Expenses are inserted with one bulk insert per batch inside a single
+transaction, so a batch is either created whole or not at all. Bulk
+inserts bypass `Model.save()` and its signals, so the cached financial
+statements and the snapshots of closed months are refreshed explicitly.
+"""
+import codecs
+import csv
+from collections import defaultdict
+from datetime import datetime, timedelta
+from functools import partial
+from itertools import islice
+from zipfile import BadZipFile
+
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from openpyxl import load_workbook
+from openpyxl.utils.exceptions import InvalidFileException
+
+from business.models import PeriodSnapshot
+from business.periods import month_start, refresh_expenses
+from business.reports import CACHE_NAMESPACE as REPORT_CACHE_NAMESPACE
+from shared.utils import cache
+
+from .models import Expense, RecurringExpense
+
+
+# Columns of the import files, matched case-insensitively
+IMPORT_COLUMNS = ('title', 'amount', 'date')
+
+
+def _batches(rows, batch_size):
+    rows = iter(rows)
+    while True:
+        batch = list(islice(rows, batch_size))
+        if not batch:
+            return
+        yield batch
+
+
+@transaction.atomic
+def create_expenses(business_account, rows, batch_size=500):
+    """
+    Bulk create expenses of the business account.
+
+    params:
+      rows (iterable): Dicts with `title`, `amount` and `date` keys. Rows are
+      consumed in batches, so they may be generated while the expenses are
+      inserted.
+
+    Returns:
+      The list of created expenses.
+    """
+    expenses = []
+    for batch in _batches(rows, batch_size):
+        expenses += Expense.objects.bulk_create([
+            Expense(business_account=business_account, **row) for row in batch
+        ])
+    if expenses:
+        _expenses_created(business_account.pk, {expense.date for expense in expenses})
+    return expenses
+
+
+def _expenses_created(business_id, dates):
+    """
+    Refresh the snapshots of the closed months of the dates and invalidate
+    the cached financial statements of the business account, once the
+    current transaction is committed.
+    """
+    periods = {month_start(day) for day in dates}
+    closed = PeriodSnapshot.objects.filter(business_account_id=business_id, period__in=periods)
+    if closed.exists():
+        transaction.on_commit(partial(refresh_expenses, business_id, periods))
+    transaction.on_commit(partial(cache.invalidate, REPORT_CACHE_NAMESPACE, business_id))
+
+
+def _read_rows(rows):
+    """
+    Generate `(row_number, row)` tuples of the rows following the header
+    row, as dicts of the `IMPORT_COLUMNS`. Other columns are ignored.
+    """
+    rows = iter(rows)
+    header = next(rows, None) or ()
+    columns = [str(name or '').strip().lower() for name in header]
+    for number, values in enumerate(rows, start=2):
+        if not any(value not in (None, '') for value in values):
+            continue  # Skip blank lines
+        row = {
+            name: value for name, value in zip(columns, values)
+            if name in IMPORT_COLUMNS and value not in (None, '')
+        }
+        yield number, row
+
+
+def read_csv_rows(file):
+    """
+    Generate the rows of a UTF-8 CSV file (see `_read_rows`) line by line.
+
+    Raises:
+      ValueError: The file is not a valid UTF-8 CSV file.
+    """
+    lines = codecs.iterdecode(file, 'utf-8-sig')
+    try:
+        yield from _read_rows(csv.reader(lines))
+    except csv.Error as e:
+        raise ValueError(str(e))
+
+
+def read_xlsx_rows(file):
+    """
+    Generate the rows of the first sheet of an Excel workbook (see
+    `_read_rows`). The workbook is opened in read-only mode, which streams
+    the rows instead of loading the whole sheet.
+
+    Raises:
+      ValueError: The file is not a valid Excel workbook.
+    """
+    try:
+        workbook = load_workbook(file, read_only=True, data_only=True)
+    except (BadZipFile, InvalidFileException, KeyError) as e:
+        raise ValueError(str(e))
+    try:
+        for number, row in _read_rows(workbook.active.iter_rows(values_only=True)):
+            if isinstance(row.get('date'), datetime):
+                row['date'] = row['date'].date()
+            if isinstance(row.get('amount'), float):
+                row['amount'] = repr(row['amount'])
+            yield number, row
+    finally:
+        workbook.close()
+
+
+def get_due_dates(recurring_expense, date_from, date_to):
+    """
+    Generate the days between the dates (inclusive) the schedule of the
+    recurring expense is due on. All fields of the schedule must match.
+    """
+    schedule = recurring_expense.get_schedule()
+    day = date_from
+    while day <= date_to:
+        if day.day in schedule.day_of_month and \
+                day.month in schedule.month_of_year and \
+                day.isoweekday() % 7 in schedule.day_of_week:  # Sunday is 0
+            yield day
+        day += timedelta(days=1)
+
+
+def generate_recurring_expenses(today=None, batch_size=500):
+    """
+    Create the due expenses of the active recurring expenses of all
+    business accounts, up to today.
+
+    Recurring expenses are processed in primary key batches, each in its
+    own transaction, with one bulk insert of expenses and one bulk update
+    of the high-water marks (see `RecurringExpense`). Concurrent runs skip
+    the batches locked by each other, and the unique recurring expense
+    date constraint keeps any expense from being created twice.
+
+    Returns:
+      The number of due expenses, including any which already existed.
+    """
+    today = today or timezone.localdate()
+    qs = RecurringExpense.objects.filter(is_active=True, start_date__lte=today) \
+        .filter(Q(last_generated_date__isnull=True) | Q(last_generated_date__lt=today)) \
+        .order_by('pk')
+
+    count = 0
+    last_pk = None
+    while True:
+        with transaction.atomic():
+            batch = qs if last_pk is None else qs.filter(pk__gt=last_pk)
+            batch = list(batch.select_for_update(skip_locked=True)[:batch_size])
+            if not batch:
+                return count
+            count += _generate_batch(batch, today)
+        last_pk = batch[-1].pk
+
+
+def _generate_batch(recurring_expenses, today):
+    expenses = []
+    dates = defaultdict(set)  # Business account IDs mapped to the expense dates
+    for recurring_expense in recurring_expenses:
+        date_from = recurring_expense.start_date
+        if recurring_expense.last_generated_date is not None:
+            date_from = max(date_from, recurring_expense.last_generated_date + timedelta(days=1))
+        date_to = today
+        if recurring_expense.end_date is not None and recurring_expense.end_date <= today:
+            date_to = recurring_expense.end_date
+            recurring_expense.is_active = False  # Nothing is due anymore
+
+        business_id = recurring_expense.business_account_id
+        for day in get_due_dates(recurring_expense, date_from, date_to):
+            expenses.append(Expense(
+                business_account_id=business_id,
+                recurring_expense=recurring_expense,
+                title=recurring_expense.title,
+                amount=recurring_expense.amount,
+                date=day
+            ))
+            dates[business_id].add(day)
+        recurring_expense.last_generated_date = date_to
+
+    Expense.objects.bulk_create(expenses, ignore_conflicts=True)
+    RecurringExpense.objects.bulk_update(recurring_expenses,
+                                         ['last_generated_date', 'is_active'])
+    for business_id, business_dates in dates.items():
+        _expenses_created(business_id, business_dates)
+    return len(expenses)
@@ -0,0 +1,15 @@
+from celery import shared_task
+
+from .services import generate_recurring_expenses as generate_due_expenses
+
+
+@shared_task
+def generate_recurring_expenses():
+    """
+    Create the due expenses of the recurring expenses of all business
+    accounts.
+
+    Expenses are only created for the days after the last run of each
+    recurring expense, so missed runs are caught up by the next one.
+    """
+    return generate_due_expenses()
@@ -6,6 +6,7 @@ from import_export.fields import Field
 from import_export.formats.base_formats import CSV
 
 from .models import Barcode, Stock, Sold
+from .services import create_stocks
 
 
 @admin.register(Stock)
@@ -22,6 +23,13 @@ class StockAdmin(admin.ModelAdmin):
     )
     search_fields = ('product', )
 
+    def save_model(self, request, obj, form, change):
+        if change:
+            super().save_model(request, obj, form, change)
+        else:
+            # Barcodes are managed in their own admin
+            create_stocks([obj], create_barcodes=False)
+
 
 @admin.register(Sold)
 class SoldAdmin(admin.ModelAdmin):
@@ -0,0 +1,23 @@
+# Generated by Django 3.2.7 on 2026-10-19 05:37
+
+from django.db import migrations, models
+import django.db.models.expressions
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0012_auto_20211226_2157'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='stock',
+            name='reorder_level',
+            field=models.DecimalField(blank=True, decimal_places=2, help_text='Alert when the quantity left drops to this level. Leave empty to disable alerts.', max_digits=12, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='stock',
+            index=models.Index(condition=models.Q(('quantity__lte', django.db.models.expressions.F('reorder_level'))), fields=['business_account'], name='inventory_stock_low_idx'),
+        ),
+    ]
@@ -2,6 +2,7 @@ from uuid import uuid4
 
 from django.contrib.auth import get_user_model
 from django.db import models, transaction
+from django.db.models import F, Q
 from django.utils.translation import gettext_lazy as _
 
 from business.models import BusinessAccount
@@ -65,6 +66,15 @@ class Barcode(models.Model):
         return self.barcode_number
 
 
+class StockQuerySet(models.QuerySet):
+    def low(self):
+        """
+        Returns stocks at or below their reorder level. The filter matches
+        the condition of the `inventory_stock_low_idx` partial index.
+        """
+        return self.filter(quantity__lte=F('reorder_level'))
+
+
 class Stock(models.Model):
     id = models.UUIDField(primary_key=True, editable=False, default=uuid4)
     business_account = models.ForeignKey(BusinessAccount,
@@ -76,6 +86,10 @@ class Stock(models.Model):
                             help_text=_('Measurement unit.'))
     quantity = models.DecimalField(max_digits=12, decimal_places=2,
                                    help_text=_('Quantity left.'))
+    reorder_level = models.DecimalField(max_digits=12, decimal_places=2,
+                                        null=True, blank=True,
+                                        help_text=_('Alert when the quantity left drops to this '
+                                                    'level. Leave empty to disable alerts.'))
     price = models.DecimalField(max_digits=12, decimal_places=2)
     photo = models.OneToOneField(PhotoUpload,
                                  on_delete=models.SET_NULL,
@@ -88,9 +102,19 @@ class Stock(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    # Custom manager
+    objects = StockQuerySet.as_manager()
+
     class Meta:
         verbose_name = _('Product Stock')
         verbose_name_plural = _('Product Stocks')
+        indexes = [
+            # Only low stocks are indexed, so the index stays small and
+            # `Stock.objects.low()` does not scan the whole table.
+            models.Index(fields=['business_account'],
+                         condition=Q(quantity__lte=F('reorder_level')),
+                         name='inventory_stock_low_idx'),
+        ]
 
     def __str__(self):
         return self.product
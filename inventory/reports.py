@@ -0,0 +1,105 @@
+"""
+Inventory valuation and turnover report.
+
+All figures are computed by the database, in one query over `Stock` and
+`SoldItem` and one for the total units sold. Results are cached per business account and invalidated
+by writes to stocks and payments (see `inventory.signals`).
+"""
+from datetime import timedelta
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.db.models import BooleanField, Case, DecimalField, Exists, ExpressionWrapper, F, \
+    OuterRef, Q, Subquery, Sum, Value, When, Window
+from django.db.models.functions import Coalesce, NullIf, Rank
+from django.utils import timezone
+
+from payments.models import Payment, SoldItem
+from shared.utils.cache import get_cache_key
+
+from .models import Stock
+
+
+CACHE_NAMESPACE = 'inventory-report'
+CACHE_TIMEOUT = 60 * 60  # 1 hour
+
+DECIMAL = DecimalField(max_digits=24, decimal_places=2)
+
+
+def build_inventory_report(business_account, days=30):
+    """
+    Returns the inventory report of the business account over the last
+    `days` days, using the cached report if one exists.
+    """
+    key = get_cache_key(CACHE_NAMESPACE, business_account.pk, days)
+    report = cache.get(key)
+    if report is None:
+        report = _build_inventory_report(business_account, days)
+        cache.set(key, report, CACHE_TIMEOUT)
+    return report
+
+
+def _build_inventory_report(business_account, days):
+    date_to = timezone.now()
+    date_from = date_to - timedelta(days=days)
+
+    # Sold items are matched to stocks by product name & unit (see `PaymentSerializer.create`)
+    sold_items = SoldItem.objects.filter(
+        payment__order__business_account=business_account,
+        payment__status=Payment.COMPLETED,
+        payment__created_at__gte=date_from,
+    ).order_by()
+    units_sold = sold_items.filter(
+        product=OuterRef('product'), unit=OuterRef('unit')
+    ).values('product', 'unit').annotate(total=Sum('quantity')).values('total')
+
+    # Stocks sharing a product name & unit share their units sold, so the
+    # total is summed over the sold items rather than over the stocks
+    business_stocks = Stock.objects.filter(business_account=business_account)
+    total_units_sold = sold_items.filter(
+        Exists(business_stocks.filter(product=OuterRef('product'), unit=OuterRef('unit')))
+    ).aggregate(total=Coalesce(Sum('quantity'), Value(Decimal(0))))['total']
+
+    value = ExpressionWrapper(F('quantity') * F('price'), output_field=DECIMAL)
+    qs = business_stocks.annotate(
+        value=value,
+        units_sold=Coalesce(Subquery(units_sold, output_field=DECIMAL), Value(Decimal(0))),
+        total_value=Window(Sum(value)),
+        value_rank=Window(Rank(), order_by=value.desc()),
+    ).annotate(
+        value_share=ExpressionWrapper(
+            F('value') / NullIf(F('total_value'), Value(0)),
+            output_field=DecimalField(max_digits=7, decimal_places=4)
+        ),
+        days_of_cover=Case(
+            When(units_sold__gt=0, then=ExpressionWrapper(
+                F('quantity') * Value(days) / F('units_sold'),
+                output_field=DECIMAL
+            )),
+            default=None,
+            output_field=DECIMAL
+        ),
+        is_dead_stock=Case(
+            When(Q(units_sold=0) & Q(quantity__gt=0), then=Value(True)),
+            default=Value(False),
+            output_field=BooleanField()
+        )
+    ).order_by('value_rank', 'product')
+
+    stocks = list(qs.values(
+        'id', 'product', 'unit', 'quantity', 'price', 'value', 'value_share', 'value_rank',
+        'units_sold', 'days_of_cover', 'is_dead_stock', 'total_value'
+    ))
+    total_value = stocks[0]['total_value'] if stocks else Decimal(0)
+    for stock in stocks:
+        del stock['total_value']
+
+    return {
+        'date_from': date_from,
+        'date_to': date_to,
+        'days': days,
+        'total_value': total_value,
+        'total_units_sold': total_units_sold,
+        'dead_stock_count': sum(1 for stock in stocks if stock['is_dead_stock']),
+        'stocks': stocks,
+    }
@@ -0,0 +1,185 @@
+"""
+Inventory stock operations.
+
+Stocks are created and updated in bulk statements which bypass
+`Model.save()` and its signals, so related rows are created and the
+cached inventory report is invalidated explicitly.
+"""
+from functools import partial
+
+from django.db import connection, transaction
+from django.db.models import F, Value
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from shared.utils import cache
+
+from .models import Barcode, Sold, Stock
+from .reports import CACHE_NAMESPACE as REPORT_CACHE_NAMESPACE
+
+
+@transaction.atomic
+def create_stocks(stocks, created_strategy=Barcode.API, created_by_id=None, create_barcodes=True):
+    """
+    Create stocks together with their `Sold` records and, unless
+    `create_barcodes` is false, any missing barcodes, using one bulk
+    insert per table.
+
+    This is the only supported way to create stocks, since a stock without
+    a `Sold` record cannot be sold.
+
+    params:
+      stocks (list): Unsaved `Stock` instances.
+      created_strategy (int): Strategy recorded on created barcodes.
+      created_by_id: ID of the user recorded on created barcodes.
+      create_barcodes (bool): Whether to create the missing barcodes.
+
+    Returns:
+      The list of created stocks.
+    """
+    stocks = Stock.objects.bulk_create(stocks)
+    Sold.objects.bulk_create([Sold(stock=stock) for stock in stocks])
+
+    # Existing barcodes are left as they are
+    barcodes = [
+        Barcode(
+            barcode_number=stock.barcode_number,
+            product_name=stock.product,
+            business_account=stock.business_account,
+            verified=False,
+            created_strategy=created_strategy,
+            created_by_id=created_by_id
+        )
+        for stock in stocks if create_barcodes and stock.barcode_number
+    ]
+    if barcodes:
+        Barcode.objects.bulk_create(barcodes, ignore_conflicts=True)
+
+    for business_id in {stock.business_account_id for stock in stocks}:
+        transaction.on_commit(partial(cache.invalidate, REPORT_CACHE_NAMESPACE, business_id))
+    return stocks
+
+
+def _update_from_values(business_account, column, values, assignments, extra_params=()):
+    """
+    Run a single `UPDATE ... FROM (VALUES ...)` statement on the stocks of
+    the business account.
+
+    params:
+      column (str): Name of the value column in the `VALUES` list.
+      values (dict): Map of stock IDs to values.
+      assignments (str): The `SET` clause, referring to the stock row as `s`
+      and to the value row as `v`.
+
+    Returns:
+      The list of updated stock IDs.
+    """
+    if not values:
+        return []
+
+    rows = ', '.join(['(%s::uuid, %s::numeric)'] * len(values))
+    sql = (
+        f'UPDATE {Stock._meta.db_table} AS s SET {assignments} '
+        f'FROM (VALUES {rows}) AS v (id, {column}) '
+        f'WHERE s.id = v.id AND s.business_account_id = %s '
+        f'RETURNING s.id'
+    )
+    params = list(extra_params)
+    for stock_id, value in values.items():
+        params += [str(stock_id), value]
+    params.append(business_account.pk)
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return [row[0] for row in cursor.fetchall()]
+
+
+@transaction.atomic
+def restock_stocks(business_account, quantities):
+    """
+    Add the restocked quantities to the stocks of the business account.
+
+    params:
+      quantities (dict): Map of stock IDs to restocked quantities.
+
+    Returns:
+      The list of updated stock IDs.
+    """
+    now = timezone.now()
+    updated = _update_from_values(
+        business_account, 'quantity', quantities,
+        'quantity = s.quantity + v.quantity, last_restocked_date = %s, updated_at = %s',
+        extra_params=(now, now)
+    )
+    _invalidate_report(business_account)
+    return updated
+
+
+@transaction.atomic
+def restock_queryset(business_account, queryset, quantity):
+    """
+    Add the same restocked quantity to all stocks of the business account
+    in the queryset.
+
+    Returns:
+      The list of updated stock IDs.
+    """
+    now = timezone.now()
+    queryset = queryset.filter(business_account=business_account)
+    updated = list(queryset.select_for_update().values_list('id', flat=True))
+    Stock.objects.filter(pk__in=updated).update(
+        quantity=F('quantity') + quantity,
+        last_restocked_date=now,
+        updated_at=now
+    )
+    _invalidate_report(business_account)
+    return updated
+
+
+@transaction.atomic
+def update_prices(business_account, prices):
+    """
+    Set new prices to the stocks of the business account.
+
+    params:
+      prices (dict): Map of stock IDs to prices.
+
+    Returns:
+      The list of updated stock IDs.
+    """
+    updated = _update_from_values(
+        business_account, 'price', prices,
+        'price = v.price, updated_at = %s',
+        extra_params=(timezone.now(), )
+    )
+    _invalidate_report(business_account)
+    return updated
+
+
+@transaction.atomic
+def adjust_prices(business_account, queryset, percentage=None, amount=None):
+    """
+    Adjust the prices of all stocks of the business account in the queryset
+    by a percentage or by a fixed amount. Prices never drop below zero.
+
+    Returns:
+      The list of updated stock IDs.
+    """
+    if percentage is not None:
+        price = F('price') * (1 + percentage / 100)
+    else:
+        price = F('price') + amount
+
+    queryset = queryset.filter(business_account=business_account)
+    updated = list(queryset.select_for_update().values_list('id', flat=True))
+    Stock.objects.filter(pk__in=updated).update(
+        price=Greatest(price, Value(0)),
+        updated_at=timezone.now()
+    )
+    _invalidate_report(business_account)
+    return updated
+
+
+def _invalidate_report(business_account):
+    invalidate = partial(cache.invalidate, REPORT_CACHE_NAMESPACE, business_account.pk)
+    transaction.on_commit(invalidate)
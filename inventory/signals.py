@@ -1,13 +1,30 @@
-from django.db.models.signals import post_save
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 
-from .models import Stock, Sold
+from payments.models import Payment
+from shared.utils import cache
+
+from .models import Stock
+from .reports import CACHE_NAMESPACE as REPORT_CACHE_NAMESPACE
 
 
 @receiver(post_save, sender=Stock)
-def create_sold_record(sender, instance, created, **kwargs):
+@receiver(post_delete, sender=Stock)
+def invalidate_stock_report(sender, instance, **kwargs):
+    """
+    Invalidate the cached inventory report on stock writes.
+    """
+    invalidate = partial(cache.invalidate, REPORT_CACHE_NAMESPACE, instance.business_account_id)
+    transaction.on_commit(invalidate)
+
+
+@receiver(post_save, sender=Payment)
+def invalidate_payment_report(sender, instance, **kwargs):
     """
-    Create a `Sold` instance for each stock instance.
+    Invalidate the cached inventory report on payment writes.
     """
-    if created:
-        Sold.objects.create(stock=instance)
+    business_id = instance.order.business_account_id
+    transaction.on_commit(partial(cache.invalidate, REPORT_CACHE_NAMESPACE, business_id))
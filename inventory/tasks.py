@@ -0,0 +1,30 @@
+from celery import shared_task
+
+from notifications.helpers.inventory_notifications import low_stock_alerts
+
+from .models import Stock
+
+
+@shared_task
+def send_low_stock_alerts(batch_size=500):
+    """
+    Notify all business accounts about their low stocks.
+
+    Low stocks are read in primary key batches through the partial index
+    on `quantity <= reorder_level`, so the job cost grows with the number
+    of low stocks rather than the size of the inventory table.
+    """
+    qs = Stock.objects.low().order_by('pk').only(
+        'id', 'business_account', 'product', 'unit', 'quantity',
+        'last_restocked_date', 'created_at'
+    )
+
+    count = 0
+    last_pk = None
+    while True:
+        batch = qs if last_pk is None else qs.filter(pk__gt=last_pk)
+        batch = list(batch[:batch_size])
+        if not batch:
+            return count
+        count += len(low_stock_alerts(batch))
+        last_pk = batch[-1].pk
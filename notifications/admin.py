@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from .models import Notification
+from .models import ArchivedNotification, Notification
 
 
 @admin.register(Notification)
@@ -14,3 +14,14 @@ class NotificationAdmin(admin.ModelAdmin):
     list_filter = ('action_date', 'is_seen')
     search_fields = ('notication_type', 'action')
 
+
+@admin.register(ArchivedNotification)
+class ArchivedNotificationAdmin(admin.ModelAdmin):
+    list_display = (
+        'notification_type',
+        'business_account',
+        'created_at',
+        'archived_at'
+    )
+    list_filter = ('archived_at', )
+    search_fields = ('notification_type', 'action_message')
@@ -0,0 +1,151 @@
+"""
+Server-sent events stream of the created notifications, served by ASGI.
+
+`GET /business/<id>/notifications/stream/` is handled by a plain ASGI
+application in front of Django, since Django (3.2) can't stream responses
+asynchronously. Idle connections only hold an asyncio queue (see
+`notifications.stream`), so a single worker can serve thousands of them.
+Other paths are passed on to Django.
+"""
+import asyncio
+import json
+import re
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.db import close_old_connections
+from rest_framework.exceptions import APIException
+from rest_framework.request import Request
+from rest_framework.utils.encoders import JSONEncoder
+
+from accounts.authentication import get_business_authentication_classes
+from business.tenancy import TenantContext
+
+from .stream import broker
+
+
+STREAM_PATH = re.compile(r'^/business/(?P<business_id>[0-9a-f-]+)/notifications/stream/$')
+
+
+@sync_to_async
+def _authorize(scope, business_id):
+    """
+    Authenticate the request like the business routes, and check that the
+    user owns the business account.
+
+    The request doesn't go through the Django handler, so the connections
+    are closed when unusable or too old (`CONN_MAX_AGE`) here, like on the
+    `request_started` and `request_finished` signals.
+
+    Returns:
+      The HTTP status of the response.
+    """
+    close_old_connections()
+    try:
+        return _get_status(scope, business_id)
+    finally:
+        close_old_connections()
+
+
+def _get_status(scope, business_id):
+    request = Request(
+        ASGIRequest(scope, body_file=None),
+        authenticators=[auth() for auth in get_business_authentication_classes()]
+    )
+    try:
+        user = request.user
+    except APIException:
+        return 401
+    if not user.is_authenticated:
+        return 401
+    if not TenantContext(user).owns(business_id):
+        return 404
+    return 200
+
+
+def _event(name, data, event_id=None):
+    lines = [f'event: {name}']
+    if event_id is not None:
+        lines.append(f'id: {event_id}')
+    lines.append(f'data: {json.dumps(data, cls=JSONEncoder)}')
+    return ('\n'.join(lines) + '\n\n').encode()
+
+
+class NotificationStreamApplication:
+    """
+    ASGI application streaming the created notifications of a business
+    account as server-sent `notification` events, with a comment line every
+    `NOTIFICATION_STREAM_HEARTBEAT` seconds to keep the connection open.
+    """
+
+    def __init__(self, application):
+        self.application = application
+
+    async def __call__(self, scope, receive, send):
+        match = STREAM_PATH.match(scope['path']) if scope['type'] == 'http' else None
+        if match is None or scope['method'] != 'GET':
+            return await self.application(scope, receive, send)
+
+        business_id = match.group('business_id')
+        status = await _authorize(scope, business_id)
+        if status != 200:
+            return await self._send_error(send, status)
+
+        queue = broker.subscribe(business_id)
+        try:
+            await send({
+                'type': 'http.response.start',
+                'status': 200,
+                'headers': [
+                    (b'content-type', b'text/event-stream'),
+                    (b'cache-control', b'no-cache'),
+                    (b'x-accel-buffering', b'no'),  # Disable the nginx buffering
+                ],
+            })
+            await send({'type': 'http.response.body', 'body': b'retry: 5000\n\n',
+                        'more_body': True})
+            await self._stream(queue, receive, send)
+        finally:
+            broker.unsubscribe(business_id, queue)
+
+    async def _stream(self, queue, receive, send):
+        disconnected = asyncio.ensure_future(self._wait_disconnect(receive))
+        try:
+            while True:
+                get = asyncio.ensure_future(queue.get())
+                done, _ = await asyncio.wait(
+                    {get, disconnected},
+                    timeout=settings.NOTIFICATION_STREAM_HEARTBEAT,
+                    return_when=asyncio.FIRST_COMPLETED
+                )
+                if get in done:
+                    notification = get.result()
+                    body = _event('notification', notification, notification['id'])
+                else:
+                    get.cancel()
+                    if disconnected in done:
+                        return
+                    body = b': heartbeat\n\n'
+                await send({'type': 'http.response.body', 'body': body, 'more_body': True})
+        finally:
+            disconnected.cancel()
+
+    @staticmethod
+    async def _wait_disconnect(receive):
+        while (await receive())['type'] != 'http.disconnect':
+            pass
+
+    @staticmethod
+    async def _send_error(send, status):
+        details = {
+            401: 'Authentication credentials were not provided.',
+            404: 'Not found.',
+        }
+        body = json.dumps({'detail': details[status]}).encode()
+        await send({
+            'type': 'http.response.start',
+            'status': status,
+            'headers': [(b'content-type', b'application/json')],
+        })
+        await send({'type': 'http.response.body', 'body': body})
@@ -0,0 +1,68 @@
+"""
+Cached unread notification counters.
+
+The number of unseen notifications of every business account is kept in
+the cache, so polling it doesn't hit the database. Counters are adjusted
+on notification writes (see `notifications.signals`), once the write is
+committed, and are recounted by the `reconcile_unread_counts` beat job to
+correct any drift (e.g. evicted keys or writes bypassing the signals).
+"""
+from functools import partial
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count
+
+from .models import Notification
+
+
+def _counter_key(business_id):
+    return f'notifications:unread:{business_id}'
+
+
+def count_unread(business_id):
+    return Notification.objects.filter(business_account_id=business_id, is_seen=False).count()
+
+
+def get_unread_count(business_id):
+    """
+    Returns the number of unseen notifications of the business account,
+    counting them only if the counter is missing.
+    """
+    key = _counter_key(business_id)
+    count = cache.get(key)
+    if count is None:
+        count = count_unread(business_id)
+        # Don't overwrite a counter set (or adjusted) since it was missed
+        cache.add(key, count, timeout=None)
+    return max(count, 0)
+
+
+def _adjust(business_id, delta):
+    try:
+        cache.incr(_counter_key(business_id), delta)
+    except ValueError:
+        pass  # Counter is missing, it is counted on the next read
+
+
+def adjust_unread_count(business_id, delta):
+    """
+    Add `delta` to the unread counter of the business account once the
+    current transaction is committed.
+    """
+    if delta:
+        transaction.on_commit(partial(_adjust, business_id, delta))
+
+
+def reconcile_unread_counts(business_ids):
+    """
+    Recount the unread counters of the business accounts.
+    """
+    counts = dict.fromkeys(business_ids, 0)
+    rows = Notification.objects.filter(business_account_id__in=business_ids, is_seen=False) \
+        .order_by() \
+        .values('business_account_id') \
+        .annotate(count=Count('id')) \
+        .values_list('business_account_id', 'count')
+    counts.update(rows)
+    cache.set_many({_counter_key(pk): count for pk, count in counts.items()}, timeout=None)
@@ -0,0 +1,71 @@
+"""
+Inventory related notifications.
+"""
+from collections import Counter
+from functools import partial
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Max
+from django.urls import reverse
+
+from notifications.counters import adjust_unread_count
+from notifications.models import Notification
+from notifications.stream import publish
+from orders.models import Order
+
+
+LOW_STOCK = 'Low Stock'
+
+
+def get_stock_url(stock):
+    """
+    Returns the absolute URL of the stock. Low stock alerts are created
+    without a request, so the host is read from `API_BASE_URL`.
+    """
+    path = reverse('business:stock-detail',
+                   kwargs={'business_id': stock.business_account_id, 'pk': stock.pk})
+    return settings.API_BASE_URL.rstrip('/') + path
+
+
+def low_stock_alerts(stocks):
+    """
+    Bulk create low stock notifications for a batch of stocks.
+
+    A stock is skipped if it already has a low stock notification since it
+    was last restocked (or created), so each stock is reported once per
+    restocking cycle.
+    """
+    action_urls = {stock.pk: get_stock_url(stock) for stock in stocks}
+    notified = dict(
+        Notification.objects
+        .filter(notification_type=LOW_STOCK, action_url__in=action_urls.values())
+        .order_by()
+        .values('action_url')
+        .annotate(last_created_at=Max('created_at'))
+        .values_list('action_url', 'last_created_at')
+    )
+
+    notifications = []
+    for stock in stocks:
+        action_url = action_urls[stock.pk]
+        last_created_at = notified.get(action_url)
+        since = stock.last_restocked_date or stock.created_at
+        if last_created_at is not None and last_created_at >= since:
+            continue
+
+        quantity = Order.stringfy_num(stock.quantity)
+        notifications.append(Notification(
+            notification_type=LOW_STOCK,
+            business_account_id=stock.business_account_id,
+            action_message=f'{stock.product} is running low, {quantity} {stock.unit} left',
+            action_url=action_url
+        ))
+    notifications = Notification.objects.bulk_create(notifications)
+
+    # Bulk inserts don't send `post_save`
+    counts = Counter(notification.business_account_id for notification in notifications)
+    for business_id, count in counts.items():
+        adjust_unread_count(business_id, count)
+    transaction.on_commit(partial(publish, notifications))
+    return notifications
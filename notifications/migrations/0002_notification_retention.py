@@ -0,0 +1,41 @@
+# Generated by Django 3.2.7 on 2026-10-19 06:05
+
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('business', '0008_periodsnapshot'),
+        ('notifications', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedNotification',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('notification_type', models.CharField(max_length=255)),
+                ('action_message', models.TextField()),
+                ('action_url', models.URLField(blank=True, null=True)),
+                ('action_date', models.DateTimeField(blank=True, null=True)),
+                ('action_date_label', models.CharField(max_length=255)),
+                ('is_seen', models.BooleanField(default=True)),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'Archived Notification',
+                'verbose_name_plural': 'Archived Notifications',
+                'ordering': ('-created_at',),
+            },
+        ),
+        migrations.AddField(
+            model_name='archivednotification',
+            name='business_account',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_notifications', to='business.businessaccount'),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 3.2.7 on 2026-10-19 06:05
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+# The indexes are built concurrently, so the notifications table stays
+# writable while they are being built. `CREATE INDEX CONCURRENTLY` cannot
+# run inside a transaction, hence `atomic = False`. They are kept apart from
+# the model changes, which stay atomic.
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('notifications', '0002_notification_retention'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='notification',
+            index=models.Index(fields=['business_account', 'is_seen', '-created_at'], name='notifications_list_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='notification',
+            index=models.Index(condition=models.Q(('is_seen', True)), fields=['created_at'], name='notifications_seen_idx'),
+        ),
+    ]
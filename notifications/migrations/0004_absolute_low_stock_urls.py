@@ -0,0 +1,29 @@
+# Generated by Django 3.2.7 on 2026-10-19 06:45
+
+from django.conf import settings
+from django.db import migrations
+from django.db.models import Value
+from django.db.models.functions import Concat
+
+
+def make_urls_absolute(apps, schema_editor):
+    """
+    Prefix the relative URLs of the low stock notifications with
+    `API_BASE_URL`, like the URLs of the new ones.
+    """
+    base_url = settings.API_BASE_URL.rstrip('/')
+    for model_name in ('Notification', 'ArchivedNotification'):
+        model = apps.get_model('notifications', model_name)
+        model.objects.filter(notification_type='Low Stock', action_url__startswith='/') \
+            .update(action_url=Concat(Value(base_url), 'action_url'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0003_notification_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(make_urls_absolute, migrations.RunPython.noop),
+    ]
@@ -1,6 +1,7 @@
 from uuid import uuid4
 
 from django.db import models
+from django.db.models import Q
 from django.utils.translation import gettext_lazy as _
 
 from business.models import BusinessAccount
@@ -39,6 +40,44 @@ class Notification(models.Model):
         verbose_name = _('Notification')
         verbose_name_plural = _('Notifications')
         ordering = ('is_seen', '-created_at')
+        indexes = [
+            # Lists of a business account, in the default ordering
+            models.Index(fields=['business_account', 'is_seen', '-created_at'],
+                         name='notifications_list_idx'),
+            # Seen notifications due for archival (see `archive_notifications`)
+            models.Index(fields=['created_at'], condition=Q(is_seen=True),
+                         name='notifications_seen_idx'),
+        ]
+
+    def __str__(self):
+        return self.action_message
+
+
+class ArchivedNotification(models.Model):
+    """
+    A seen notification moved out of the notifications table by the
+    retention job, once it is older than `NOTIFICATION_RETENTION_DAYS`.
+    """
+    id = models.UUIDField(primary_key=True, editable=False, default=uuid4)
+    notification_type = models.CharField(max_length=255)
+    business_account = models.ForeignKey(
+        BusinessAccount,
+        on_delete=models.CASCADE,
+        related_name='archived_notifications'
+    )
+    action_message = models.TextField()
+    action_url = models.URLField(blank=True, null=True)
+    action_date = models.DateTimeField(blank=True, null=True)
+    action_date_label = models.CharField(max_length=255)
+    is_seen = models.BooleanField(default=True)
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = _('Archived Notification')
+        verbose_name_plural = _('Archived Notifications')
+        ordering = ('-created_at', )
 
     def __str__(self):
         return self.action_message
@@ -0,0 +1,89 @@
+"""
+Notification bulk operations.
+
+Bulk updates bypass `Model.save()` and its signals, so the cached unread
+counters are adjusted explicitly.
+"""
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .counters import adjust_unread_count
+from .models import ArchivedNotification, Notification
+
+
+@transaction.atomic
+def mark_seen(business_id, ids=None):
+    """
+    Mark the unseen notifications of the business account as seen with a
+    single `UPDATE`.
+
+    Only notifications which are still unseen are matched, and concurrent
+    updates of a row wait for each other, so every notification is only
+    subtracted from the unread counter once.
+
+    params:
+      ids (list): IDs of the notifications, or `None` for all of them.
+
+    Returns:
+      The number of notifications marked as seen.
+    """
+    queryset = Notification.objects.filter(business_account_id=business_id, is_seen=False)
+    if ids is not None:
+        queryset = queryset.filter(pk__in=ids)
+    count = queryset.update(is_seen=True, updated_at=timezone.now())
+    adjust_unread_count(business_id, -count)
+    return count
+
+
+# Columns copied to the archive table
+ARCHIVED_COLUMNS = ', '.join((
+    'id', 'notification_type', 'business_account_id', 'action_message', 'action_url',
+    'action_date', 'action_date_label', 'is_seen', 'created_at', 'updated_at'
+))
+
+# Locks a batch of seen notifications created before the cutoff, oldest
+# first. Rows locked by a concurrent run are skipped.
+BATCH_SQL = f'''
+    SELECT id FROM {Notification._meta.db_table}
+    WHERE is_seen AND created_at < %s
+    ORDER BY created_at
+    LIMIT %s
+    FOR UPDATE SKIP LOCKED
+'''
+
+DELETE_SQL = f'''
+    DELETE FROM {Notification._meta.db_table}
+    WHERE id IN ({BATCH_SQL})
+'''
+
+ARCHIVE_SQL = f'''
+    WITH moved AS (
+        {DELETE_SQL}
+        RETURNING {ARCHIVED_COLUMNS}
+    )
+    INSERT INTO {ArchivedNotification._meta.db_table} ({ARCHIVED_COLUMNS}, archived_at)
+    SELECT {ARCHIVED_COLUMNS}, NOW() FROM moved
+'''
+
+
+def archive_notifications(before, archive=True, batch_size=1000):
+    """
+    Move the seen notifications created before the datetime to the archive
+    table (or delete them), in batches of bounded statements.
+
+    Every batch is moved by a single statement in its own transaction, so
+    rows and locks are only held for one batch at a time. Unseen
+    notifications are kept, so the unread counters are not affected.
+
+    Returns:
+      The number of archived (or deleted) notifications.
+    """
+    sql = ARCHIVE_SQL if archive else DELETE_SQL
+    count = 0
+    while True:
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(sql, (before, batch_size))
+            moved = cursor.rowcount
+        count += moved
+        if moved < batch_size:
+            return count
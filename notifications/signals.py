@@ -0,0 +1,53 @@
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete, pre_save
+from django.dispatch import receiver
+
+from .counters import adjust_unread_count
+from .models import Notification
+from .stream import publish
+
+
+@receiver(pre_save, sender=Notification)
+def remember_is_seen(sender, instance, **kwargs):
+    """
+    Remember the saved `is_seen` of updated notifications, so that the
+    unread counter is only adjusted when it changes.
+    """
+    if instance._state.adding:
+        return
+    instance._saved_is_seen = Notification.objects.filter(pk=instance.pk) \
+        .values_list('is_seen', flat=True).first()
+
+
+@receiver(post_save, sender=Notification)
+def adjust_saved_unread_count(sender, instance, created, **kwargs):
+    """
+    Adjust the unread counter of the business account on notification
+    creates and `is_seen` updates.
+    """
+    if created:
+        if not instance.is_seen:
+            adjust_unread_count(instance.business_account_id, 1)
+        return
+
+    saved_is_seen = getattr(instance, '_saved_is_seen', None)
+    if saved_is_seen is None or saved_is_seen == instance.is_seen:
+        return
+    adjust_unread_count(instance.business_account_id, -1 if instance.is_seen else 1)
+
+
+@receiver(post_delete, sender=Notification)
+def adjust_deleted_unread_count(sender, instance, **kwargs):
+    if not instance.is_seen:
+        adjust_unread_count(instance.business_account_id, -1)
+
+
+@receiver(post_save, sender=Notification)
+def publish_created_notification(sender, instance, created, **kwargs):
+    """
+    Push created notifications to the streams of the business account.
+    """
+    if created:
+        transaction.on_commit(partial(publish, [instance]))
@@ -0,0 +1,144 @@
+"""
+Fan-out of created notifications to the server-sent events streams.
+
+Created notifications are published (once committed) to a Redis pub/sub
+channel. Every ASGI process subscribes to the channel once, in a
+background thread, and dispatches the messages to the asyncio queues of
+the streams of their business accounts (see `notifications.asgi`).
+
+Without `NOTIFICATION_STREAM_REDIS_URL`, notifications are dispatched in
+process, which only reaches the streams served by the publishing process
+(e.g. with a single development server).
+"""
+import asyncio
+import json
+import logging
+import threading
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from djangorestframework_camel_case.util import camelize
+from redis import Redis
+from redis.exceptions import RedisError
+from rest_framework.utils.encoders import JSONEncoder
+
+from business.serializers import NotificationSerializer
+
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = 'notifications:created'
+
+
+def _serialize(notification):
+    return camelize(NotificationSerializer(notification).data)
+
+
+_redis = None
+
+
+def _get_redis():
+    global _redis
+    url = settings.NOTIFICATION_STREAM_REDIS_URL
+    if not url:
+        return None
+    if _redis is None:
+        _redis = Redis.from_url(url)
+    return _redis
+
+
+def publish(notifications):
+    """
+    Publish the created notifications to the streams of their business
+    accounts.
+    """
+    redis = _get_redis()
+    for notification in notifications:
+        message = json.dumps({
+            'business_id': str(notification.business_account_id),
+            'notification': _serialize(notification),
+        }, cls=JSONEncoder)
+        if redis is None:
+            broker.dispatch(message)
+            continue
+        try:
+            redis.publish(CHANNEL, message)
+        except RedisError:
+            logger.exception('Failed to publish notification %s', notification.pk)
+
+
+class Broker:
+    """
+    In-process fan-out of the published notifications to the queues of the
+    streams, by business account.
+    """
+    QUEUE_SIZE = 100
+
+    def __init__(self):
+        # Business account IDs mapped to the queues and their event loops
+        self.queues = defaultdict(dict)
+        self.lock = threading.Lock()
+        self.listener = None
+
+    def subscribe(self, business_id):
+        """
+        Returns a new queue of the notifications of the business account. It
+        must be unsubscribed once the stream is closed.
+        """
+        queue = asyncio.Queue(maxsize=self.QUEUE_SIZE)
+        with self.lock:
+            self.queues[str(business_id)][queue] = asyncio.get_running_loop()
+            self._start_listener()
+        return queue
+
+    def unsubscribe(self, business_id, queue):
+        with self.lock:
+            queues = self.queues.get(str(business_id))
+            if queues is not None:
+                queues.pop(queue, None)
+                if not queues:
+                    del self.queues[str(business_id)]
+
+    def dispatch(self, message):
+        """
+        Put a published message on the queues of its business account. Safe
+        to call from any thread.
+        """
+        message = json.loads(message)
+        with self.lock:
+            queues = list(self.queues.get(message['business_id'], {}).items())
+        for queue, loop in queues:
+            loop.call_soon_threadsafe(self._put, queue, message['notification'])
+
+    @staticmethod
+    def _put(queue, notification):
+        try:
+            queue.put_nowait(notification)
+        except asyncio.QueueFull:
+            pass  # The client is too slow, it can catch up with the list
+
+    def _start_listener(self):
+        if self.listener is not None or _get_redis() is None:
+            return
+        self.listener = threading.Thread(target=self._listen, name='notification-stream',
+                                         daemon=True)
+        self.listener.start()
+
+    def _listen(self):
+        """
+        Dispatch the messages of the Redis channel, reconnecting on errors.
+        """
+        while True:
+            try:
+                pubsub = _get_redis().pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(CHANNEL)
+                for message in pubsub.listen():
+                    if message['type'] == 'message':
+                        self.dispatch(message['data'])
+            except RedisError:
+                logger.exception('Notification stream subscription failed')
+                time.sleep(1)
+
+
+broker = Broker()
@@ -0,0 +1,40 @@
+from datetime import timedelta
+
+from celery import shared_task
+from django.conf import settings
+from django.utils import timezone
+
+from business.models import BusinessAccount
+
+from .counters import reconcile_unread_counts as reconcile_counts
+from .services import archive_notifications as archive_seen_notifications
+
+
+@shared_task
+def reconcile_unread_counts(batch_size=1000):
+    """
+    Recount the cached unread notification counters of all business
+    accounts, in primary key batches.
+    """
+    qs = BusinessAccount.objects.order_by('pk').values_list('pk', flat=True)
+
+    count = 0
+    last_pk = None
+    while True:
+        batch = qs if last_pk is None else qs.filter(pk__gt=last_pk)
+        batch = list(batch[:batch_size])
+        if not batch:
+            return count
+        reconcile_counts(batch)
+        count += len(batch)
+        last_pk = batch[-1]
+
+
+@shared_task
+def archive_notifications():
+    """
+    Archive (or delete, without `NOTIFICATION_ARCHIVE`) the seen
+    notifications older than `NOTIFICATION_RETENTION_DAYS`.
+    """
+    before = timezone.now() - timedelta(days=settings.NOTIFICATION_RETENTION_DAYS)
+    return archive_seen_notifications(before, archive=settings.NOTIFICATION_ARCHIVE)
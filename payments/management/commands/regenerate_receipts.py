@@ -0,0 +1,54 @@
+from django.conf import settings
+from django.core.management import BaseCommand, CommandError
+from django.db.models import F, Q
+from django.utils.dateparse import parse_date
+
+from payments.models import Payment
+from payments.receipts import ReceiptRenderer, iter_payments
+
+
+class Command(BaseCommand):
+    help = ('Regenerate stale or missing PDF receipts. Use `--force` to regenerate '
+            'every receipt (e.g. after a change of the receipt branding).')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--business', help='Limit to a single business account ID.')
+        parser.add_argument('--from', dest='date_from', help='Start date (yyyy-mm-dd).')
+        parser.add_argument('--to', dest='date_to', help='End date (yyyy-mm-dd).')
+        parser.add_argument('--workers', type=int, default=settings.RECEIPT_RENDER_WORKERS,
+                            help='Number of worker processes used for rendering.')
+        parser.add_argument('--force', action='store_true',
+                            help='Regenerate receipts even if they are still current.')
+
+    def handle(self, *args, **options):
+        qs = Payment.objects.all()
+        if options['business']:
+            qs = qs.filter(order__business_account__id=options['business'])
+        if options['date_from']:
+            qs = qs.filter(created_at__date__gte=self._parse_date(options['date_from']))
+        if options['date_to']:
+            qs = qs.filter(created_at__date__lte=self._parse_date(options['date_to']))
+        if not options['force']:
+            # Skip receipts which are still current
+            qs = qs.filter(
+                Q(pdf_file__isnull=True) |
+                Q(pdf_file='') |
+                Q(pdf_updated_at__isnull=True) |
+                ~Q(pdf_updated_at=F('updated_at'))
+            )
+
+        renderer = ReceiptRenderer(
+            settings.RECEIPT_BASE_URL,
+            max_workers=options['workers'],
+            force=True
+        )
+        count = 0
+        for _ in renderer.iter_receipts(iter_payments(qs)):
+            count += 1
+        self.stdout.write(f'{count} receipts are regenerated.')
+
+    def _parse_date(self, value):
+        date = parse_date(value)
+        if date is None:
+            raise CommandError(f'Invalid date: {value}')
+        return date
@@ -0,0 +1,18 @@
+# Generated by Django 3.2.7 on 2026-10-19 05:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payments', '0004_alter_solditem_unit'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='payment',
+            name='pdf_updated_at',
+            field=models.DateTimeField(blank=True, editable=False, help_text='The `updated_at` value of the payment when the PDF receipt was generated.', null=True),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 3.2.7 on 2026-10-19 05:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payments', '0005_payment_pdf_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='payment',
+            index=models.Index(condition=models.Q(('mode_of_payment', 'CREDIT'), models.Q(('status', 'COMPLETED'), _negated=True)), fields=['order', 'pay_later_date'], name='payments_receivable_idx'),
+        ),
+    ]
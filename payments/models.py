@@ -3,6 +3,7 @@ from uuid import uuid4
 from django.core.files.base import ContentFile
 from django.conf import settings
 from django.db import models
+from django.db.models import Q
 from django.template.loader import get_template
 from django.utils.functional import cached_property
 from django.utils.translation import gettext_lazy as _
@@ -13,6 +14,18 @@ from inventory.units import MeasurementUnit
 from orders.models import Order
 
 
+class PaymentQuerySet(models.QuerySet):
+    def receivable(self):
+        """
+        Returns open `CREDIT` (i.e. pay later) payments, which are still owed
+        by the customers. The filter matches the condition of the
+        `payments_receivable_idx` partial index.
+        """
+        return self.filter(mode_of_payment=Payment.CREDIT) \
+            .exclude(status=Payment.COMPLETED) \
+            .exclude(status=Payment.FAILED)
+
+
 class Payment(models.Model):
     # Payment Status Choices
     PENDING = 'PENDING'
@@ -45,15 +58,29 @@ class Payment(models.Model):
     pay_later_date = models.DateField(blank=True, null=True,
                                       help_text=_('Required if mode of payment is `CREDIT`.'))
     pdf_file = models.FileField(upload_to='payments/receipts/', null=True, blank=True)
+    pdf_updated_at = models.DateTimeField(null=True, blank=True, editable=False,
+                                          help_text=_('The `updated_at` value of the payment '
+                                                      'when the PDF receipt was generated.'))
     created_at = models.DateTimeField(auto_now_add=True,
                                       help_text=_('Payment transaction created date and time.'))
     updated_at = models.DateTimeField(auto_now=True,
                                       help_text=_('Payment transaction last updated date and time.'))
 
+    objects = PaymentQuerySet.as_manager()
+
     class Meta:
         verbose_name = _('Payment')
         verbose_name_plural = _('Payments')
         ordering = ('-created_at', )
+        indexes = [
+            # Open pay later payments are a small part of all payments, so
+            # the receivables of a business are read without a table scan.
+            models.Index(
+                fields=['order', 'pay_later_date'],
+                name='payments_receivable_idx',
+                condition=Q(mode_of_payment='CREDIT') & ~Q(status='COMPLETED')
+            ),
+        ]
 
     def __str__(self):
         return self.order.customer.name
@@ -81,12 +108,40 @@ class Payment(models.Model):
     def total_amount(self):
         return round(self.order_amount + self.tax_amount, 2)
 
-    def generate_pdf(self, request):
+    @property
+    def has_current_pdf(self):
+        """
+        Returns `True` if the stored PDF receipt was generated from the
+        current state of the payment.
+        """
+        return bool(self.pdf_file) and self.pdf_updated_at == self.updated_at
+
+    def render_html(self):
         template = get_template('payments/receipts/placeholder.html')
         context = {'payment': self}
-        html = template.render(context)
+        return template.render(context)
+
+    def save_pdf(self, content):
+        """
+        Store the rendered PDF receipt without touching `updated_at`, so
+        that the receipt stays current until the payment itself changes.
+        """
+        stale_name = self.pdf_file.name
+        self.pdf_file.save('receipt.pdf', ContentFile(content), save=False)
+        if stale_name:
+            self.pdf_file.storage.delete(stale_name)
+        self.pdf_updated_at = self.updated_at
+        Payment.objects.filter(pk=self.pk).update(
+            pdf_file=self.pdf_file.name,
+            pdf_updated_at=self.pdf_updated_at
+        )
+
+    def generate_pdf(self, request, force=False):
+        if self.has_current_pdf and not force:
+            return
+        html = self.render_html()
         pdf_file = HTML(string=html, base_url=request.build_absolute_uri()).write_pdf()
-        self.pdf_file.save('receipt.pdf', ContentFile(pdf_file), save=True)
+        self.save_pdf(pdf_file)
 
 
 class SoldItem(models.Model):
@@ -0,0 +1,142 @@
+"""
+Bulk PDF receipt rendering.
+
+WeasyPrint is CPU-bound, so receipts are rendered in a bounded pool of
+worker processes. Templates are rendered in the calling process (they
+need the database) and only the HTML is handed over to the workers.
+"""
+import zipfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+
+from weasyprint import HTML
+
+
+def render_pdf(html, base_url):
+    """
+    Render an HTML document to PDF. Runs inside a worker process.
+
+    Returns:
+      The PDF document (bytes).
+    """
+    return HTML(string=html, base_url=base_url).write_pdf()
+
+
+def iter_payments(queryset, batch_size=200):
+    """
+    Iterate over payments in chronological batches, so that the related
+    objects used by the receipt template are prefetched per batch.
+    """
+    queryset = queryset.select_related(
+        'order__customer',
+        'order__business_account'
+    ).prefetch_related('order__order_items__item').order_by('created_at', 'pk')
+
+    last = None
+    while True:
+        batch = queryset
+        if last is not None:
+            batch = batch.filter(
+                Q(created_at__gt=last.created_at) |
+                Q(created_at=last.created_at, pk__gt=last.pk)
+            )
+        batch = list(batch[:batch_size])
+        if not batch:
+            return
+        yield from batch
+        last = batch[-1]
+
+
+def receipt_filename(payment):
+    created_at = timezone.localtime(payment.created_at)
+    return f'receipt-{created_at:%Y%m%d}-{payment.pk}.pdf'
+
+
+class ReceiptRenderer:
+    """
+    Render PDF receipts for a sequence of payments in a process pool.
+
+    Stored receipts which are still current (see `Payment.has_current_pdf`)
+    are read back from the storage instead of being rendered again. At most
+    `max_workers * 2` receipts are held in memory at any time.
+    """
+
+    def __init__(self, base_url, max_workers=None, force=False):
+        self.base_url = base_url
+        self.max_workers = max_workers or settings.RECEIPT_RENDER_WORKERS
+        self.force = force
+
+    def iter_receipts(self, payments):
+        """
+        Yield `(payment, pdf_content)` pairs in the order of `payments`.
+        """
+        window = self.max_workers * 2
+        pending = deque()
+        with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+            for payment in payments:
+                if payment.has_current_pdf and not self.force:
+                    pending.append((payment, None))
+                else:
+                    html = payment.render_html()
+                    future = executor.submit(render_pdf, html, self.base_url)
+                    pending.append((payment, future))
+
+                if len(pending) >= window:
+                    yield self._resolve(*pending.popleft())
+
+            while pending:
+                yield self._resolve(*pending.popleft())
+
+    def _resolve(self, payment, future):
+        if future is None:
+            with payment.pdf_file.open('rb') as pdf_file:
+                return payment, pdf_file.read()
+
+        content = future.result()
+        payment.save_pdf(content)
+        return payment, content
+
+
+class ZipStream:
+    """
+    A write-only, non-seekable file object for `zipfile.ZipFile`.
+
+    Written bytes are kept only until the next `pop()`, which lets a ZIP
+    archive be streamed without building it in memory.
+    """
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def pop(self):
+        data = b''.join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def stream_receipts_zip(payments, renderer):
+    """
+    Generate a ZIP archive of the receipts of `payments` chunk by chunk.
+    """
+    stream = ZipStream()
+    with zipfile.ZipFile(stream, mode='w', compression=zipfile.ZIP_STORED) as archive:
+        for payment, content in renderer.iter_receipts(payments):
+            created_at = timezone.localtime(payment.created_at)
+            info = zipfile.ZipInfo(
+                receipt_filename(payment),
+                date_time=created_at.timetuple()[:6]
+            )
+            archive.writestr(info, content)
+            yield stream.pop()
+    yield stream.pop()
@@ -0,0 +1,157 @@
+"""
+Accounts receivable aging report.
+
+Open `CREDIT` payments (see `PaymentQuerySet.receivable`) are grouped per
+customer into aging buckets by the number of days past their pay later
+date, in a single grouped query served by the `payments_receivable_idx`
+partial index.
+"""
+import csv
+from datetime import timedelta
+from decimal import Decimal
+
+from django.db.models import DecimalField, ExpressionWrapper, F, Max, Min, Q, Sum, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .models import Payment
+
+
+DECIMAL = DecimalField(max_digits=24, decimal_places=2)
+
+# Aging buckets: (name, first day overdue, last day overdue)
+BUCKETS = (
+    ('current', None, 0),
+    ('days_1_to_30', 1, 30),
+    ('days_31_to_60', 31, 60),
+    ('days_61_to_90', 61, 90),
+    ('days_over_90', 91, None),
+)
+BUCKET_NAMES = tuple(name for name, _, _ in BUCKETS)
+
+
+def _bucket_filter(today, first_day, last_day):
+    """
+    Returns the filter of payments which are `first_day` to `last_day` days
+    past their pay later date. Payments without a pay later date are not
+    due yet.
+    """
+    q = Q()
+    if first_day is not None:
+        q &= Q(pay_later_date__lte=today - timedelta(days=first_day))
+    if last_day is not None:
+        q &= Q(pay_later_date__gte=today - timedelta(days=last_day))
+    if first_day is None:
+        q |= Q(pay_later_date__isnull=True)
+    return q
+
+
+def get_aging_queryset(business_account, as_of=None):
+    """
+    Returns the aging buckets of the open `CREDIT` payments of the business
+    account per customer (as dicts), the largest balances first. Amounts
+    are before TAX.
+
+    params:
+      as_of (date): The date the days overdue are counted to (default: today).
+    """
+    today = as_of or timezone.localdate()
+    amount = ExpressionWrapper(F('sold_items__quantity') * F('sold_items__price'),
+                               output_field=DECIMAL)
+    buckets = {
+        name: Coalesce(Sum(amount, filter=_bucket_filter(today, first_day, last_day)),
+                       Value(Decimal(0)), output_field=DECIMAL)
+        for name, first_day, last_day in BUCKETS
+    }
+    return Payment.objects.receivable() \
+        .filter(order__business_account=business_account) \
+        .order_by() \
+        .values('order__customer') \
+        .annotate(
+            customer_id=F('order__customer'),
+            customer_name=F('order__customer__name'),
+            customer_phone_number=F('order__customer__phone_number'),
+            oldest_pay_later_date=Min('pay_later_date'),
+            last_payment_at=Max('created_at'),
+            total=Coalesce(Sum(amount), Value(Decimal(0)), output_field=DECIMAL),
+            **buckets
+        ) \
+        .values('customer_id', 'customer_name', 'customer_phone_number',
+                'oldest_pay_later_date', 'last_payment_at', 'total', *BUCKET_NAMES) \
+        .order_by('-total', 'customer_id')
+
+
+def get_tax_percentage(business_account):
+    return sum(tax.percentage for tax in business_account.taxes.active())
+
+
+def add_taxes(row, tax_percentage):
+    """
+    Add the active taxes to the amounts of an aging report row.
+    """
+    for name in ('total', *BUCKET_NAMES):
+        amount = row[name]
+        row[name] = round(amount + amount * tax_percentage / 100, 2)
+    return row
+
+
+def build_aging_report(business_account, as_of=None):
+    """
+    Returns the accounts receivable aging report of the business account.
+    Amounts include the active taxes.
+    """
+    today = as_of or timezone.localdate()
+    tax_percentage = get_tax_percentage(business_account)
+    customers = [
+        add_taxes(row, tax_percentage)
+        for row in get_aging_queryset(business_account, today)
+    ]
+    totals = {
+        name: sum((row[name] for row in customers), Decimal(0))
+        for name in ('total', *BUCKET_NAMES)
+    }
+    return {
+        'as_of': today,
+        'customer_count': len(customers),
+        **totals,
+        'customers': customers,
+    }
+
+
+class Echo:
+    """
+    A file-like object which returns what is written, for `csv.writer`.
+    """
+
+    def write(self, value):
+        return value
+
+
+CSV_HEADER = (
+    'Customer ID', 'Customer', 'Phone Number', 'Current', '1-30 Days', '31-60 Days',
+    '61-90 Days', 'Over 90 Days', 'Total', 'Oldest Due Date'
+)
+
+
+def stream_aging_csv(business_account, as_of=None, chunk_size=2000):
+    """
+    Generate the aging report of the business account as CSV lines. Rows
+    are fetched with a server side cursor, so large reports are never held
+    in memory.
+    """
+    today = as_of or timezone.localdate()
+    tax_percentage = get_tax_percentage(business_account)
+    writer = csv.writer(Echo())
+    yield writer.writerow(CSV_HEADER)
+
+    rows = get_aging_queryset(business_account, today).iterator(chunk_size=chunk_size)
+    for row in rows:
+        row = add_taxes(row, tax_percentage)
+        yield writer.writerow([
+            row['customer_id'],
+            row['customer_name'],
+            row['customer_phone_number'] or '',
+            *[row[name] for name in BUCKET_NAMES],
+            row['total'],
+            row['oldest_pay_later_date'] or '',
+        ])
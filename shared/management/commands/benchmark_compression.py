@@ -0,0 +1,66 @@
+import gzip
+from timeit import default_timer
+from uuid import uuid4
+
+import brotli
+import msgpack
+import orjson
+from django.core.management import BaseCommand, CommandError
+from django.http import HttpResponse
+from django.test import RequestFactory
+
+from shared.middleware import CompressionMiddleware
+from shared.renderers import CamelCaseJSONRenderer, CamelCaseMessagePackRenderer
+
+from .benchmark_json import build_orders
+
+
+RENDERERS = (
+    ('JSON', CamelCaseJSONRenderer, orjson.loads),
+    ('MessagePack', CamelCaseMessagePackRenderer, msgpack.unpackb),
+)
+
+DECOMPRESSORS = {
+    'identity': lambda content: content,
+    'gzip': gzip.decompress,
+    'br': brotli.decompress,
+}
+
+
+class Command(BaseCommand):
+    help = ('Compare the payload size & latency (render, compress and download time) '
+            'of an order list in JSON & MessagePack, with each content encoding.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=100, help='Number of orders.')
+        parser.add_argument('--repeat', type=int, default=20, help='Number of runs.')
+        parser.add_argument('--bandwidth', type=int, default=400,
+                            help='Download bandwidth in kbit/s (400 is a slow 3G).')
+
+    def handle(self, *args, **options):
+        data = build_orders(options['rows'])
+        expected = orjson.loads(CamelCaseJSONRenderer().render(data))
+        repeat = options['repeat']
+        factory = RequestFactory()
+        middleware = CompressionMiddleware(lambda request: None)
+
+        for label, renderer_class, loads in RENDERERS:
+            renderer = renderer_class()
+            for encoding, decompress in DECOMPRESSORS.items():
+                request = factory.get(f'/business/{uuid4()}/orders/', HTTP_ACCEPT_ENCODING=encoding)
+                start = default_timer()
+                for _ in range(repeat):
+                    response = HttpResponse(renderer.render(data), content_type=renderer.media_type)
+                    response = middleware.process_response(request, response)
+                server_time = (default_timer() - start) / repeat * 1000
+
+                if response.get('Content-Encoding', 'identity') != encoding:
+                    raise CommandError(f'The {label} response isn\'t {encoding} encoded.')
+                if loads(decompress(response.content)) != expected:
+                    raise CommandError(f'The {encoding} {label} response differs.')
+                size = len(response.content)
+                download_time = size * 8 / options['bandwidth']  # In ms
+                self.stdout.write(
+                    f'{label} ({encoding}): {size / 1024:.1f} KiB, {server_time:.1f} ms to render '
+                    f'+ {download_time:.0f} ms to download = {server_time + download_time:.0f} ms'
+                )
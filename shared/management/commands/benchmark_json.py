@@ -0,0 +1,78 @@
+import io
+from datetime import timedelta
+from decimal import Decimal
+from timeit import default_timer
+from uuid import uuid4
+
+from django.core.management import BaseCommand, CommandError
+from django.utils import timezone
+from djangorestframework_camel_case.parser import CamelCaseJSONParser as BaseCamelCaseJSONParser
+from djangorestframework_camel_case.render import CamelCaseJSONRenderer as BaseCamelCaseJSONRenderer
+
+from shared.parsers import CamelCaseJSONParser
+from shared.renderers import CamelCaseJSONRenderer
+
+
+def build_orders(count):
+    """
+    Returns an order list payload (like `OrderSerializer(many=True).data`).
+    """
+    now = timezone.now()
+    orders = []
+    for i in range(count):
+        items = [{
+            'id': uuid4(),
+            'item_id': uuid4(),
+            'product': f'Product {i}-{j} ½ kg',
+            'unit': 'kg',
+            'quantity': Decimal('1.50') * (j + 1),
+            'price': Decimal('1234.56') + i,
+            'total_amount': Decimal('1851.84') * (j + 1),
+            'created_at': now,
+        } for j in range(3)]
+        orders.append({
+            'id': uuid4(),
+            'order_type': 'FROM_LIST',
+            'customer': {'id': uuid4(), 'name': f'Customer {i}', 'phone_number': None},
+            'order_items': items,
+            'tax_percentage': 7.5,
+            'order_amount': sum(item['total_amount'] for item in items),
+            'is_completed': i % 2 == 0,
+            'pay_later_date': (now + timedelta(days=i)).date(),
+            'created_at': now.isoformat(),
+            'updated_at': now.isoformat(),
+        })
+    return {'count': count, 'next': None, 'previous': None, 'results': orders}
+
+
+class Command(BaseCommand):
+    help = ('Compare the camelCase JSON renderer & parser with the '
+            '`djangorestframework_camel_case` ones on an order list.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=1000, help='Number of orders.')
+        parser.add_argument('--repeat', type=int, default=20, help='Number of runs.')
+
+    def _time(self, function, repeat):
+        start = default_timer()
+        for _ in range(repeat):
+            result = function()
+        return (default_timer() - start) / repeat * 1000, result
+
+    def handle(self, *args, **options):
+        data = build_orders(options['rows'])
+        repeat = options['repeat']
+
+        base_time, expected = self._time(lambda: BaseCamelCaseJSONRenderer().render(data), repeat)
+        time, body = self._time(lambda: CamelCaseJSONRenderer().render(data), repeat)
+        if body != expected:
+            raise CommandError('The rendered JSON differs.')
+        self.stdout.write(f'Render: {base_time:.1f} ms -> {time:.1f} ms ({len(body)} bytes)')
+
+        base_time, expected = self._time(
+            lambda: BaseCamelCaseJSONParser().parse(io.BytesIO(body)), repeat
+        )
+        time, parsed = self._time(lambda: CamelCaseJSONParser().parse(io.BytesIO(body)), repeat)
+        if parsed != expected:
+            raise CommandError('The parsed JSON differs.')
+        self.stdout.write(f'Parse: {base_time:.1f} ms -> {time:.1f} ms')
@@ -0,0 +1,60 @@
+from timeit import default_timer
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.management import BaseCommand
+from django.http import HttpResponse
+from django.test import RequestFactory
+from django.test.utils import override_settings
+from django.utils.module_loading import import_string
+
+
+def build_handler(middleware):
+    """
+    Returns the middleware chain of the dotted paths around a view which
+    runs the `process_view` hooks and returns an empty JSON response, like
+    `BaseHandler.load_middleware`.
+    """
+    view_middleware = []
+
+    def view(request):
+        for process_view in view_middleware:
+            response = process_view(request, view, (), {})
+            if response is not None:
+                return response
+        return HttpResponse('{}', content_type='application/json')
+
+    handler = view
+    for path in reversed(middleware):
+        instance = import_string(path)(handler)
+        if hasattr(instance, 'process_view'):
+            view_middleware.insert(0, instance.process_view)
+        handler = instance
+    return handler
+
+
+class Command(BaseCommand):
+    help = ('Measure the per-request overhead of the middleware on a JSON API route, '
+            'with the site middleware (full stack) and without it (lean stack).')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--path', default=f'/business/{uuid4()}/taxes/',
+                            help='Path of the requests.')
+        parser.add_argument('--requests', type=int, default=20000,
+                            help='Number of requests per stack.')
+
+    def handle(self, *args, **options):
+        factory = RequestFactory()
+        for label, token_auth_only in (('Full stack', False), ('Lean stack', True)):
+            with override_settings(API_TOKEN_AUTH_ONLY=token_auth_only,
+                                   ALLOWED_HOSTS=['testserver']):
+                handler = build_handler(settings.MIDDLEWARE)
+                requests = [
+                    factory.get(options['path'], secure=True, HTTP_AUTHORIZATION='Bearer x')
+                    for _ in range(options['requests'])
+                ]
+                start = default_timer()
+                for request in requests:
+                    handler(request)
+                elapsed = default_timer() - start
+            self.stdout.write(f'{label}: {elapsed / len(requests) * 10 ** 6:.1f} µs per request')
@@ -0,0 +1,145 @@
+"""
+Route-aware & compression middleware.
+
+The session, CSRF, authentication and message middleware are only needed
+by the admin, the browsable API and `api-auth/`. With `API_TOKEN_AUTH_ONLY`,
+the JSON API routes (`API_ROUTE_PREFIXES`) authenticate JWTs in the views
+(see `accounts.authentication`), so these subclasses skip them on those
+routes. They stay subclasses of the Django middleware, so the admin checks
+still find them.
+
+`CompressionMiddleware` compresses the responses with brotli or gzip, as
+negotiated with `Accept-Encoding`.
+"""
+import brotli
+from django.conf import settings
+from django.contrib.auth import middleware as auth
+from django.contrib.messages import middleware as messages
+from django.contrib.sessions import middleware as sessions
+from django.middleware import csrf
+from django.middleware.gzip import GZipMiddleware
+from django.utils.cache import patch_vary_headers
+from django.utils.text import compress_string
+
+
+def is_api_route(request):
+    """
+    Returns whether the request is for a JSON API route which skips the
+    site middleware.
+    """
+    if not hasattr(request, '_is_api_route'):
+        request._is_api_route = settings.API_TOKEN_AUTH_ONLY and \
+            request.path_info.startswith(settings.API_ROUTE_PREFIXES)
+    return request._is_api_route
+
+
+class SiteRouteMixin:
+    """
+    Skip the middleware on the JSON API routes.
+    """
+
+    def __call__(self, request):
+        if is_api_route(request):
+            return self.get_response(request)
+        return super().__call__(request)
+
+
+class SessionMiddleware(SiteRouteMixin, sessions.SessionMiddleware):
+    pass
+
+
+class CsrfViewMiddleware(SiteRouteMixin, csrf.CsrfViewMiddleware):
+    def process_view(self, request, callback, callback_args, callback_kwargs):
+        if is_api_route(request):
+            return None
+        return super().process_view(request, callback, callback_args, callback_kwargs)
+
+
+class AuthenticationMiddleware(SiteRouteMixin, auth.AuthenticationMiddleware):
+    pass
+
+
+class MessageMiddleware(SiteRouteMixin, messages.MessageMiddleware):
+    pass
+
+
+def get_accepted_encodings(header):
+    """
+    Returns the content codings of an `Accept-Encoding` header with their
+    q-values.
+    """
+    encodings = {}
+    for part in header.split(','):
+        coding, _, params = part.partition(';')
+        quality = 1.0
+        for param in params.split(';'):
+            name, _, value = param.partition('=')
+            if name.strip().lower() == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        encodings[coding.strip().lower()] = quality
+    return encodings
+
+
+def compress_brotli(content):
+    return brotli.compress(content, quality=settings.COMPRESSION_BROTLI_QUALITY)
+
+
+class CompressionMiddleware(GZipMiddleware):
+    """
+    Compress the API responses (`API_ROUTE_PREFIXES`) of
+    `COMPRESSION_CONTENT_TYPES` of at least `COMPRESSION_MIN_SIZE` bytes
+    with the preferred encoding the client accepts (brotli over gzip at
+    equal q-values).
+
+    Pages with CSRF tokens (the admin, `api-auth/`, the browsable API) are
+    never compressed, against BREACH. Streaming responses (e.g. the
+    notification events or CSV exports) are sent as they are, so they aren't
+    held back by the compressor.
+    """
+    compressors = {
+        'br': compress_brotli,
+        'gzip': compress_string,
+    }
+
+    def get_encoding(self, request):
+        accepted = get_accepted_encodings(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        encoding, best_quality = None, 0.0
+        for name in self.compressors:
+            quality = accepted.get(name, accepted.get('*', 0.0))
+            if quality > best_quality:
+                encoding, best_quality = name, quality
+        return encoding
+
+    def process_response(self, request, response):
+        if not request.path_info.startswith(settings.API_ROUTE_PREFIXES):
+            return response
+        if response.streaming or len(response.content) < settings.COMPRESSION_MIN_SIZE:
+            return response
+        if response.has_header('Content-Encoding'):
+            return response
+        content_type = response.get('Content-Type', '').partition(';')[0].strip()
+        if not content_type.startswith(settings.COMPRESSION_CONTENT_TYPES):
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+
+        encoding = self.get_encoding(request)
+        if encoding is None:
+            return response
+
+        # Return the compressed content only if it's actually shorter
+        compressed_content = self.compressors[encoding](response.content)
+        if len(compressed_content) >= len(response.content):
+            return response
+        response.content = compressed_content
+        response.headers['Content-Length'] = str(len(response.content))
+
+        # Make a strong ETag weak, like `GZipMiddleware`
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response.headers['ETag'] = 'W/' + etag
+        response.headers['Content-Encoding'] = encoding
+        return response
@@ -0,0 +1,62 @@
+"""
+Fast camelCase JSON parser.
+
+Request bodies are decoded with orjson and their keys translated with the
+memoized key translation (see `shared.utils.camelcase`). Bodies orjson
+rejects (e.g. invalid JSON or `NaN`) or would parse differently (integers
+over 64 bits, which it turns into floats) go through the
+`djangorestframework_camel_case` parser, so they are parsed, or fail, the
+same way as before.
+"""
+import io
+
+import orjson
+from django.conf import settings
+from djangorestframework_camel_case.parser import CamelCaseJSONParser as BaseCamelCaseJSONParser
+from djangorestframework_camel_case.settings import DEFAULTS as CAMEL_CASE_DEFAULTS
+
+from .utils.camelcase import underscoreize_key
+
+
+# orjson parses integers out of the int64 & uint64 ranges as floats, i.e.
+# integers over 2 ** 64 - 1 or under -2 ** 63
+MAX_INTEGER = 2 ** 63
+
+
+class FallbackParse(Exception):
+    """
+    The body may not be parsed by orjson like by the standard parser.
+    """
+
+
+def underscoreize(data):
+    """
+    Returns the parsed JSON data with its keys in snake_case, like
+    `djangorestframework_camel_case.util.underscoreize`.
+
+    Raises:
+      FallbackParse: The data has a float which may have been an integer.
+    """
+    data_type = type(data)
+    if data_type is dict:
+        return {underscoreize_key(key): underscoreize(value) for key, value in data.items()}
+    if data_type is list:
+        return [underscoreize(item) for item in data]
+    if data_type is float and abs(data) >= MAX_INTEGER and data.is_integer():
+        raise FallbackParse
+    return data
+
+
+class CamelCaseJSONParser(BaseCamelCaseJSONParser):
+    def parse(self, stream, media_type=None, parser_context=None):
+        if self.json_underscoreize != CAMEL_CASE_DEFAULTS['JSON_UNDERSCOREIZE']:
+            return super().parse(stream, media_type, parser_context)
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        body = stream.read()
+        if encoding.lower().replace('-', '') == 'utf8':
+            try:
+                return underscoreize(orjson.loads(body))
+            except (orjson.JSONDecodeError, FallbackParse):
+                pass
+        return super().parse(io.BytesIO(body), media_type, parser_context)
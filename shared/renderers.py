@@ -0,0 +1,144 @@
+"""
+Fast camelCase JSON renderer.
+
+Responses are camelized with memoized key translation (see
+`shared.utils.camelcase`) and encoded with orjson, byte for byte like
+`djangorestframework_camel_case`'s renderer over the DRF JSON renderer.
+The few payloads orjson would encode differently (floats it formats with
+another exponent notation, non-finite floats, non-string keys, integers
+over 64 bits) and indented responses go through the DRF renderer.
+
+The MessagePack renderer serves the same camelized data as
+`application/msgpack`, a smaller and faster to decode format for the mobile
+app.
+"""
+from datetime import date, datetime, time
+from decimal import Decimal
+from uuid import UUID
+
+import msgpack
+import orjson
+from django.utils.encoding import force_str
+from django.utils.functional import Promise
+from djangorestframework_camel_case.render import CamelCaseJSONRenderer as BaseCamelCaseJSONRenderer
+from djangorestframework_camel_case.settings import api_settings as camel_case_settings
+from djangorestframework_camel_case.util import camelize as base_camelize
+from rest_framework.renderers import BaseRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+from .utils.camelcase import camelize_key
+
+
+# Types which are encoded as they are
+SCALAR_TYPES = frozenset((str, int, bool, type(None), Decimal, UUID, datetime, date, time))
+
+# Floats `repr` (i.e. `json.dumps`) and orjson format alike
+SAFE_FLOAT_MIN = 1e-4
+SAFE_FLOAT_MAX = 1e16
+
+
+class FallbackRender(Exception):
+    """
+    The data can't be rendered by orjson like by the DRF renderer.
+    """
+
+
+def check_float(value):
+    if value != 0 and not SAFE_FLOAT_MIN <= abs(value) < SAFE_FLOAT_MAX:
+        raise FallbackRender  # Includes NaN & infinity
+
+
+def camelize(data):
+    """
+    Returns the data with its keys in camelCase, like
+    `djangorestframework_camel_case.util.camelize` (iterables become
+    lists).
+
+    Raises:
+      FallbackRender: The data has a float orjson would format differently.
+    """
+    data_type = type(data)
+    if data_type in SCALAR_TYPES:
+        return data
+    if data_type is float:
+        check_float(data)
+        return data
+    if isinstance(data, dict):
+        return {
+            camelize_key(key) if type(key) is str else _camelize_other_key(key): camelize(value)
+            for key, value in data.items()
+        }
+    if data_type is list or data_type is tuple:
+        return [camelize(item) for item in data]
+    if isinstance(data, Promise):
+        return force_str(data)
+    if isinstance(data, str):
+        return data
+    if isinstance(data, float):
+        check_float(data)
+        return data
+    try:
+        items = iter(data)
+    except TypeError:
+        return data
+    return [camelize(item) for item in items]
+
+
+def _camelize_other_key(key):
+    if isinstance(key, Promise):
+        key = force_str(key)
+    return camelize_key(key) if isinstance(key, str) else key
+
+
+class CamelCaseJSONRenderer(BaseCamelCaseJSONRenderer):
+    options = orjson.OPT_PASSTHROUGH_DATETIME
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        renderer_context = renderer_context or {}
+        indent = self.get_indent(accepted_media_type, renderer_context)
+        if indent is not None or not self.compact or self.ensure_ascii or not self.strict or \
+                camel_case_settings.JSON_UNDERSCOREIZE.get('ignore_fields'):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        encoder = self.encoder_class()
+
+        def default(obj):
+            value = float(obj) if type(obj) is Decimal else encoder.default(obj)
+            if type(value) is float:
+                check_float(value)
+            return value
+
+        try:
+            ret = orjson.dumps(camelize(data), default=default, option=self.options)
+        except (FallbackRender, orjson.JSONEncodeError):
+            return super().render(data, accepted_media_type, renderer_context)
+        # Like the DRF renderer, escape the line & paragraph separators for JavaScript
+        if b'\xe2\x80\xa8' in ret or b'\xe2\x80\xa9' in ret:
+            ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+        return ret
+
+
+class CamelCaseMessagePackRenderer(BaseRenderer):
+    """
+    Renders camelCase MessagePack. Decimals are encoded as floats and the
+    other non MessagePack types (dates, UUIDs...) like in JSON.
+    """
+    media_type = 'application/msgpack'
+    format = 'msgpack'
+    charset = None
+    render_style = 'binary'
+    encoder_class = JSONEncoder
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if camel_case_settings.JSON_UNDERSCOREIZE.get('ignore_fields'):
+            data = base_camelize(data, **camel_case_settings.JSON_UNDERSCOREIZE)
+        else:
+            try:
+                data = camelize(data)
+            except FallbackRender:  # MessagePack encodes all floats
+                data = base_camelize(data, **camel_case_settings.JSON_UNDERSCOREIZE)
+        return msgpack.packb(data, default=self.encoder_class().default, use_bin_type=True)
@@ -0,0 +1,256 @@
+"""
+SMS gateways.
+
+Text messages (e.g. customer reminders) are sent through the gateway of
+the `SMS_GATEWAYS` setting, created once per process (see
+`get_sms_gateway`), so their HTTP connections are kept alive between
+messages. With more than one gateway, messages fail over to the next one
+when a gateway errors, and gateways which are too slow or fail too often
+are skipped for a while.
+
+Messages are `(to, body)` tuples, where `to` is an `E164` phone number.
+"""
+import logging
+import threading
+import time
+from collections import deque, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+import requests
+from django.conf import settings
+from django.utils.module_loading import import_string
+from requests.adapters import HTTPAdapter
+from twilio.base.exceptions import TwilioException, TwilioRestException
+from twilio.http.http_client import TwilioHttpClient
+from twilio.rest import Client
+
+
+logger = logging.getLogger(__name__)
+
+
+# Result of a sent message. `error` is `None` if it was sent.
+SMSResult = namedtuple('SMSResult', ('to', 'message_id', 'error'))
+
+
+class SMSGatewayError(Exception):
+    """
+    The gateway failed to send a message.
+
+    Attributes:
+      retryable (bool): Whether the failure is transient (e.g. a timeout or
+      a 5xx response), so the message can be retried or sent by another
+      gateway. Invalid phone numbers aren't.
+    """
+
+    def __init__(self, message, retryable=False):
+        super().__init__(message)
+        self.retryable = retryable
+
+
+class SMSGateway:
+    """
+    Send text messages.
+    """
+    name = None
+
+    def __init__(self):
+        self.concurrency = settings.SMS_CONCURRENCY
+
+    def send(self, to, body):
+        """
+        Send a text message to the phone number.
+
+        Returns:
+          The message ID of the gateway.
+
+        Raises:
+          SMSGatewayError: The message could not be sent.
+        """
+        raise NotImplementedError
+
+    def send_many(self, messages):
+        """
+        Send the `(to, body)` messages, up to `SMS_CONCURRENCY` at once.
+        Failures don't stop the other messages.
+
+        Returns:
+          The list of `SMSResult` of the messages, in order.
+        """
+        messages = list(messages)
+        if len(messages) <= 1 or self.concurrency <= 1:
+            return [self._send_result(to, body) for to, body in messages]
+        with ThreadPoolExecutor(max_workers=min(self.concurrency, len(messages)),
+                                thread_name_prefix='sms') as executor:
+            return list(executor.map(lambda message: self._send_result(*message), messages))
+
+    def _send_result(self, to, body):
+        try:
+            return SMSResult(to, self.send(to, body), None)
+        except SMSGatewayError as e:
+            return SMSResult(to, None, e)
+
+
+class TwilioGateway(SMSGateway):
+    """
+    Send text messages with the Twilio Programmable Messaging API.
+    Documentation: https://www.twilio.com/docs/sms/api
+    """
+    name = 'twilio'
+
+    def __init__(self):
+        super().__init__()
+        http_client = TwilioHttpClient(pool_connections=True,
+                                       timeout=settings.TWILIO_TIMEOUT)
+        # Keep a connection per concurrent send
+        http_client.session.mount('https://', HTTPAdapter(pool_maxsize=self.concurrency))
+        self.client = Client(settings.TWILIO_ACCOUNT_SID, settings.TWILIO_AUTH_TOKEN,
+                             http_client=http_client)
+
+    def send(self, to, body):
+        try:
+            message = self.client.messages.create(to=to, from_=settings.TWILIO_PHONE_NUMBER,
+                                                  body=body)
+        except TwilioRestException as e:
+            raise SMSGatewayError(str(e), retryable=e.status >= 500 or e.status == 429) from e
+        except TwilioException as e:
+            raise SMSGatewayError(str(e), retryable=True) from e
+        except OSError as e:  # Connection errors & timeouts
+            raise SMSGatewayError(str(e), retryable=True) from e
+        return message.sid
+
+
+class TermiiGateway(SMSGateway):
+    """
+    Send text messages with the Termii Messaging API.
+    Documentation: https://developers.termii.com/messaging
+    """
+    name = 'termii'
+    ENDPOINT = 'https://api.ng.termii.com/api/sms/send'
+
+    def __init__(self):
+        super().__init__()
+        self.session = requests.Session()
+        self.session.mount('https://', HTTPAdapter(pool_maxsize=self.concurrency))
+        self.session.headers['Content-Type'] = 'application/json'
+
+    def send(self, to, body):
+        payload = {
+            'api_key': settings.TERMII_API_KEY,
+            'to': to.lstrip('+'),  # Termii numbers don't start with `+`
+            'from': settings.TERMII_SENDER_ID,
+            'sms': body,
+            'type': 'plain',
+            'channel': 'generic',
+        }
+        try:
+            response = self.session.post(self.ENDPOINT, json=payload,
+                                         timeout=settings.TERMII_TIMEOUT)
+            response.raise_for_status()
+            return response.json().get('message_id')
+        except requests.HTTPError as e:
+            status = e.response.status_code
+            raise SMSGatewayError(str(e), retryable=status >= 500 or status == 429) from e
+        except (requests.RequestException, ValueError) as e:
+            raise SMSGatewayError(str(e), retryable=True) from e
+
+
+class InMemoryGateway(SMSGateway):
+    """
+    Keep the messages in `outbox` instead of sending them, for tests,
+    benchmarks and local development.
+    """
+    name = 'in-memory'
+
+    def __init__(self):
+        super().__init__()
+        self.outbox = []
+        self.lock = threading.Lock()
+
+    def send(self, to, body):
+        with self.lock:
+            self.outbox.append((to, body))
+            return str(len(self.outbox))
+
+
+class GatewayHealth:
+    """
+    Latency and error rate of the last sends of a gateway.
+
+    A gateway is unhealthy for `cooldown` seconds once its error rate or
+    average latency crosses the thresholds, after which it gets a fresh
+    window.
+    """
+    WINDOW = 20
+    MIN_SAMPLES = 5
+
+    def __init__(self, max_error_rate, max_latency, cooldown):
+        self.max_error_rate = max_error_rate
+        self.max_latency = max_latency
+        self.cooldown = cooldown
+        self.samples = deque(maxlen=self.WINDOW)  # `(failed, latency)` tuples
+        self.unhealthy_until = 0
+        self.lock = threading.Lock()
+
+    def record(self, failed, latency):
+        with self.lock:
+            self.samples.append((failed, latency))
+            if len(self.samples) < self.MIN_SAMPLES:
+                return
+            error_rate = sum(failed for failed, _ in self.samples) / len(self.samples)
+            average_latency = sum(latency for _, latency in self.samples) / len(self.samples)
+            if error_rate > self.max_error_rate or average_latency > self.max_latency:
+                self.unhealthy_until = time.monotonic() + self.cooldown
+                self.samples.clear()
+
+    def is_healthy(self):
+        return time.monotonic() >= self.unhealthy_until
+
+
+class FailoverGateway(SMSGateway):
+    """
+    Send text messages with the first healthy gateway, falling over to the
+    next gateways on transient failures. If all gateways are unhealthy, they
+    are all tried anyway.
+    """
+    name = 'failover'
+
+    def __init__(self, gateways):
+        super().__init__()
+        self.gateways = gateways
+        self.health = {
+            gateway: GatewayHealth(settings.SMS_FAILOVER_ERROR_RATE,
+                                   settings.SMS_FAILOVER_LATENCY,
+                                   settings.SMS_FAILOVER_COOLDOWN)
+            for gateway in gateways
+        }
+
+    def send(self, to, body):
+        gateways = [gateway for gateway in self.gateways if self.health[gateway].is_healthy()]
+        error = None
+        for gateway in gateways or self.gateways:
+            start = time.monotonic()
+            try:
+                message_id = gateway.send(to, body)
+            except SMSGatewayError as e:
+                self.health[gateway].record(e.retryable, time.monotonic() - start)
+                if not e.retryable:
+                    raise
+                logger.warning('SMS gateway %s failed, failing over: %s', gateway.name, e)
+                error = e
+                continue
+            self.health[gateway].record(False, time.monotonic() - start)
+            return message_id
+        raise error
+
+
+@lru_cache(maxsize=None)
+def get_sms_gateway():
+    """
+    Returns the gateway of the `SMS_GATEWAYS` setting, created once per
+    process. Several gateways are combined into a `FailoverGateway`.
+    """
+    gateways = [import_string(path)() for path in settings.SMS_GATEWAYS]
+    if len(gateways) == 1:
+        return gateways[0]
+    return FailoverGateway(gateways)
@@ -0,0 +1,161 @@
+"""
+One-time password (OTP) providers.
+
+OTPs are sent and checked through the provider configured by the
+`OTP_PROVIDER` setting. Providers are created once per process (see
+`get_otp_provider`), so their HTTP clients and connection pools are reused
+across requests. Sends are dispatched to a Celery queue by the views (see
+`shared.tasks.send_otp`), which retries transient failures.
+"""
+import logging
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.module_loading import import_string
+from twilio.base.exceptions import TwilioException, TwilioRestException
+from twilio.http.http_client import TwilioHttpClient
+from twilio.rest import Client
+
+from shared.utils.otp import generate_otp
+
+
+logger = logging.getLogger(__name__)
+
+
+class OTPProviderError(Exception):
+    """
+    The provider failed to send or check an OTP.
+
+    Attributes:
+      retryable (bool): Whether the failure is transient (e.g. a timeout or
+      a 5xx response), so the call can be retried.
+    """
+
+    def __init__(self, message, retryable=False):
+        super().__init__(message)
+        self.retryable = retryable
+
+
+class BaseOTPProvider:
+    """
+    Send OTPs by SMS and check them.
+    """
+
+    def send(self, to):
+        """
+        Send a new OTP to the phone number (`E164`).
+
+        Raises:
+          OTPProviderError: The OTP could not be sent.
+        """
+        raise NotImplementedError
+
+    def check(self, to, code):
+        """
+        Returns whether the code is the valid OTP of the phone number.
+
+        Raises:
+          OTPProviderError: The OTP could not be checked.
+        """
+        raise NotImplementedError
+
+
+class TwilioVerifyProvider(BaseOTPProvider):
+    """
+    Send and check OTPs with the Twilio Verify service.
+    Documentation: https://www.twilio.com/docs/verify/api
+
+    The client keeps its HTTP connections open between requests. The SID of
+    the Verify service is read from `TWILIO_VERIFY_SERVICE_SID`, or looked
+    up (and created if missing) by its name once and cached.
+    """
+    SERVICE_NAME = 'Dukka'
+    SERVICE_SID_CACHE_KEY = 'sms:twilio-verify-service-sid'
+
+    def __init__(self):
+        http_client = TwilioHttpClient(pool_connections=True,
+                                       timeout=settings.TWILIO_TIMEOUT)
+        self.client = Client(settings.TWILIO_ACCOUNT_SID, settings.TWILIO_AUTH_TOKEN,
+                             http_client=http_client)
+        self._service_sid = settings.TWILIO_VERIFY_SERVICE_SID
+
+    @property
+    def service_sid(self):
+        if self._service_sid is None:
+            self._service_sid = cache.get(self.SERVICE_SID_CACHE_KEY)
+        if self._service_sid is None:
+            self._service_sid = self._get_or_create_service().sid
+            cache.set(self.SERVICE_SID_CACHE_KEY, self._service_sid, timeout=None)
+        return self._service_sid
+
+    def _get_or_create_service(self):
+        for service in self.client.verify.services.stream():
+            if service.friendly_name == self.SERVICE_NAME:
+                return service
+        return self.client.verify.services.create(friendly_name=self.SERVICE_NAME)
+
+    def _create(self, resource, **kwargs):
+        """
+        Create a resource (e.g. `verifications`) of the Verify service,
+        resolving the service SID first.
+
+        Raises:
+          OTPProviderError: The service or the resource could not be read
+          or created.
+        """
+        try:
+            service = self.client.verify.services(self.service_sid)
+            return getattr(service, resource).create(**kwargs)
+        except TwilioRestException as e:
+            if e.status == 404 and self._service_sid is not None:
+                # The service was deleted, look it up again on the next call
+                cache.delete(self.SERVICE_SID_CACHE_KEY)
+                self._service_sid = None
+            retryable = e.status >= 500 or e.status in (404, 429)
+            raise OTPProviderError(str(e), retryable=retryable) from e
+        except TwilioException as e:
+            raise OTPProviderError(str(e), retryable=True) from e
+        except OSError as e:  # Connection errors & timeouts
+            raise OTPProviderError(str(e), retryable=True) from e
+
+    def send(self, to):
+        self._create('verifications', to=to, channel='sms')
+
+    def check(self, to, code):
+        verification_check = self._create('verification_checks', to=to, code=code)
+        return verification_check.status == 'approved'
+
+
+class FakeOTPProvider(BaseOTPProvider):
+    """
+    Store OTPs in the cache instead of sending them, for tests, benchmarks
+    and local development. The OTPs are logged and can be read with
+    `get_code`.
+    """
+    CACHE_KEY = 'sms:fake-otp:{}'
+    TIMEOUT = 10 * 60  # Same as the Twilio Verify codes
+
+    def send(self, to):
+        code = generate_otp()
+        cache.set(self.CACHE_KEY.format(to), code, self.TIMEOUT)
+        logger.info('OTP for %s: %s', to, code)
+
+    def check(self, to, code):
+        key = self.CACHE_KEY.format(to)
+        if code and cache.get(key) == code:
+            cache.delete(key)  # OTPs can only be used once
+            return True
+        return False
+
+    def get_code(self, to):
+        return cache.get(self.CACHE_KEY.format(to))
+
+
+@lru_cache(maxsize=None)
+def get_otp_provider():
+    """
+    Returns the OTP provider of the `OTP_PROVIDER` setting, created once per
+    process.
+    """
+    return import_string(settings.OTP_PROVIDER)()
@@ -1 +1,51 @@
-# Add celery tasks here
+import logging
+
+from celery import shared_task
+from celery.utils.time import get_exponential_backoff_interval
+
+from .sms.gateways import get_sms_gateway
+from .sms.otp import OTPProviderError, get_otp_provider
+
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(bind=True, max_retries=5)
+def send_otp(self, phone_number):
+    """
+    Send an OTP to the phone number with the OTP provider. Transient
+    provider failures are retried with an exponential backoff (with
+    jitter), up to a minute apart.
+    """
+    try:
+        get_otp_provider().send(phone_number)
+    except OTPProviderError as e:
+        if not e.retryable:
+            logger.warning('Failed to send OTP to %s: %s', phone_number, e)
+            raise
+        countdown = get_exponential_backoff_interval(
+            factor=1, retries=self.request.retries, maximum=60, full_jitter=True
+        )
+        raise self.retry(exc=e, countdown=countdown)
+
+
+@shared_task(bind=True, max_retries=5)
+def send_sms(self, messages):
+    """
+    Send the `(to, body)` text messages with the SMS gateway, off the
+    request. Messages which failed with transient gateway errors are
+    retried with an exponential backoff (with jitter), up to a minute apart.
+    """
+    failed = []
+    for (to, body), result in zip(messages, get_sms_gateway().send_many(messages)):
+        if result.error is None:
+            continue
+        if result.error.retryable:
+            failed.append((to, body))
+        else:
+            logger.warning('Failed to send SMS to %s: %s', to, result.error)
+    if failed:
+        countdown = get_exponential_backoff_interval(
+            factor=1, retries=self.request.retries, maximum=60, full_jitter=True
+        )
+        raise self.retry(args=(failed, ), countdown=countdown)
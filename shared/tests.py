@@ -1,3 +1,29 @@
-from django.test import TestCase
+import io
 
-# Create your tests here.
+from django.test import SimpleTestCase
+from djangorestframework_camel_case.parser import CamelCaseJSONParser as BaseCamelCaseJSONParser
+
+from .parsers import CamelCaseJSONParser
+
+
+class CamelCaseJSONParserTests(SimpleTestCase):
+    def assertParsedLikeBase(self, body):
+        expected = BaseCamelCaseJSONParser().parse(io.BytesIO(body))
+        parsed = CamelCaseJSONParser().parse(io.BytesIO(body))
+        self.assertEqual(parsed, expected)
+        self.assertEqual([type(value) for value in parsed.values()],
+                         [type(value) for value in expected.values()])
+
+    def test_keys(self):
+        self.assertParsedLikeBase(b'{"orderItems": [{"unitPrice": 1.5, "itemId": "x"}]}')
+
+    def test_integer_boundaries(self):
+        for value in (2 ** 63 - 1, 2 ** 63, 2 ** 64 - 1, 2 ** 64, 10 ** 30,
+                      -2 ** 63, -2 ** 63 - 1, -2 ** 64, -10 ** 30):
+            with self.subTest(value=value):
+                self.assertParsedLikeBase(b'{"someValue": %d}' % value)
+
+    def test_large_floats(self):
+        for value in (b'1e19', b'-1e19', b'1.8446744073709552e19', b'1e400'):
+            with self.subTest(value=value):
+                self.assertParsedLikeBase(b'{"someValue": %s}' % value)
@@ -0,0 +1,37 @@
+"""
+Versioned cache keys for per-business computed results.
+
+Cached results are stored under a key that embeds a version. Writes that
+affect the results replace the version, which invalidates every cached
+entry of the business at once without having to know their keys.
+
+Versions are random, never repeated, values rather than counters, so an
+evicted version key can't bring back the entries of a previous version.
+"""
+from uuid import uuid4
+
+from django.core.cache import cache
+
+
+def _version_key(namespace, business_id):
+    return f'{namespace}:version:{business_id}'
+
+
+def _new_version():
+    return uuid4().hex
+
+
+def get_cache_key(namespace, business_id, *parts):
+    """
+    Returns the current cache key of a result for the business.
+    """
+    version = cache.get_or_set(_version_key(namespace, business_id), _new_version, timeout=None)
+    suffix = ':'.join(str(part) for part in parts)
+    return f'{namespace}:{business_id}:{version}:{suffix}'
+
+
+def invalidate(namespace, business_id):
+    """
+    Invalidate all cached results of the business in the namespace.
+    """
+    cache.set(_version_key(namespace, business_id), _new_version(), timeout=None)
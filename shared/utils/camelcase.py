@@ -0,0 +1,26 @@
+"""
+Memoized snake_case <-> camelCase key translation.
+
+API payloads repeat the same few hundred keys on every row, so each key is
+translated with the `djangorestframework_camel_case` regexes once and
+cached (in a bounded LRU cache) instead of on every occurrence.
+"""
+import re
+from functools import lru_cache
+
+from djangorestframework_camel_case.util import camel_to_underscore, underscore_to_camel
+
+
+CACHE_SIZE = 4096
+
+CAMELIZE_RE = re.compile(r'[a-z0-9]?_[a-z0-9]')
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def camelize_key(key):
+    return CAMELIZE_RE.sub(underscore_to_camel, key) if '_' in key else key
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def underscoreize_key(key):
+    return camel_to_underscore(key)
@@ -0,0 +1,82 @@
+"""
+Keyset (a.k.a. seek) pagination.
+
+Pages are fetched with `WHERE (value, pk) > (last value, last pk)` instead
+of `OFFSET`, so every page costs the same no matter how deep it is, and
+rows inserted between requests neither get skipped nor repeated.
+"""
+import base64
+import json
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+
+
+def encode_cursor(*values):
+    data = json.dumps([str(value) for value in values])
+    return base64.urlsafe_b64encode(data.encode()).decode()
+
+
+def decode_cursor(cursor):
+    """
+    Returns the list of values encoded in the cursor.
+
+    Raises:
+      ValueError: The cursor is malformed.
+    """
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (TypeError, ValueError, UnicodeError):
+        raise ValueError('Invalid cursor.')
+    if not isinstance(values, list):
+        raise ValueError('Invalid cursor.')
+    return values
+
+
+def _get_output_field(queryset, name):
+    annotation = queryset.query.annotations.get(name)
+    if annotation is not None:
+        return annotation.output_field
+    return queryset.model._meta.get_field(name)
+
+
+def keyset_paginate(queryset, ordering, cursor=None, limit=50):
+    """
+    Returns a page of the queryset and the cursor of the next page.
+
+    params:
+      ordering (str): Name of a non-nullable field or annotation, optionally
+      prefixed with `-` for descending order. The primary key breaks ties.
+      cursor (str): The cursor returned with the previous page.
+      limit (int): Maximum number of items in the page.
+
+    Returns:
+      A `(items, next_cursor)` tuple. `next_cursor` is `None` on the last page.
+
+    Raises:
+      ValueError: The cursor is malformed.
+    """
+    descending = ordering.startswith('-')
+    name = ordering.lstrip('-')
+    pk_name = queryset.model._meta.pk.name
+    queryset = queryset.order_by(ordering, f'-{pk_name}' if descending else pk_name)
+
+    if cursor:
+        try:
+            value, pk = decode_cursor(cursor)
+            value = _get_output_field(queryset, name).to_python(value)
+            pk = queryset.model._meta.pk.to_python(pk)
+        except (TypeError, ValueError, ValidationError):
+            raise ValueError('Invalid cursor.')
+        lookup = 'lt' if descending else 'gt'
+        queryset = queryset.filter(
+            Q(**{f'{name}__{lookup}': value}) |
+            Q(**{name: value, f'{pk_name}__{lookup}': pk})
+        )
+
+    items = list(queryset[:limit + 1])
+    if len(items) <= limit:
+        return items, None
+    items = items[:limit]
+    last = items[-1]
+    return items, encode_cursor(getattr(last, name), last.pk)